@@ -6,15 +6,15 @@ import os
 import sys
 from dotenv import load_dotenv
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+# Add repository root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 # Load environment variables
 load_dotenv()
 
 # Import Base and models
 from backend.database import Base
-from backend.models import Source, Article, AIMetadata
+from backend.models import Source, Article, AIMetadata, EnrichmentJob, AICacheEntry, KeywordHighWaterMark, MinHashBand, StoryCluster, Tag, ArticleTag
 
 # this is the Alembic Config object
 config = context.config
@@ -0,0 +1,98 @@
+"""Article dedup keys: uri, url and content_hash with unique indexes
+
+Revision ID: 0001_article_dedup_keys
+Revises:
+Create Date: 2026-10-17 00:00:00
+
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001_article_dedup_keys'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def _content_hash(title, content):
+    # Frozen copy of backend.services.ingestion.compute_content_hash
+    text = " ".join((content or "").casefold().split()) or " ".join((title or "").casefold().split())
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _backfill_content_hash(connection):
+    """Hash existing articles; later duplicates of the same content keep a NULL hash"""
+    articles = sa.table(
+        "articles",
+        sa.column("id", sa.Integer),
+        sa.column("title", sa.String),
+        sa.column("content", sa.Text),
+        sa.column("content_hash", sa.String),
+    )
+    seen = set(connection.execute(
+        sa.select(articles.c.content_hash).where(articles.c.content_hash.isnot(None))
+    ).scalars())
+
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(articles.c.id, articles.c.title, articles.c.content)
+            .where(articles.c.id > last_id, articles.c.content_hash.is_(None))
+            .order_by(articles.c.id)
+            .limit(BACKFILL_BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+
+        updates = []
+        for row in rows:
+            content_hash = _content_hash(row.title, row.content)
+            if content_hash not in seen:
+                seen.add(content_hash)
+                updates.append({"article_id": row.id, "hash": content_hash})
+        if updates:
+            connection.execute(
+                articles.update()
+                .where(articles.c.id == sa.bindparam("article_id"))
+                .values(content_hash=sa.bindparam("hash")),
+                updates
+            )
+
+
+def upgrade() -> None:
+    # Tables are also created by Base.metadata.create_all at startup, so only
+    # add what is missing
+    inspector = sa.inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("articles")}
+    indexes = {index["name"] for index in inspector.get_indexes("articles")}
+
+    if "uri" not in columns:
+        op.add_column("articles", sa.Column("uri", sa.String(length=255), nullable=True))
+    if "url" not in columns:
+        op.add_column("articles", sa.Column("url", sa.String(length=1000), nullable=True))
+    if "content_hash" not in columns:
+        op.add_column("articles", sa.Column("content_hash", sa.String(length=64), nullable=True))
+
+    # uri/url were never persisted before this revision, so only the hash can be backfilled
+    _backfill_content_hash(op.get_bind())
+
+    if "ix_articles_uri" not in indexes:
+        op.create_index("ix_articles_uri", "articles", ["uri"], unique=True)
+    if "ix_articles_content_hash" not in indexes:
+        op.create_index("ix_articles_content_hash", "articles", ["content_hash"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_articles_content_hash", table_name="articles")
+    op.drop_index("ix_articles_uri", table_name="articles")
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.drop_column("content_hash")
+        batch_op.drop_column("url")
+        batch_op.drop_column("uri")
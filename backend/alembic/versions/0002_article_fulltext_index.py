@@ -0,0 +1,75 @@
+"""Full-text index on articles (MySQL FULLTEXT / SQLite FTS5)
+
+Revision ID: 0002_article_fulltext_index
+Revises: 0001_article_dedup_keys
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002_article_fulltext_index'
+down_revision = '0001_article_dedup_keys'
+branch_labels = None
+depends_on = None
+
+SQLITE_UPGRADE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+        title, content, ai_summary,
+        content='articles', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title, content, ai_summary)
+        VALUES (new.id, new.title, new.content, new.ai_summary);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, content, ai_summary)
+        VALUES ('delete', old.id, old.title, old.content, old.ai_summary);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF title, content, ai_summary ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, content, ai_summary)
+        VALUES ('delete', old.id, old.title, old.content, old.ai_summary);
+        INSERT INTO articles_fts(rowid, title, content, ai_summary)
+        VALUES (new.id, new.title, new.content, new.ai_summary);
+    END
+    """,
+    # Index existing rows
+    "INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS articles_fts_au",
+    "DROP TRIGGER IF EXISTS articles_fts_ad",
+    "DROP TRIGGER IF EXISTS articles_fts_ai",
+    "DROP TABLE IF EXISTS articles_fts",
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        for statement in SQLITE_UPGRADE:
+            op.execute(statement)
+    elif bind.dialect.name == "mysql":
+        indexes = {index["name"] for index in sa.inspect(bind).get_indexes("articles")}
+        if "ft_articles_search" not in indexes:
+            op.execute("ALTER TABLE articles ADD FULLTEXT INDEX ft_articles_search (title, content, ai_summary)")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        for statement in SQLITE_DOWNGRADE:
+            op.execute(statement)
+    elif bind.dialect.name == "mysql":
+        op.execute("ALTER TABLE articles DROP INDEX ft_articles_search")
@@ -0,0 +1,26 @@
+"""Composite (published_date, id) index for keyset pagination
+
+Revision ID: 0003_article_published_date_id_index
+Revises: 0002_article_fulltext_index
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003_article_published_date_id_index'
+down_revision = '0002_article_fulltext_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    indexes = {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("articles")}
+    if "ix_articles_published_date_id" not in indexes:
+        op.create_index("ix_articles_published_date_id", "articles", ["published_date", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_articles_published_date_id", table_name="articles")
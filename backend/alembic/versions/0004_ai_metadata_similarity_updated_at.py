@@ -0,0 +1,32 @@
+"""Track when precomputed related-article lists were computed
+
+Revision ID: 0004_ai_metadata_similarity_updated_at
+Revises: 0003_article_published_date_id_index
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004_ai_metadata_similarity_updated_at'
+down_revision = '0003_article_published_date_id_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    columns = {column["name"] for column in inspector.get_columns("ai_metadata")}
+    indexes = {index["name"] for index in inspector.get_indexes("ai_metadata")}
+    if "similarity_updated_at" not in columns:
+        op.add_column("ai_metadata", sa.Column("similarity_updated_at", sa.DateTime(timezone=True), nullable=True))
+    if "ix_ai_metadata_similarity_updated_at" not in indexes:
+        op.create_index("ix_ai_metadata_similarity_updated_at", "ai_metadata", ["similarity_updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ai_metadata_similarity_updated_at", table_name="ai_metadata")
+    with op.batch_alter_table("ai_metadata") as batch_op:
+        batch_op.drop_column("similarity_updated_at")
@@ -0,0 +1,40 @@
+"""Per-keyword harvest high-water marks
+
+Revision ID: 0005_keyword_high_water_marks
+Revises: 0004_ai_metadata_similarity_updated_at
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005_keyword_high_water_marks'
+down_revision = '0004_ai_metadata_similarity_updated_at'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if "keyword_high_water_marks" in inspector.get_table_names():
+        return
+    op.create_table(
+        "keyword_high_water_marks",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("keyword", sa.String(length=255), nullable=False),
+        sa.Column("latest_published_date", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_harvested_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_keyword_high_water_marks_id", "keyword_high_water_marks", ["id"])
+    op.create_index("ix_keyword_high_water_marks_keyword", "keyword_high_water_marks", ["keyword"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_keyword_high_water_marks_keyword", table_name="keyword_high_water_marks")
+    op.drop_index("ix_keyword_high_water_marks_id", table_name="keyword_high_water_marks")
+    op.drop_table("keyword_high_water_marks")
@@ -0,0 +1,67 @@
+"""Near-duplicate clusters: MinHash signatures and LSH band index
+
+Revision ID: 0006_near_duplicate_clusters
+Revises: 0005_keyword_high_water_marks
+Create Date: 2026-10-17 00:00:00
+
+Existing articles get signatures and clusters from
+python backend/services/near_duplicates.py (not run here: it needs the
+MinHash parameters of the application).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006_near_duplicate_clusters'
+down_revision = '0005_keyword_high_water_marks'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {column["name"] for column in inspector.get_columns("articles")}
+    indexes = {index["name"] for index in inspector.get_indexes("articles")}
+    if "duplicate_of_id" not in columns:
+        op.add_column("articles", sa.Column("duplicate_of_id", sa.Integer(), nullable=True))
+        # SQLite can't add a constraint to an existing table (nor enforces it by default)
+        if bind.dialect.name != "sqlite":
+            op.create_foreign_key("fk_articles_duplicate_of_id", "articles", "articles", ["duplicate_of_id"], ["id"])
+    if "minhash" not in columns:
+        op.add_column("articles", sa.Column("minhash", sa.LargeBinary(), nullable=True))
+    if "ix_articles_duplicate_of_id" not in indexes:
+        op.create_index("ix_articles_duplicate_of_id", "articles", ["duplicate_of_id"])
+
+    if "minhash_bands" not in inspector.get_table_names():
+        op.create_table(
+            "minhash_bands",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("band", sa.SmallInteger(), nullable=False),
+            sa.Column("bucket", sa.BigInteger(), nullable=False),
+            sa.Column("article_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["article_id"], ["articles.id"]),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_minhash_bands_band_bucket", "minhash_bands", ["band", "bucket"])
+        op.create_index("ix_minhash_bands_article_id", "minhash_bands", ["article_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_minhash_bands_article_id", table_name="minhash_bands")
+    op.drop_index("ix_minhash_bands_band_bucket", table_name="minhash_bands")
+    op.drop_table("minhash_bands")
+    op.drop_index("ix_articles_duplicate_of_id", table_name="articles")
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        # Native DROP COLUMN (SQLite 3.35+): batch mode would rebuild the table
+        # and lose the full-text index triggers
+        op.execute("ALTER TABLE articles DROP COLUMN minhash")
+        op.execute("ALTER TABLE articles DROP COLUMN duplicate_of_id")
+        return
+    for foreign_key in sa.inspect(bind).get_foreign_keys("articles"):
+        if foreign_key["constrained_columns"] == ["duplicate_of_id"]:
+            op.drop_constraint(foreign_key["name"], "articles", type_="foreignkey")
+    op.drop_column("articles", "minhash")
+    op.drop_column("articles", "duplicate_of_id")
@@ -0,0 +1,65 @@
+"""Story clusters over article embeddings
+
+Revision ID: 0007_story_clusters
+Revises: 0006_near_duplicate_clusters
+Create Date: 2026-10-17 00:00:00
+
+Enriched articles are assigned to clusters by
+python backend/services/story_clusters.py (not run here: it reads the
+embeddings from the vector store).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007_story_clusters'
+down_revision = '0006_near_duplicate_clusters'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    if "story_clusters" not in inspector.get_table_names():
+        op.create_table(
+            "story_clusters",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("centroid", sa.LargeBinary(), nullable=False),
+            sa.Column("size", sa.Integer(), nullable=False),
+            sa.Column("first_seen_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("last_seen_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_story_clusters_id", "story_clusters", ["id"])
+        op.create_index("ix_story_clusters_last_seen_at", "story_clusters", ["last_seen_at"])
+
+    columns = {column["name"] for column in inspector.get_columns("articles")}
+    indexes = {index["name"] for index in inspector.get_indexes("articles")}
+    if "story_cluster_id" not in columns:
+        op.add_column("articles", sa.Column("story_cluster_id", sa.Integer(), nullable=True))
+        # SQLite can't add a constraint to an existing table (nor enforces it by default)
+        if bind.dialect.name != "sqlite":
+            op.create_foreign_key("fk_articles_story_cluster_id", "articles", "story_clusters", ["story_cluster_id"], ["id"])
+    if "ix_articles_story_cluster_id" not in indexes:
+        op.create_index("ix_articles_story_cluster_id", "articles", ["story_cluster_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_articles_story_cluster_id", table_name="articles")
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        # Native DROP COLUMN (SQLite 3.35+): batch mode would rebuild the table
+        # and lose the full-text index triggers
+        op.execute("ALTER TABLE articles DROP COLUMN story_cluster_id")
+    else:
+        for foreign_key in sa.inspect(bind).get_foreign_keys("articles"):
+            if foreign_key["constrained_columns"] == ["story_cluster_id"]:
+                op.drop_constraint(foreign_key["name"], "articles", type_="foreignkey")
+        op.drop_column("articles", "story_cluster_id")
+    op.drop_index("ix_story_clusters_last_seen_at", table_name="story_clusters")
+    op.drop_index("ix_story_clusters_id", table_name="story_clusters")
+    op.drop_table("story_clusters")
@@ -0,0 +1,109 @@
+"""Normalized tag index: tags and article_tags, backfilled from ai_tags
+
+Revision ID: 0008_tag_index
+Revises: 0007_story_clusters
+Create Date: 2026-10-17 00:00:00
+
+Tags are normalized as by backend.services.tags.normalize_tags (copied here
+so the migration doesn't change if the application does). Articles that
+already have links (tagged by a worker before the migration ran) are
+skipped, and article counts are recomputed at the end.
+"""
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008_tag_index'
+down_revision = '0007_story_clusters'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+_SPACE_RE = re.compile(r"\s+")
+
+
+def _normalize(tags):
+    normalized = []
+    for tag in tags if isinstance(tags, list) else []:
+        if tag is None:
+            continue
+        name = _SPACE_RE.sub(" ", str(tag)).strip().strip("#\"'.").strip().lower()[:100]
+        if name and name not in normalized:
+            normalized.append(name)
+    return normalized
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    existing = sa.inspect(bind).get_table_names()
+    if "tags" not in existing:
+        op.create_table(
+            "tags",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("name", sa.String(length=100), nullable=False),
+            sa.Column("article_count", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+        op.create_index("ix_tags_id", "tags", ["id"])
+        op.create_index("ix_tags_name", "tags", ["name"], unique=True)
+        op.create_index("ix_tags_article_count", "tags", ["article_count"])
+    if "article_tags" not in existing:
+        op.create_table(
+            "article_tags",
+            sa.Column("article_id", sa.Integer(), nullable=False),
+            sa.Column("tag_id", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["article_id"], ["articles.id"]),
+            sa.ForeignKeyConstraint(["tag_id"], ["tags.id"]),
+            sa.PrimaryKeyConstraint("article_id", "tag_id"),
+        )
+        op.create_index("ix_article_tags_tag_id_article_id", "article_tags", ["tag_id", "article_id"])
+
+    # Backfill from the JSON column in keyset batches
+    articles = sa.table("articles", sa.column("id", sa.Integer), sa.column("ai_tags", sa.JSON))
+    tags = sa.table("tags", sa.column("id", sa.Integer), sa.column("name", sa.String), sa.column("article_count", sa.Integer))
+    article_tags = sa.table("article_tags", sa.column("article_id", sa.Integer), sa.column("tag_id", sa.Integer))
+    tag_ids = {name: tag_id for tag_id, name in bind.execute(sa.select(tags.c.id, tags.c.name))}
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(articles.c.id, articles.c.ai_tags)
+            .where(
+                articles.c.id > last_id,
+                articles.c.ai_tags.isnot(None),
+                ~sa.exists().where(article_tags.c.article_id == articles.c.id)
+            )
+            .order_by(articles.c.id).limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        last_id = rows[-1].id
+        names = {row.id: _normalize(row.ai_tags) for row in rows}
+        missing = sorted({name for values in names.values() for name in values} - set(tag_ids))
+        if missing:
+            bind.execute(tags.insert(), [{"name": name, "article_count": 0} for name in missing])
+            tag_ids.update({
+                name: tag_id
+                for tag_id, name in bind.execute(sa.select(tags.c.id, tags.c.name).where(tags.c.name.in_(missing)))
+            })
+        links = [{"article_id": article_id, "tag_id": tag_ids[name]} for article_id, values in names.items() for name in values]
+        if links:
+            bind.execute(article_tags.insert(), links)
+
+    bind.execute(tags.update().values(article_count=(
+        sa.select(sa.func.count()).select_from(article_tags)
+        .where(article_tags.c.tag_id == tags.c.id).scalar_subquery()
+    )))
+
+
+def downgrade() -> None:
+    op.drop_index("ix_article_tags_tag_id_article_id", table_name="article_tags")
+    op.drop_table("article_tags")
+    op.drop_index("ix_tags_article_count", table_name="tags")
+    op.drop_index("ix_tags_name", table_name="tags")
+    op.drop_index("ix_tags_id", table_name="tags")
+    op.drop_table("tags")
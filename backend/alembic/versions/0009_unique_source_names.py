@@ -0,0 +1,48 @@
+"""Unique index on sources.name
+
+Revision ID: 0009_unique_source_names
+Revises: 0008_tag_index
+Create Date: 2026-10-17 00:00:00
+
+Ingestion inserts sources with ON CONFLICT / ON DUPLICATE KEY on the name,
+which only dedupes with a unique key. Sources created twice before this
+migration are merged into the one with the lowest ID first.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009_unique_source_names'
+down_revision = '0008_tag_index'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    indexes = {index["name"]: index for index in sa.inspect(bind).get_indexes("sources")}
+    if indexes.get("ix_sources_name", {}).get("unique"):
+        return
+
+    sources = sa.table("sources", sa.column("id", sa.Integer), sa.column("name", sa.String))
+    articles = sa.table("articles", sa.column("source_id", sa.Integer))
+    duplicated = bind.execute(
+        sa.select(sources.c.name, sa.func.min(sources.c.id))
+        .group_by(sources.c.name).having(sa.func.count() > 1)
+    ).all()
+    for name, keep_id in duplicated:
+        extra_ids = bind.execute(
+            sa.select(sources.c.id).where(sources.c.name == name, sources.c.id != keep_id)
+        ).scalars().all()
+        bind.execute(articles.update().where(articles.c.source_id.in_(extra_ids)).values(source_id=keep_id))
+        bind.execute(sources.delete().where(sources.c.id.in_(extra_ids)))
+
+    if "ix_sources_name" in indexes:
+        op.drop_index("ix_sources_name", table_name="sources")
+    op.create_index("ix_sources_name", "sources", ["name"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sources_name", table_name="sources")
+    op.create_index("ix_sources_name", "sources", ["name"])
@@ -0,0 +1,47 @@
+"""Background enrichment queue: enrichment_jobs
+
+Revision ID: 0010_enrichment_jobs
+Revises: 0009_unique_source_names
+Create Date: 2026-10-17 00:00:00
+
+Articles stored before the queue existed are not enqueued here; queue them
+with POST /api/articles/{id}/process-ai?background=true.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010_enrichment_jobs'
+down_revision = '0009_unique_source_names'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if "enrichment_jobs" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "enrichment_jobs",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("article_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(["article_id"], ["articles.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_enrichment_jobs_id", "enrichment_jobs", ["id"])
+    op.create_index("ix_enrichment_jobs_article_id", "enrichment_jobs", ["article_id"])
+    op.create_index("ix_enrichment_jobs_status", "enrichment_jobs", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_enrichment_jobs_status", table_name="enrichment_jobs")
+    op.drop_index("ix_enrichment_jobs_article_id", table_name="enrichment_jobs")
+    op.drop_index("ix_enrichment_jobs_id", table_name="enrichment_jobs")
+    op.drop_table("enrichment_jobs")
@@ -0,0 +1,38 @@
+"""Content-addressed AI response cache: ai_cache_entries
+
+Revision ID: 0011_ai_cache_entries
+Revises: 0010_enrichment_jobs
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0011_ai_cache_entries'
+down_revision = '0010_enrichment_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if "ai_cache_entries" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "ai_cache_entries",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("kind", sa.String(length=32), nullable=False),
+        sa.Column("value", sa.JSON(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint("key"),
+    )
+    op.create_index("ix_ai_cache_entries_expires_at", "ai_cache_entries", ["expires_at"])
+    op.create_index("ix_ai_cache_entries_created_at", "ai_cache_entries", ["created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ai_cache_entries_created_at", table_name="ai_cache_entries")
+    op.drop_index("ix_ai_cache_entries_expires_at", table_name="ai_cache_entries")
+    op.drop_table("ai_cache_entries")
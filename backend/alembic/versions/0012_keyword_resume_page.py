@@ -0,0 +1,34 @@
+"""Resume point for keywords whose harvest hit the page limit
+
+Revision ID: 0012_keyword_resume_page
+Revises: 0011_ai_cache_entries
+Create Date: 2026-10-17 00:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012_keyword_resume_page'
+down_revision = '0011_ai_cache_entries'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("keyword_high_water_marks")}
+    if "resume_page" not in columns:
+        op.add_column("keyword_high_water_marks", sa.Column("resume_page", sa.Integer(), nullable=True))
+    if "pending_published_date" not in columns:
+        op.add_column("keyword_high_water_marks", sa.Column("pending_published_date", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "sqlite":
+        # Native DROP COLUMN (SQLite 3.35+) instead of a batch-mode table rebuild
+        op.execute("ALTER TABLE keyword_high_water_marks DROP COLUMN pending_published_date")
+        op.execute("ALTER TABLE keyword_high_water_marks DROP COLUMN resume_page")
+    else:
+        op.drop_column("keyword_high_water_marks", "pending_published_date")
+        op.drop_column("keyword_high_water_marks", "resume_page")
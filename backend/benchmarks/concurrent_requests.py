@@ -0,0 +1,125 @@
+"""
+Concurrent request throughput with blocking vs. offloaded Pinecone calls
+Drives GET /api/articles/{id}/related through the ASGI app against a
+temporary SQLite database and a fake Pinecone index whose calls block the
+calling thread, like the real synchronous client does.
+
+"before" runs the index calls inline in the coroutine (the old behaviour),
+"after" uses PineconeService's bounded thread pool. The response cache and
+precomputed related lists are bypassed so every request reaches the index.
+
+Usage:
+    python backend/benchmarks/concurrent_requests.py [--requests 200] [--concurrency 50] [--latency 0.05]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Use a throwaway SQLite database and no background workers
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/benchmark.db"
+os.environ["ENRICHMENT_WORKERS"] = "0"
+os.environ["RESPONSE_CACHE_TTL"] = "0"
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import httpx
+
+from backend.database import SessionLocal
+from backend.dependencies import get_vector_store
+from backend.main import app
+from backend.models import Article, AIMetadata
+from backend.routers import articles as articles_router
+from backend.services.pinecone_service import PineconeService
+
+# Always take the live vector-store path of GET /related
+articles_router.stored_neighbors = lambda ai_metadata: None
+articles_router.set_neighbors = lambda ai_metadata, neighbors: None
+
+ARTICLE_COUNT = 50
+
+
+class FakeIndex:
+    """Mimics pinecone.Index with blocking network latency"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    def fetch(self, ids):
+        time.sleep(self.latency)
+        return {"vectors": {vector_id: {"values": [0.1] * 1024} for vector_id in ids}}
+
+    def query(self, vector=None, id=None, top_k=10, include_metadata=True, filter=None):
+        time.sleep(self.latency)
+        return {"matches": [
+            {"score": 1.0 - i / 100, "metadata": {"article_id": i}}
+            for i in range(1, min(top_k, ARTICLE_COUNT) + 1)
+        ]}
+
+
+class BlockingPineconeService(PineconeService):
+    """Calls the index inline, as the service did before offloading"""
+
+    async def _run(self, func, *args, **kwargs):
+        return func(*args, **kwargs)
+
+
+def make_service(service_class, latency: float) -> PineconeService:
+    service = service_class.__new__(service_class)
+    service.index = FakeIndex(latency)
+    service.index_name = "benchmark"
+    service.dimension = 1024
+    return service
+
+
+def seed_database():
+    db = SessionLocal()
+    try:
+        for i in range(1, ARTICLE_COUNT + 1):
+            db.add(Article(id=i, title=f"Benchmark article {i}", content="Body " * 50))
+            db.add(AIMetadata(article_id=i, embedding_id=f"article_{i}"))
+        db.commit()
+    finally:
+        db.close()
+
+
+async def run(label: str, service: PineconeService, total: int, concurrency: int):
+    app.dependency_overrides[get_vector_store] = lambda: service
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        async def one(i: int):
+            async with semaphore:
+                response = await client.get(f"/api/articles/{i % ARTICLE_COUNT + 1}/related")
+                response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(total)))
+        elapsed = time.perf_counter() - start
+
+    print(f"{label:<8} {total} requests in {elapsed:6.2f}s -> {total / elapsed:8.1f} req/s")
+    return total / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.05, help="Blocking latency per Pinecone call (s)")
+    args = parser.parse_args()
+
+    seed_database()
+    print(f"{args.requests} requests, concurrency {args.concurrency}, {args.latency * 1000:.0f} ms per Pinecone call\n")
+    before = await run("before", make_service(BlockingPineconeService, args.latency), args.requests, args.concurrency)
+    after = await run("after", make_service(PineconeService, args.latency), args.requests, args.concurrency)
+    print(f"\nThroughput gain: {after / before:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""
+Latency comparison: serial per-field AI calls vs. single structured enrichment
+Runs against a stubbed OpenAI client, so no API key or network is needed
+
+Usage:
+    python backend/benchmarks/enrichment_latency.py [--chat-latency 0.8] [--embedding-latency 0.2] [--runs 5]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.benchmarks.stubs import StubOpenAIClient
+from backend.services.openai_service import OpenAIService
+
+TITLE = "Central bank holds rates steady amid cooling inflation"
+CONTENT = "The central bank kept its benchmark rate unchanged on Wednesday. " * 40
+
+
+async def serial_pipeline(service: OpenAIService):
+    """The original process-ai flow: five awaited calls one after another"""
+    await service.generate_summary(TITLE, CONTENT)
+    await service.generate_tags(TITLE, CONTENT)
+    await service.generate_caption(TITLE, CONTENT)
+    await service.generate_image_prompt(TITLE, CONTENT)
+    await service.generate_embedding(TITLE + " " + CONTENT)
+
+
+async def structured_pipeline(service: OpenAIService):
+    """One JSON completion with the embedding call running concurrently"""
+    await service.enrich_article(TITLE, CONTENT)
+
+
+async def measure(name: str, pipeline, chat_latency: float, embedding_latency: float, runs: int):
+    client = StubOpenAIClient(chat_latency=chat_latency, embedding_latency=embedding_latency)
+    service = OpenAIService(client=client, use_cache=False)  # Measure real call latency every run
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await pipeline(service)
+        timings.append(time.perf_counter() - start)
+    print(
+        f"{name:<12} mean={statistics.mean(timings) * 1000:8.1f} ms  "
+        f"max={max(timings) * 1000:8.1f} ms  "
+        f"chat_calls/run={client.chat_calls / runs:.0f}  "
+        f"embedding_calls/run={client.embedding_calls / runs:.0f}"
+    )
+    return statistics.mean(timings)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chat-latency", type=float, default=0.8, help="Stubbed chat completion latency (s)")
+    parser.add_argument("--embedding-latency", type=float, default=0.2, help="Stubbed embedding latency (s)")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Stub latency: chat={args.chat_latency}s embedding={args.embedding_latency}s runs={args.runs}\n")
+    serial = await measure("serial", serial_pipeline, args.chat_latency, args.embedding_latency, args.runs)
+    structured = await measure("structured", structured_pipeline, args.chat_latency, args.embedding_latency, args.runs)
+    print(f"\nSpeedup: {serial / structured:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
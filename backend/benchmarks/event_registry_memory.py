@@ -0,0 +1,155 @@
+"""
+Peak memory of an Event Registry page: buffered response.json() + dicts with
+raw_data vs. streaming parse into compact records
+The response is served from memory in 16 KB chunks through an httpx mock
+transport, and memory is measured with tracemalloc while the parsed page is
+held (as the harvester does while it waits to ingest it).
+
+Usage:
+    python backend/benchmarks/event_registry_memory.py [--articles 100] [--body-chars 6000]
+    python backend/benchmarks/event_registry_memory.py --response recorded_page.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+os.environ.setdefault("EVENT_REGISTRY_API_KEY", "benchmark")
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.services.event_registry import EventRegistryService
+
+CHUNK_SIZE = 16 * 1024
+
+
+def synthetic_response(articles: int, body_chars: int) -> bytes:
+    """A getArticles page shaped like a real one (concepts, categories, links)"""
+    rng = random.Random(7)
+    words = ["market", "policy", "election", "growth", "energy", "climate", "league", "court", "health", "tech"]
+    results = []
+    for i in range(articles):
+        body = " ".join(rng.choice(words) for _ in range(body_chars // 7))[:body_chars]
+        results.append({
+            "uri": str(8000000000 + i),
+            "lang": "eng",
+            "isDuplicate": False,
+            "date": "2026-10-16",
+            "time": "12:%02d:00" % (i % 60),
+            "dateTime": "2026-10-16T12:%02d:00Z" % (i % 60),
+            "dateTimePub": "2026-10-16T12:%02d:00Z" % (i % 60),
+            "dataType": "news",
+            "sim": 0,
+            "url": f"https://news{i % 40}.example.com/2026/10/16/story-{i}",
+            "title": f"Synthetic headline {i} about {rng.choice(words)}",
+            "body": body,
+            "source": {"uri": f"news{i % 40}.example.com", "dataType": "news", "title": f"News {i % 40}"},
+            "authors": [{"uri": f"author{i}@news.example.com", "name": f"Author {i}", "type": "author", "isAgency": False}],
+            "image": f"https://news{i % 40}.example.com/img/{i}.jpg",
+            "images": [{"url": f"https://news{i % 40}.example.com/img/{i}.jpg"}],
+            "eventUri": f"eng-{9000000 + i}",
+            "sentiment": round(rng.uniform(-1, 1), 3),
+            "wgt": 400000000 + i,
+            "relevance": 1,
+            "concepts": [
+                {
+                    "uri": f"http://en.wikipedia.org/wiki/Concept_{rng.randrange(5000)}",
+                    "type": rng.choice(["wiki", "person", "org", "loc"]),
+                    "score": rng.randrange(1, 6),
+                    "label": {"eng": f"Concept {rng.randrange(5000)}"}
+                }
+                for _ in range(20)
+            ],
+            "categories": [{"uri": f"dmoz/News/Category_{rng.randrange(300)}", "label": "dmoz/News", "wgt": 50}] * 5,
+            "links": [f"https://example.com/link/{i}/{n}" for n in range(10)],
+            "videos": [],
+        })
+    return json.dumps({"articles": {"results": results, "totalResults": articles * 20, "page": 1, "count": articles, "pages": 20}}).encode("utf-8")
+
+
+def mock_client(payload: bytes) -> httpx.AsyncClient:
+    async def chunks():
+        for start in range(0, len(payload), CHUNK_SIZE):
+            yield payload[start:start + CHUNK_SIZE]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, content=chunks(), headers={"content-type": "application/json"})
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def legacy_parse(article_data: dict):
+    """The previous _parse_article: a dict per article that keeps raw_data"""
+    title = article_data.get("title", "").strip()
+    if not title:
+        return None
+    published_date = None
+    for fmt in ["%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"]:
+        try:
+            published_date = datetime.strptime(article_data["date"], fmt)
+            break
+        except ValueError:
+            continue
+    source_info = article_data.get("source") or {}
+    return {
+        "title": title,
+        "content": article_data.get("body") or article_data.get("text", ""),
+        "image_url": (article_data.get("images") or [{}])[0].get("url"),
+        "published_date": published_date,
+        "source_name": source_info.get("title"),
+        "source_uri": source_info.get("uri"),
+        "url": article_data.get("url"),
+        "uri": article_data.get("uri"),
+        "raw_data": article_data,
+    }
+
+
+async def buffered(service: EventRegistryService):
+    response = await service._get_client().post(service.base_url, json={})
+    data = response.json()
+    return [parsed for parsed in map(legacy_parse, data["articles"]["results"]) if parsed]
+
+
+async def streaming(service: EventRegistryService):
+    return await service.fetch_articles("benchmark")
+
+
+async def measure(label: str, payload: bytes, fetch):
+    service = EventRegistryService()
+    service._client = mock_client(payload)
+    tracemalloc.start()
+    start = time.perf_counter()
+    page = await fetch(service)
+    elapsed = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    await service.aclose()
+    print(f"{label:10s} {len(page):4d} articles  peak {peak / 1e6:7.2f} MB  retained {retained / 1e6:7.2f} MB  {elapsed * 1000:7.1f} ms")
+    return peak
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Event Registry parse memory benchmark")
+    parser.add_argument("--articles", type=int, default=100)
+    parser.add_argument("--body-chars", type=int, default=6000)
+    parser.add_argument("--response", type=Path, help="Recorded getArticles response to replay instead of a synthetic page")
+    args = parser.parse_args()
+
+    payload = args.response.read_bytes() if args.response else synthetic_response(args.articles, args.body_chars)
+    print(f"Response size: {len(payload) / 1e6:.2f} MB")
+    before = await measure("buffered", payload, buffered)
+    after = await measure("streaming", payload, streaming)
+    print(f"Peak memory reduction: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
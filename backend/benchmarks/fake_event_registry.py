@@ -0,0 +1,179 @@
+"""
+Local fake Event Registry for offline load and failure testing
+Serves getArticles from response fixtures in fixtures/event_registry/
+(<keyword>.json for that keyword, default.json otherwise). Fixture articles
+are re-keyed per keyword and page so every page is new to ingestion, and
+latency, tail latency, 503s and 429s (with Retry-After) can be injected.
+
+Usage:
+    python backend/benchmarks/fake_event_registry.py serve [--port 8765] [--latency 0.1]
+        [--error-rate 0.1] [--throttle-rate 0.05] [--tail-rate 0.05 --tail-latency 2]
+    EVENT_REGISTRY_BASE_URL=http://127.0.0.1:8765 python backend/services/cron_job.py
+
+    # Record a real response as a fixture (needs EVENT_REGISTRY_API_KEY)
+    python backend/benchmarks/fake_event_registry.py record --keyword technology
+"""
+import argparse
+import asyncio
+import copy
+import json
+import random
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "event_registry"
+
+
+@dataclass
+class Faults:
+    latency: float = 0.05  # Seconds per request
+    tail_rate: float = 0.0  # Fraction of requests that also wait tail_latency
+    tail_latency: float = 2.0
+    error_rate: float = 0.0  # Fraction answered with 503
+    throttle_rate: float = 0.0  # Fraction answered with 429
+    retry_after: float = 1.0  # Retry-After seconds sent with 429s
+    articles_per_keyword: int = 500
+    seed: int = 0
+
+
+def load_fixtures(fixtures_dir: Path = FIXTURES_DIR) -> Dict[str, List[Dict]]:
+    """Fixture article lists by keyword ("default" for any other keyword)"""
+    fixtures = {}
+    for path in sorted(fixtures_dir.glob("*.json")):
+        fixtures[path.stem] = json.loads(path.read_text())["articles"]["results"]
+    if "default" not in fixtures:
+        raise FileNotFoundError(f"{fixtures_dir}/default.json is missing")
+    return fixtures
+
+
+def create_app(faults: Faults, fixtures_dir: Path = FIXTURES_DIR) -> FastAPI:
+    fixtures = load_fixtures(fixtures_dir)
+    rng = random.Random(faults.seed)
+    newest = datetime.utcnow().replace(microsecond=0)
+    app = FastAPI(title="Fake Event Registry")
+    app.state.stats = {"requests": 0, "errors": 0, "throttled": 0, "slow": 0}
+
+    def article(keyword: str, serial: int) -> Dict:
+        templates = fixtures.get(keyword, fixtures["default"])
+        data = copy.deepcopy(templates[serial % len(templates)])
+        published = newest - timedelta(minutes=7 * serial)
+        data.update({
+            "uri": f"fake-{keyword}-{serial}",
+            "url": f"https://fake.example.com/{keyword}/{serial}",
+            "title": f"{data.get('title', 'Story')} [{keyword} #{serial}]",
+            "body": f"{keyword} #{serial}. {data.get('body', '')}",
+            "date": published.strftime("%Y-%m-%d"),
+            "time": published.strftime("%H:%M:%S"),
+            "dateTime": published.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        })
+        return data
+
+    @app.post("/api/v1/article/getArticles")
+    async def get_articles(request: Request):
+        stats = app.state.stats
+        stats["requests"] += 1
+        delay = faults.latency
+        if rng.random() < faults.tail_rate:
+            stats["slow"] += 1
+            delay += faults.tail_latency
+        await asyncio.sleep(delay)
+
+        roll = rng.random()
+        if roll < faults.error_rate:
+            stats["errors"] += 1
+            return JSONResponse({"error": "Service temporarily unavailable"}, status_code=503)
+        if roll < faults.error_rate + faults.throttle_rate:
+            stats["throttled"] += 1
+            return JSONResponse(
+                {"error": "Too many requests"},
+                status_code=429,
+                headers={"Retry-After": str(faults.retry_after)}
+            )
+
+        body = await request.json()
+        keyword = str(body.get("keyword") or "default")
+        count = min(int(body.get("articlesCount", 100)), 100)
+        page = max(int(body.get("articlesPage", 1)), 1)
+        total = faults.articles_per_keyword
+        if body.get("dateStart"):
+            # Newest first, one article every 7 minutes
+            since = datetime.fromisoformat(body["dateStart"])
+            total = min(total, int((newest - since).total_seconds() // 420) + 1)
+        serials = range((page - 1) * count, min(page * count, total))
+        return {
+            "articles": {
+                "results": [article(keyword, serial) for serial in serials],
+                "totalResults": total,
+                "page": page,
+                "count": count,
+                "pages": (total + count - 1) // count,
+            }
+        }
+
+    @app.get("/stats")
+    async def get_stats():
+        return app.state.stats
+
+    return app
+
+
+async def record(keyword: str, articles_count: int, output: Path):
+    """Save a real getArticles response as a fixture"""
+    from backend.services.event_registry import EventRegistryService
+
+    service = EventRegistryService()
+    body = {
+        "action": "getArticles",
+        "keyword": keyword,
+        "articlesPage": 1,
+        "articlesCount": articles_count,
+        "articlesSortBy": "date",
+        "articlesSortByAsc": False,
+        "dataType": ["news", "pr"],
+        "forceMaxDataTimeWindow": 31,
+        "resultType": "articles",
+        "apiKey": service.api_key,
+    }
+    async with httpx.AsyncClient(timeout=service.timeout) as client:
+        response = await client.post(service.base_url, json=body)
+        response.raise_for_status()
+    output.write_text(json.dumps(response.json(), indent=1))
+    print(f"✅ Recorded {len(response.json()['articles']['results'])} articles to {output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake Event Registry server")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    for name, default in Faults.__dataclass_fields__.items():
+        serve.add_argument(f"--{name.replace('_', '-')}", type=type(default.default), default=default.default)
+    recorder = commands.add_parser("record")
+    recorder.add_argument("--keyword", required=True)
+    recorder.add_argument("--articles-count", type=int, default=100)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        asyncio.run(record(args.keyword, args.articles_count, FIXTURES_DIR / f"{args.keyword}.json"))
+        return
+
+    import uvicorn
+
+    faults = Faults(**{name: getattr(args, name) for name in Faults.__dataclass_fields__})
+    print(f"Fake Event Registry on http://{args.host}:{args.port} ({faults})")
+    uvicorn.run(create_app(faults), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
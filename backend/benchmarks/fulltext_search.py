@@ -0,0 +1,120 @@
+"""
+Search latency: LIKE '%term%' scan vs. full-text index (SQLite FTS5)
+Builds a synthetic articles table in a temporary SQLite database and times
+the GET /articles search query (count + first page) both ways.
+
+Usage:
+    python backend/benchmarks/fulltext_search.py [--rows 500000] [--words 80] [--runs 3]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/benchmark.db"
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import desc, func, insert, or_, select
+
+from backend.database import Base, engine
+from backend.models import Article
+from backend.services.fulltext import ensure_fulltext_index, match_article_ids
+
+QUERIES = ["inflation", "central bank", "election results", "zebra"]
+INSERT_BATCH_SIZE = 10000
+
+
+def make_vocabulary(size: int):
+    rng = random.Random(7)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    words = {"".join(rng.choices(letters, k=rng.randint(3, 10))) for _ in range(size)}
+    return sorted(words)
+
+
+def populate(rows: int, words: int):
+    rng = random.Random(42)
+    vocabulary = make_vocabulary(20000)
+    # Query terms appear at realistic, decreasing frequencies
+    planted = [("inflation", 0.02), ("central bank", 0.005), ("election results", 0.001)]
+    now = datetime.utcnow()
+    table = Article.__table__
+    with engine.begin() as connection:
+        for start in range(0, rows, INSERT_BATCH_SIZE):
+            batch = []
+            for i in range(start, min(start + INSERT_BATCH_SIZE, rows)):
+                body = rng.choices(vocabulary, k=words)
+                for phrase, rate in planted:
+                    if rng.random() < rate:
+                        body.insert(rng.randrange(len(body)), phrase)
+                batch.append({
+                    "title": " ".join(rng.choices(vocabulary, k=8)),
+                    "content": " ".join(body),
+                    "published_date": now - timedelta(minutes=i),
+                })
+            connection.execute(insert(table), batch)
+
+
+def like_query(search: str):
+    return select(Article.id).where(
+        or_(
+            Article.title.contains(search),
+            Article.content.contains(search),
+            Article.ai_summary.contains(search)
+        )
+    ), [desc(Article.published_date)]
+
+
+def fulltext_query(search: str):
+    matches, relevance = match_article_ids(engine.dialect.name, search)
+    query = select(Article.id).join(matches, matches.c.article_id == Article.id)
+    return query, [relevance, desc(Article.published_date)]
+
+
+def measure(label: str, build, runs: int):
+    timings = {}
+    with engine.connect() as connection:
+        for search in QUERIES:
+            samples = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                query, ordering = build(search)
+                total = connection.scalar(select(func.count()).select_from(query.subquery()))
+                connection.execute(query.order_by(*ordering).limit(20)).all()
+                samples.append(time.perf_counter() - start)
+            timings[search] = statistics.median(samples)
+            print(f"{label:<9} {search!r:<20} matches={total:<7} median={timings[search] * 1000:9.1f} ms")
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--words", type=int, default=80, help="Words per article body")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    start = time.perf_counter()
+    populate(args.rows, args.words)
+    print(f"Inserted {args.rows} articles in {time.perf_counter() - start:.1f}s")
+    start = time.perf_counter()
+    ensure_fulltext_index(engine)
+    print(f"Built FTS5 index in {time.perf_counter() - start:.1f}s\n")
+
+    like = measure("LIKE", like_query, args.runs)
+    fulltext = measure("fulltext", fulltext_query, args.runs)
+    print()
+    for search in QUERIES:
+        print(f"Speedup {search!r:<20} {like[search] / fulltext[search]:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
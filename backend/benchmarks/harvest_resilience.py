@@ -0,0 +1,103 @@
+"""
+Harvest under injected faults: no retries vs. retries vs. retries + hedging
+Starts the fake Event Registry in-process and harvests several keywords into
+a temporary SQLite database through the real EventRegistryService.
+
+Usage:
+    python backend/benchmarks/harvest_resilience.py [--keywords 6] [--pages 3]
+        [--error-rate 0.15] [--throttle-rate 0.05] [--tail-rate 0.1] [--tail-latency 1.5]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/benchmark.db"
+os.environ.setdefault("EVENT_REGISTRY_API_KEY", "benchmark")
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+import uvicorn
+from sqlalchemy import delete
+
+from backend.benchmarks.fake_event_registry import Faults, create_app
+from backend.database import AsyncSessionLocal, Base, engine
+from backend.models import Article, EnrichmentJob, KeywordHighWaterMark, Source
+from backend.services.event_registry import EventRegistryService
+from backend.services.harvester import harvest_keywords
+from backend.services.ingestion import source_cache
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def reset():
+    async with AsyncSessionLocal() as db:
+        for model in (EnrichmentJob, Article, Source, KeywordHighWaterMark):
+            await db.execute(delete(model))
+        await db.commit()
+    source_cache.clear()
+
+
+async def run(label: str, service: EventRegistryService, keywords, pages: int):
+    await reset()
+    start = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        results = await harvest_keywords(db, service, keywords, max_pages=pages, requests_per_second=0)
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for harvest in results.values() if harvest.error)
+    new = sum(harvest.new for harvest in results.values())
+    await service.aclose()
+    print(f"{label:22s} {elapsed:6.2f}s  {new:5d} new articles  {failed} of {len(keywords)} keywords failed  {service.stats()}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Harvest resilience benchmark against a fake Event Registry")
+    parser.add_argument("--keywords", type=int, default=6)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--error-rate", type=float, default=0.15)
+    parser.add_argument("--throttle-rate", type=float, default=0.05)
+    parser.add_argument("--tail-rate", type=float, default=0.1)
+    parser.add_argument("--tail-latency", type=float, default=1.5)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    port = free_port()
+    faults = Faults(
+        latency=args.latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=0.2,
+        tail_rate=args.tail_rate,
+        tail_latency=args.tail_latency,
+        articles_per_keyword=args.pages * 100,
+    )
+    server = uvicorn.Server(uvicorn.Config(create_app(faults), host="127.0.0.1", port=port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    os.environ["EVENT_REGISTRY_BASE_URL"] = f"http://127.0.0.1:{port}"
+    os.environ["EVENT_REGISTRY_BACKOFF_BASE"] = "0.1"
+
+    keywords = [f"keyword{i}" for i in range(args.keywords)]
+    try:
+        await run("no retries", EventRegistryService(max_retries=0), keywords, args.pages)
+        await run("retries", EventRegistryService(max_retries=4), keywords, args.pages)
+        await run("retries + hedging", EventRegistryService(max_retries=4, hedge_after=args.latency * 4), keywords, args.pages)
+    finally:
+        server.should_exit = True
+        await server_task
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+"""
+Harvest wall time: serial keyword/page loop vs. concurrent harvester
+Uses a stub Event Registry with fixed per-request latency and a temporary
+SQLite database. The second harvester run shows the high-water marks: only
+pages with articles newer than the previous run are fetched.
+
+Usage:
+    python backend/benchmarks/harvest_throughput.py [--keywords 6] [--pages 3] [--latency 0.3]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/benchmark.db"
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import delete
+
+from backend.benchmarks.stubs import StubEventRegistry
+from backend.database import AsyncSessionLocal, Base, engine
+from backend.models import Article, EnrichmentJob, KeywordHighWaterMark, Source
+from backend.services.harvester import HARVEST_PAGE_SIZE, harvest_keywords
+from backend.services.ingestion import ingest_articles, source_cache
+
+
+async def reset():
+    async with AsyncSessionLocal() as db:
+        for model in (EnrichmentJob, Article, Source, KeywordHighWaterMark):
+            await db.execute(delete(model))
+        await db.commit()
+    source_cache.clear()
+
+
+async def serial(keywords, pages, latency):
+    """The previous cron loop, extended to the same pages"""
+    event_registry = StubEventRegistry(latency)
+    async with AsyncSessionLocal() as db:
+        start = time.perf_counter()
+        new = 0
+        for keyword in keywords:
+            for page in range(1, pages + 1):
+                articles = await event_registry.fetch_articles(keyword, HARVEST_PAGE_SIZE, page)
+                new += len((await ingest_articles(db, articles))[1])
+        return time.perf_counter() - start, event_registry.calls, new
+
+
+async def concurrent(keywords, pages, latency):
+    event_registry = StubEventRegistry(latency)
+    runs = []
+    async with AsyncSessionLocal() as db:
+        for label in ("first run", "rerun (+50 new per keyword)"):
+            calls = event_registry.calls
+            start = time.perf_counter()
+            results = await harvest_keywords(db, event_registry, keywords, max_pages=pages, requests_per_second=0)
+            runs.append((label, time.perf_counter() - start, event_registry.calls - calls, sum(r.new for r in results.values())))
+            event_registry.publish(50)
+    return runs
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Harvest wall-time benchmark")
+    parser.add_argument("--keywords", type=int, default=6)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.3, help="Seconds per Event Registry request")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    keywords = [f"keyword{i}" for i in range(args.keywords)]
+
+    await reset()
+    elapsed, calls, new = await serial(keywords, args.pages, args.latency)
+    print(f"serial loop:         {elapsed:6.2f}s  {calls:3d} requests  {new} new articles")
+    serial_elapsed = elapsed
+
+    await reset()
+    runs = await concurrent(keywords, args.pages, args.latency)
+    for label, elapsed, calls, new in runs:
+        print(f"harvester {label}: {elapsed:6.2f}s  {calls:3d} requests  {new} new articles")
+    print(f"speedup (first run): {serial_elapsed / runs[0][1]:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,125 @@
+"""
+Ingestion throughput: per-row ORM loop vs. set-based bulk ingestion
+Stores synthetic Event Registry batches in a temporary SQLite database and
+reports rows/sec. Half of each batch after the first repeats articles that
+already exist, like overlapping cron keywords do.
+
+Usage:
+    python backend/benchmarks/ingestion_throughput.py [--batches 20] [--batch-size 100] [--sources 40]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/benchmark.db"
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import delete, select
+
+from backend.database import AsyncSessionLocal, Base, engine
+from backend.models import Article, EnrichmentJob, Source
+from backend.services.ingestion import ingest_articles, source_cache
+
+
+def make_batches(batches: int, batch_size: int, sources: int):
+    now = datetime.utcnow()
+    result = []
+    serial = 0
+    for b in range(batches):
+        batch = []
+        for i in range(batch_size):
+            # After the first batch, half the titles repeat the previous batch
+            if b > 0 and i % 2 == 0:
+                batch.append(result[-1][i])
+                continue
+            serial += 1
+            batch.append({
+                "title": f"Synthetic headline number {serial}",
+                "content": f"Story {serial}. " + "Lorem ipsum dolor sit amet. " * 40,
+                "image_url": None,
+                "published_date": now - timedelta(minutes=serial),
+                "source_name": f"Source {serial % sources}",
+                "source_uri": f"source{serial % sources}.example.com",
+                "url": f"https://example.com/{serial}",
+                "uri": str(serial),
+            })
+        result.append(batch)
+    return result
+
+
+async def legacy_ingest(db, fetched_articles):
+    """The per-article loop previously used by fetch_news and the cron job"""
+    stored = []
+    for article_data in fetched_articles:
+        result = await db.execute(select(Article).where(Article.title == article_data["title"]))
+        existing = result.scalars().first()
+        if existing:
+            stored.append(existing)
+            continue
+        source = None
+        if article_data.get("source_name"):
+            result = await db.execute(select(Source).where(Source.name == article_data["source_name"]))
+            source = result.scalars().first()
+            if not source:
+                source = Source(name=article_data["source_name"], uri=article_data.get("source_uri"))
+                db.add(source)
+                await db.flush()
+        article = Article(
+            title=article_data["title"],
+            content=article_data.get("content"),
+            image_url=article_data.get("image_url"),
+            published_date=article_data.get("published_date"),
+            source_id=source.id if source else None
+        )
+        db.add(article)
+        stored.append(article)
+    await db.commit()
+    for article in stored:
+        await db.refresh(article)
+    return stored
+
+
+async def reset():
+    source_cache.clear()
+    async with AsyncSessionLocal() as db:
+        for model in (EnrichmentJob, Article, Source):
+            await db.execute(delete(model))
+        await db.commit()
+
+
+async def run(label: str, ingest, batches):
+    await reset()
+    rows = sum(len(batch) for batch in batches)
+    start = time.perf_counter()
+    async with AsyncSessionLocal() as db:
+        for batch in batches:
+            await ingest(db, batch)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<8} {rows} rows in {elapsed:6.2f}s -> {rows / elapsed:10,.0f} rows/sec")
+    return rows / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batches", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--sources", type=int, default=40)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    batches = make_batches(args.batches, args.batch_size, args.sources)
+    legacy = await run("legacy", legacy_ingest, batches)
+    bulk = await run("bulk", ingest_articles, batches)
+    print(f"\nSpeedup: {bulk / legacy:.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
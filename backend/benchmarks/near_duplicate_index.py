@@ -0,0 +1,115 @@
+"""
+Near-duplicate lookup cost as the corpus grows: MinHash-LSH band index vs.
+comparing each new article's signature with every stored article
+Ingests synthetic batches (a quarter of each batch are lightly edited copies
+of earlier stories) into a temporary SQLite database and reports the cost of
+clustering each batch at several corpus sizes.
+
+Usage:
+    python backend/benchmarks/near_duplicate_index.py [--batches 40] [--batch-size 100] [--report-every 10]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/benchmark.db"
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import bindparam, insert, select, update
+
+from backend.database import AsyncSessionLocal, Base, engine
+from backend.models import Article
+from backend.services.near_duplicates import NEAR_DUP_THRESHOLD, assign_clusters, compute_signature, similarity
+
+WORDS = [
+    "market", "policy", "election", "growth", "energy", "climate", "league", "court", "health", "tech",
+    "minister", "report", "shares", "storm", "vaccine", "budget", "strike", "deal", "launch", "ruling",
+]
+
+
+def make_story(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) + str(rng.randrange(50)) for _ in range(300))
+
+
+def edit(rng: random.Random, story: str) -> str:
+    """A wire copy: a few words changed and a different sign-off"""
+    words = story.split()
+    for _ in range(5):
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return " ".join(words) + f" reporting by outlet {rng.randrange(100)}"
+
+
+async def brute_force(db, signatures):
+    """Compare each new signature with every stored one (what the index avoids)"""
+    result = await db.execute(select(Article.id, Article.minhash).where(Article.minhash.isnot(None)))
+    stored = [(article_id, minhash) for article_id, minhash in result.all() if article_id not in dict(signatures)]
+    found = 0
+    for _, signature in signatures:
+        if any(similarity(signature, minhash) >= NEAR_DUP_THRESHOLD for _, minhash in stored):
+            found += 1
+    return found
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Near-duplicate index benchmark")
+    parser.add_argument("--batches", type=int, default=40)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--report-every", type=int, default=10)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(3)
+    stories = []
+    serial = 0
+    print(f"{'corpus':>8s}  {'LSH ms/batch':>12s}  {'scan ms/batch':>13s}  {'duplicates':>10s}")
+    for b in range(args.batches):
+        texts = []
+        for i in range(args.batch_size):
+            if stories and i % 4 == 0:
+                texts.append(edit(rng, rng.choice(stories)))
+            else:
+                story = make_story(rng)
+                stories.append(story)
+                texts.append(story)
+
+        async with AsyncSessionLocal() as db:
+            rows = []
+            for text in texts:
+                serial += 1
+                rows.append({"title": f"Headline {serial}", "content": text, "minhash": compute_signature(f"Headline {serial}", text)})
+            result = await db.execute(insert(Article).returning(Article.id), [
+                {"title": row["title"], "content": row["content"]} for row in rows
+            ])
+            ids = result.scalars().all()
+            table = Article.__table__
+            await db.execute(
+                update(table).where(table.c.id == bindparam("article_id")).values(minhash=bindparam("signature")),
+                [{"article_id": article_id, "signature": row["minhash"]} for article_id, row in zip(ids, rows)]
+            )
+            signatures = [(article_id, row["minhash"]) for article_id, row in zip(ids, rows)]
+
+            report = (b + 1) % args.report_every == 0
+            scan_ms = None
+            if report:
+                start = time.perf_counter()
+                await brute_force(db, signatures)
+                scan_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            duplicates = await assign_clusters(db, signatures)
+            lsh_ms = (time.perf_counter() - start) * 1000
+            await db.commit()
+
+        if report:
+            print(f"{serial:8d}  {lsh_ms:12.1f}  {scan_ms:13.1f}  {len(duplicates):10d}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
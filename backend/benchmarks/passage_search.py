@@ -0,0 +1,117 @@
+"""
+Chunked passage embeddings vs. one vector per article
+Long synthetic articles each hide one short paragraph about a unique topic at
+a random position; the query is that topic. Both stores hold every
+article's own vector, the chunked one also its passage vectors, and search
+folds passage hits into their article (max-sim, bounded fan-out).
+Embeddings come from a word-hashing stub so that shared words mean similar
+vectors; runs offline against temporary LocalVectorStore directories.
+
+Usage:
+    python backend/benchmarks/passage_search.py [--articles 200] [--words 8000] [--top-k 10]
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+# Search fan-out and passage storage are configured at import time
+os.environ["CHUNKED_EMBEDDINGS"] = "true"
+
+from backend.benchmarks.stubs import HashingStubOpenAIClient
+from backend.services.local_vector_store import LocalVectorStore
+from backend.services.openai_service import OpenAIService
+from backend.services.passages import embed_passages
+from backend.services.token_budget import TokenBudget
+
+
+def make_articles(count: int, words: int, seed: int = 25):
+    rng = random.Random(seed)
+    vocabulary = ["".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9))) for _ in range(20000)]
+    articles = []
+    for article_id in range(1, count + 1):
+        body = [rng.choice(vocabulary) for _ in range(words)]
+        topic = [f"needle{article_id}x{i}" for i in range(3)]
+        paragraph = [rng.choice(topic) if rng.random() < 0.3 else rng.choice(vocabulary) for _ in range(60)]
+        position = rng.randrange(words)
+        body[position:position] = paragraph
+        articles.append((
+            SimpleNamespace(id=article_id, title=f"Report {article_id}", content=" ".join(body), source_id=1),
+            " ".join(topic),
+            position / words
+        ))
+    return articles
+
+
+async def load(store: LocalVectorStore, service: OpenAIService, articles, chunked: bool):
+    start = time.perf_counter()
+    for offset in range(0, len(articles), 50):
+        batch = [article for article, _, _ in articles[offset:offset + 50]]
+        embeddings = await service.generate_embeddings([article.title + " " + article.content for article in batch])
+        await store.upsert_embeddings([
+            {"article_id": article.id, "embedding": embedding, "metadata": {"article_id": article.id}}
+            for article, embedding in zip(batch, embeddings)
+        ])
+        if chunked:
+            await embed_passages(batch, service, store)
+    return time.perf_counter() - start
+
+
+async def evaluate(store: LocalVectorStore, service: OpenAIService, articles, top_k: int):
+    hits = {"intro": [0, 0], "tail": [0, 0]}  # Needle in the first / rest of the article: [found, total]
+    reciprocal_ranks = []
+    timings = []
+    for article, query, position in articles:
+        embedding = await service.generate_embedding(query)
+        start = time.perf_counter()
+        results = await store.search_similar(embedding, top_k=top_k)
+        timings.append(time.perf_counter() - start)
+        ranked = [result["article_id"] for result in results]
+        assert len(ranked) == len(set(ranked))
+        part = hits["intro" if position < 0.5 else "tail"]
+        part[1] += 1
+        if article.id in ranked:
+            part[0] += 1
+            reciprocal_ranks.append(1 / (ranked.index(article.id) + 1))
+        else:
+            reciprocal_ranks.append(0.0)
+    return hits, float(np.mean(reciprocal_ranks)), timings
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--words", type=int, default=8000, help="Words per article")
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+
+    articles = make_articles(args.articles, args.words)
+    print(f"{args.articles} articles of {args.words} words, recall@{args.top_k} of the article hiding the query topic\n")
+    for name, chunked in (("article vectors", False), ("+ passages", True)):
+        budget = TokenBudget(0, 0, 0)
+        service = OpenAIService(client=HashingStubOpenAIClient(0, 0), use_cache=False, budget=budget)
+        store = LocalVectorStore(path=tempfile.mkdtemp(), compaction_min_rows=10 ** 9)
+        elapsed = await load(store, service, articles, chunked)
+        embedded_tokens = budget.stats()["usage"]["embedding"]["prompt_tokens"]
+        hits, mrr, timings = await evaluate(store, service, articles, args.top_k)
+        recall = lambda part: part[0] / part[1] if part[1] else 0.0
+        print(
+            f"{name:<16} vectors={store.live_count:6d}  embedded tokens={embedded_tokens:9d}  load={elapsed:5.1f}s\n"
+            f"{'':<16} recall intro={recall(hits['intro']):6.1%}  tail={recall(hits['tail']):6.1%}  MRR={mrr:.3f}  "
+            f"search p50={np.percentile(timings, 50) * 1000:.2f} ms  p99={np.percentile(timings, 99) * 1000:.2f} ms"
+        )
+        await store.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
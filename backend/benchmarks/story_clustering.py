@@ -0,0 +1,88 @@
+"""
+Trending stories: incremental centroid assignment + bucket counters vs.
+re-clustering every embedding in the window on each request
+Synthetic embeddings are drawn around a few hundred story topics. Reports the
+cost of assigning one new article and of answering one trending request as
+the number of articles grows (in memory; database writes are excluded).
+
+Usage:
+    python backend/benchmarks/story_clustering.py [--articles 20000] [--stories 300] [--report-every 5000]
+"""
+import argparse
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.services.story_clusters import STORY_CLUSTER_THRESHOLD, CentroidIndex, TrendingCounter
+
+
+def recompute(vectors: np.ndarray, threshold: float, limit: int = 10):
+    """Single-pass leader clustering of every article, then the largest clusters"""
+    centroids = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+    labels = []
+    for vector in vectors:
+        scores = centroids @ vector if len(centroids) else np.zeros(0)
+        if len(scores) and scores.max() >= threshold:
+            labels.append(int(scores.argmax()))
+        else:
+            centroids = np.vstack([centroids, vector])
+            labels.append(len(centroids) - 1)
+    return Counter(labels).most_common(limit)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Story clustering / trending benchmark")
+    parser.add_argument("--articles", type=int, default=20000)
+    parser.add_argument("--stories", type=int, default=300)
+    parser.add_argument("--dimension", type=int, default=1024)
+    parser.add_argument("--report-every", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(5)
+    topics = rng.normal(size=(args.stories, args.dimension)).astype(np.float32)
+    now = datetime.utcnow()
+    index = CentroidIndex()
+    counter = TrendingCounter(now=now)
+    sizes, means = {}, {}
+    unit_vectors = np.zeros((args.articles, args.dimension), dtype=np.float32)
+    assign_seconds = 0.0
+
+    print(f"{'articles':>8s}  {'clusters':>8s}  {'assign us/article':>17s}  {'trending us':>11s}  {'recompute ms':>12s}")
+    for n in range(args.articles):
+        vector = topics[rng.integers(args.stories)] + rng.normal(scale=0.35, size=args.dimension).astype(np.float32)
+        unit = vector / np.linalg.norm(vector)
+        unit_vectors[n] = unit
+        when = now - timedelta(minutes=int(rng.integers(24 * 60)))
+
+        start = time.perf_counter()
+        cluster_id, score = index.best(unit)
+        if cluster_id is not None and score >= STORY_CLUSTER_THRESHOLD:
+            sizes[cluster_id] += 1
+            means[cluster_id] += (unit - means[cluster_id]) / sizes[cluster_id]
+        else:
+            cluster_id = len(sizes) + 1
+            sizes[cluster_id], means[cluster_id] = 1, unit.copy()
+        index.set(cluster_id, means[cluster_id])
+        counter.add(cluster_id, when, now=now)
+        assign_seconds += time.perf_counter() - start
+
+        if (n + 1) % args.report_every == 0:
+            counter.version += 1  # Measure a ranking rebuild, not a cached read
+            start = time.perf_counter()
+            counter.top(10, now=now)
+            trending_us = (time.perf_counter() - start) * 1e6
+            start = time.perf_counter()
+            recompute(unit_vectors[:n + 1], STORY_CLUSTER_THRESHOLD)
+            recompute_ms = (time.perf_counter() - start) * 1000
+            print(f"{n + 1:8d}  {len(index):8d}  {assign_seconds / (n + 1) * 1e6:17.1f}  {trending_us:11.1f}  {recompute_ms:12.1f}")
+
+
+if __name__ == "__main__":
+    main()
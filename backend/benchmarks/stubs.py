@@ -0,0 +1,127 @@
+"""
+Stub clients that mimic the external APIs with configurable latency
+Used by the benchmarks so they can run offline without API keys
+"""
+import asyncio
+import hashlib
+import json
+import random
+import re
+from types import SimpleNamespace
+from typing import List
+
+
+class _StubChatCompletions:
+    def __init__(self, owner: "StubOpenAIClient"):
+        self.owner = owner
+
+    async def create(self, model: str, messages: List[dict], **kwargs):
+        self.owner.chat_calls += 1
+        await asyncio.sleep(self.owner.chat_latency)
+        if kwargs.get("response_format", {}).get("type") == "json_object":
+            content = json.dumps({
+                "summary": "Stub summary of the article.",
+                "tags": ["news", "stub", "benchmark", "latency", "ai"],
+                "caption": "Stub caption #news #ai #benchmark",
+                "image_prompt": "A stub illustration for a news thumbnail"
+            })
+        else:
+            content = "news, stub, benchmark, latency, ai"
+        message = SimpleNamespace(content=content)
+        prompt_tokens = sum(len(message["content"]) // 4 for message in messages)
+        usage = SimpleNamespace(prompt_tokens=prompt_tokens, completion_tokens=len(content) // 4, total_tokens=prompt_tokens + len(content) // 4)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+class _StubEmbeddings:
+    def __init__(self, owner: "StubOpenAIClient"):
+        self.owner = owner
+
+    async def create(self, model: str, input, dimensions: int = 1024, **kwargs):
+        self.owner.embedding_calls += 1
+        await asyncio.sleep(self.owner.embedding_latency)
+        inputs = input if isinstance(input, list) else [input]
+        data = [
+            SimpleNamespace(index=i, embedding=[random.random() for _ in range(dimensions)])
+            for i in range(len(inputs))
+        ]
+        tokens = sum(len(text) // 4 for text in inputs)
+        return SimpleNamespace(data=data, usage=SimpleNamespace(prompt_tokens=tokens, total_tokens=tokens))
+
+
+class _HashingEmbeddings(_StubEmbeddings):
+    """Signed feature hashing of lowercased words, so texts sharing words get similar vectors"""
+
+    async def create(self, model: str, input, dimensions: int = 1024, **kwargs):
+        response = await super().create(model, input, dimensions, **kwargs)
+        inputs = input if isinstance(input, list) else [input]
+        for item, text in zip(response.data, inputs):
+            vector = [0.0] * dimensions
+            for word in re.findall(r"\w+", text.lower()):
+                digest = int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+                vector[digest % dimensions] += 1.0 if digest >> 63 else -1.0
+            item.embedding = vector
+        return response
+
+
+class StubOpenAIClient:
+    """Drop-in replacement for AsyncOpenAI with fixed per-call latency"""
+
+    def __init__(self, chat_latency: float = 0.8, embedding_latency: float = 0.2):
+        self.chat_latency = chat_latency
+        self.embedding_latency = embedding_latency
+        self.chat_calls = 0
+        self.embedding_calls = 0
+        self.chat = SimpleNamespace(completions=_StubChatCompletions(self))
+        self.embeddings = _StubEmbeddings(self)
+
+
+class HashingStubOpenAIClient(StubOpenAIClient):
+    """StubOpenAIClient whose embeddings reflect word overlap, for retrieval quality benchmarks"""
+
+    def __init__(self, chat_latency: float = 0.8, embedding_latency: float = 0.2):
+        super().__init__(chat_latency, embedding_latency)
+        self.embeddings = _HashingEmbeddings(self)
+
+
+class StubEventRegistry:
+    """Stand-in for EventRegistryService serving a synthetic, newest-first corpus per keyword"""
+
+    def __init__(self, latency: float = 0.3, articles_per_keyword: int = 300):
+        from datetime import datetime, timedelta
+
+        self.latency = latency
+        self.calls = 0
+        self._start = datetime(2026, 1, 1)
+        self._step = timedelta(minutes=7)
+        self.articles_per_keyword = articles_per_keyword
+        self._published = 0
+
+    def publish(self, count: int):
+        """Make count newer articles available for every keyword"""
+        self._published += count
+
+    def _article(self, keyword: str, serial: int) -> dict:
+        return {
+            "title": f"{keyword.title()} story {serial}",
+            "content": f"{keyword} report {serial}. " + "Lorem ipsum dolor sit amet. " * 20,
+            "image_url": None,
+            "published_date": self._start + self._step * serial,
+            "source_name": f"{keyword.title()} Daily",
+            "source_uri": f"{keyword}.example.com",
+            "url": f"https://{keyword}.example.com/{serial}",
+            "uri": f"{keyword}-{serial}",
+        }
+
+    async def fetch_articles(self, keyword: str, articles_count: int = 100, articles_page: int = 1, date_start=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        newest = self.articles_per_keyword + self._published
+        serials = range(newest - 1, -1, -1)
+        if date_start is not None:
+            serials = [serial for serial in serials if self._article(keyword, serial)["published_date"].date() >= date_start]
+        serials = list(serials)[(articles_page - 1) * articles_count:articles_page * articles_count]
+        return [self._article(keyword, serial) for serial in serials]
+
+    async def aclose(self):
+        pass
@@ -0,0 +1,121 @@
+"""
+Tag filtering and facets: JSON ai_tags scans vs. the normalized tag index
+Builds synthetic tagged articles in a temporary SQLite database and times
+one GET /articles?tag= page (count + first page) and the tag facet counts
+both ways.
+
+Usage:
+    python backend/benchmarks/tag_index.py [--rows 200000] [--tags 2000] [--runs 3]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/benchmark.db"
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from sqlalchemy import desc, func, insert, select
+
+from backend.database import AsyncSessionLocal, Base, engine
+from backend.models import Article, ArticleTag, Tag
+from backend.services.tags import set_article_tags, tag_facets
+
+INSERT_BATCH_SIZE = 5000
+
+
+async def build(rows: int, tag_count: int):
+    rng = random.Random(11)
+    # Zipf-like popularity so there are both common and rare tags
+    names = [f"tag {i}" for i in range(tag_count)]
+    weights = [1 / (i + 1) for i in range(tag_count)]
+    now = datetime.utcnow()
+    for start in range(0, rows, INSERT_BATCH_SIZE):
+        async with AsyncSessionLocal() as db:
+            batch = []
+            for i in range(start, min(start + INSERT_BATCH_SIZE, rows)):
+                batch.append({
+                    "title": f"Headline {i}",
+                    "content": "Body text. " * 20,
+                    "published_date": now - timedelta(minutes=i),
+                    "ai_tags": list(dict.fromkeys(rng.choices(names, weights, k=6))),
+                })
+            result = await db.execute(insert(Article).returning(Article.id, Article.ai_tags), batch)
+            await set_article_tags(db, {article_id: tags for article_id, tags in result.all()})
+            await db.commit()
+    return names
+
+
+async def json_scan(db, tag: str):
+    condition = Article.ai_tags.contains(json.dumps(tag))
+    total = await db.scalar(select(func.count()).select_from(Article).where(condition))
+    page = (await db.execute(
+        select(Article.id).where(condition).order_by(desc(Article.published_date), desc(Article.id)).limit(20)
+    )).all()
+    return total, len(page)
+
+
+async def index_join(db, tag: str):
+    tag_row = (await db.execute(select(Tag.id, Tag.article_count).where(Tag.name == tag))).first()
+    page = (await db.execute(
+        select(Article.id).join(ArticleTag, ArticleTag.article_id == Article.id).where(ArticleTag.tag_id == tag_row.id)
+        .order_by(desc(Article.published_date), desc(Article.id)).limit(20)
+    )).all()
+    return tag_row.article_count, len(page)
+
+
+async def json_facets(db):
+    counts = Counter()
+    result = await db.stream(select(Article.ai_tags))
+    async for (tags,) in result:
+        counts.update(tags or [])
+    return counts.most_common(20)
+
+
+async def timed(runs: int, fn, *args):
+    samples = []
+    for _ in range(runs):
+        async with AsyncSessionLocal() as db:
+            start = time.perf_counter()
+            value = await fn(db, *args)
+            samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), value
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Tag filter and facet benchmark")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--tags", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    start = time.perf_counter()
+    names = await build(args.rows, args.tags)
+    print(f"Built {args.rows} articles in {time.perf_counter() - start:.1f}s\n")
+
+    for tag in (names[0], names[50], names[-1]):
+        scan_ms, scan = await timed(args.runs, json_scan, tag)
+        index_ms, indexed = await timed(args.runs, index_join, tag)
+        assert scan == indexed, (scan, indexed)
+        print(f"tag={tag!r:12s} {scan[0]:6d} articles  JSON scan {scan_ms:8.1f} ms  index {index_ms:6.1f} ms  ({scan_ms / index_ms:.0f}x)")
+
+    scan_ms, scan = await timed(args.runs, json_facets)
+    index_ms, indexed = await timed(args.runs, tag_facets)
+    assert [count for _, count in scan] == [facet["count"] for facet in indexed]
+    print(f"facets (top 20)          JSON scan {scan_ms:8.1f} ms  index {index_ms:6.1f} ms  ({scan_ms / index_ms:.0f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
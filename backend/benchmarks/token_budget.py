@@ -0,0 +1,162 @@
+"""
+Token budgets for OpenAI prompts and rate limiting against a throttled stub
+1. Prompt fitting: content[:2000] and a plain token prefix vs. lead +
+   key-paragraph selection within OPENAI_PROMPT_MAX_TOKENS, on long
+   synthetic articles whose most relevant paragraph (the one repeating the
+   title) comes late. Reports tokens per prompt and how often that
+   paragraph reaches the model.
+2. Rate limiting: concurrent enrichments against a stub that rejects requests
+   over its per-minute token limit with a 429, without and with the shared
+   token bucket.
+
+Usage:
+    python backend/benchmarks/token_budget.py [--articles 200] [--concurrency 50] [--tokens-per-minute 1200000]
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.benchmarks.stubs import StubOpenAIClient
+from backend.services.openai_service import OpenAIService
+from backend.services.token_budget import BURST_SECONDS, TokenBudget, count_tokens, truncate_tokens
+
+MODEL = "gpt-4-turbo-preview"
+
+
+def make_article(rng: random.Random, serial: int):
+    """A 12-20 paragraph article; the paragraph about the title topic is in the second half"""
+    vocabulary = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.choice([2, 3, 4, 5, 6, 8, 11])))
+        for _ in range(800)
+    ]
+    topic = [f"topic{serial}x{i}" for i in range(3)]
+    title = f"{' '.join(topic)} announced"
+    paragraphs = [
+        " ".join(rng.choice(vocabulary) for _ in range(rng.randint(50, 90))) + "."
+        for _ in range(rng.randint(12, 20))
+    ]
+    key = rng.randint(len(paragraphs) // 2, len(paragraphs) - 1)
+    paragraphs[key] = " ".join(topic + [rng.choice(vocabulary) for _ in range(40)] + topic) + "."
+    # The lead mentions the topic once, like a headline-style first paragraph
+    paragraphs[0] = f"{topic[0]} " + paragraphs[0]
+    return title, "\n\n".join(paragraphs), paragraphs[key]
+
+
+def compare_fitting(articles, budget_tokens: int):
+    service = OpenAIService(client=StubOpenAIClient(0, 0), use_cache=False, budget=TokenBudget(0, 0, 0))
+    service.prompt_max_tokens = budget_tokens
+    strategies = {
+        "chars[:2000]": lambda title, content: content[:2000],
+        "token prefix": lambda title, content: truncate_tokens(content, budget_tokens, MODEL),
+        "token fit": service._fit_content,
+    }
+    print(f"Prompt fitting over {len(articles)} articles (budget {budget_tokens} tokens, "
+          f"mean article {statistics.mean(count_tokens(content, MODEL) for _, content, _ in articles):.0f} tokens)")
+    for name, fit in strategies.items():
+        tokens = []
+        kept = 0
+        start = time.perf_counter()
+        for title, content, key in articles:
+            fitted = fit(title, content)
+            tokens.append(count_tokens(fitted, MODEL))
+            kept += key in fitted
+        elapsed = (time.perf_counter() - start) / len(articles)
+        print(
+            f"  {name:<13} tokens mean={statistics.mean(tokens):6.0f} min={min(tokens):5d} max={max(tokens):5d}  "
+            f"key paragraph kept={kept / len(articles):6.1%}  fit={elapsed * 1000:.2f} ms/article"
+        )
+
+
+class RateLimitError(Exception):
+    """What the API returns when a request exceeds the per-minute token limit (HTTP 429)"""
+
+
+class ThrottledStubClient(StubOpenAIClient):
+    """Stub that charges prompt + max_tokens per completion against a token bucket, like the API"""
+
+    def __init__(self, tokens_per_minute: int, chat_latency: float):
+        super().__init__(chat_latency=chat_latency, embedding_latency=0)
+        self.rate = tokens_per_minute / 60.0
+        self.capacity = self.rate * BURST_SECONDS
+        self.available = self.capacity
+        self.updated = time.monotonic()
+        self.rejected = 0
+        self.accepted_tokens = 0
+        completions = self.chat.completions
+        create = completions.create
+
+        async def throttled_create(model, messages, max_tokens=0, **kwargs):
+            now = time.monotonic()
+            self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+            self.updated = now
+            charge = sum(len(message["content"]) // 4 for message in messages) + max_tokens
+            if charge > self.available:
+                self.rejected += 1
+                await asyncio.sleep(0.01)
+                raise RateLimitError("429 Rate limit reached for tokens per min")
+            self.available -= charge
+            self.accepted_tokens += charge
+            return await create(model, messages, max_tokens=max_tokens, **kwargs)
+
+        completions.create = throttled_create
+
+
+async def run_enrichments(articles, budget: TokenBudget, tokens_per_minute: int, concurrency: int, chat_latency: float):
+    client = ThrottledStubClient(tokens_per_minute, chat_latency)
+    service = OpenAIService(client=client, use_cache=False, budget=budget)
+    semaphore = asyncio.Semaphore(concurrency)
+    failed = 0
+
+    async def enrich(title, content):
+        nonlocal failed
+        async with semaphore:
+            enrichment = await service.generate_enrichment(title, content)
+            # Every fallback answer means the article needs enriching again
+            failed += enrichment["summary"] == f"Summary of: {title}"
+
+    start = time.perf_counter()
+    await asyncio.gather(*(enrich(title, content) for title, content, _ in articles))
+    elapsed = time.perf_counter() - start
+    return client, failed, elapsed
+
+
+async def compare_rate_limiting(articles, tokens_per_minute: int, concurrency: int, chat_latency: float):
+    print(f"\nEnriching {len(articles)} articles, concurrency {concurrency}, "
+          f"stub limit {tokens_per_minute} tokens/min ({BURST_SECONDS}s burst)")
+    for name, limit in (("no limiter", 0), ("token bucket", tokens_per_minute)):
+        budget = TokenBudget(tokens_per_minute=limit, embedding_tokens_per_minute=0, requests_per_minute=0)
+        client, failed, elapsed = await run_enrichments(articles, budget, tokens_per_minute, concurrency, chat_latency)
+        usage = budget.stats()["usage"]
+        cost = sum(entry["cost_usd"] for entry in usage.values())
+        waits = sum(limits["tokens"]["waits"] for limits in budget.stats()["limits"].values())
+        print(
+            f"  {name:<13} 429s={client.rejected:5d}  failed enrichments={failed:4d}  "
+            f"calls={client.chat_calls:4d}  limiter waits={waits:4d}  "
+            f"{elapsed:6.2f}s  {client.accepted_tokens / elapsed * 60:10.0f} tokens/min  cost=${cost:.2f}"
+        )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--articles", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--prompt-tokens", type=int, default=1000, help="OPENAI_PROMPT_MAX_TOKENS")
+    parser.add_argument("--tokens-per-minute", type=int, default=1200000, help="Stubbed API token limit")
+    parser.add_argument("--chat-latency", type=float, default=0.05, help="Stubbed chat completion latency (s)")
+    args = parser.parse_args()
+
+    rng = random.Random(1017)
+    articles = [make_article(rng, serial) for serial in range(args.articles)]
+    compare_fitting(articles, args.prompt_tokens)
+    await compare_rate_limiting(articles, args.tokens_per_minute, args.concurrency, args.chat_latency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,70 @@
+"""
+Local vector store benchmark: bulk load, then top-k query latency
+Runs fully offline against a temporary LocalVectorStore directory
+
+Usage:
+    python backend/benchmarks/vector_search.py [--vectors 100000] [--queries 200] [--top-k 10]
+"""
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.services.local_vector_store import LocalVectorStore
+
+
+def percentile_ms(timings, q):
+    return float(np.percentile(timings, q)) * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--dimension", type=int, default=1024)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    store = LocalVectorStore(path=tempfile.mkdtemp(), dimension=args.dimension)
+
+    start = time.perf_counter()
+    for offset in range(0, args.vectors, 10000):
+        count = min(10000, args.vectors - offset)
+        vectors = rng.standard_normal((count, args.dimension), dtype=np.float32)
+        await store.upsert_embeddings([
+            {"article_id": offset + i + 1, "embedding": vectors[i], "metadata": {"source_id": (offset + i) % 50}}
+            for i in range(count)
+        ], chunk_size=10000)
+    elapsed = time.perf_counter() - start
+    print(f"Loaded {args.vectors} vectors in {elapsed:.1f}s ({args.vectors / elapsed:,.0f} vectors/sec)\n")
+
+    queries = rng.standard_normal((args.queries, args.dimension), dtype=np.float32)
+    for label, kwargs in [
+        ("unfiltered", {}),
+        ("source filter", {"filter_dict": {"source_id": 7}}),
+        ("exclude ids", {"exclude_ids": list(range(1, 101))}),
+    ]:
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            results = await store.search_similar(query, top_k=args.top_k, **kwargs)
+            timings.append(time.perf_counter() - start)
+        assert len(results) == args.top_k
+        print(
+            f"{label:<14} p50={percentile_ms(timings, 50):7.2f} ms  "
+            f"p99={percentile_ms(timings, 99):7.2f} ms"
+        )
+
+    await store.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
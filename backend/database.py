@@ -1,4 +1,5 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from fastapi import HTTPException
@@ -55,14 +56,35 @@ if not DATABASE_URL:
         print(f"⚠️  MySQL not available, using SQLite: {db_path}")
         print("✅ SQLite database will be created automatically (no installation needed)")
 
-# Create engine
+def get_async_database_url(url: str) -> str:
+    """Map a sync DATABASE_URL to the matching async driver (aiosqlite/aiomysql)"""
+    scheme, _, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    if dialect == "mysql":
+        return f"mysql+aiomysql://{rest}"
+    return url
+
+# Create engines: the sync engine is used for table creation, migrations and
+# scripts; request handlers and workers use the async engine
 try:
     if DATABASE_URL.startswith("sqlite"):
         engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False}, echo=False)
+        async_engine = create_async_engine(get_async_database_url(DATABASE_URL), echo=False)
     else:
         engine = create_engine(DATABASE_URL, pool_pre_ping=True, pool_recycle=300, connect_args={"connect_timeout": 2})
+        async_engine = create_async_engine(
+            get_async_database_url(DATABASE_URL),
+            pool_pre_ping=True,
+            pool_recycle=300,
+            pool_size=int(os.getenv("DB_POOL_SIZE", "10")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "20")),
+            connect_args={"connect_timeout": 2}
+        )
     
     SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
     
     # Test connection
     with engine.connect() as conn:
@@ -75,19 +97,18 @@ except Exception as e:
     print("⚠️  Server will run in memory-only mode (data won't be persisted)")
     DB_AVAILABLE = False
     engine = None
+    async_engine = None
     SessionLocal = None
+    AsyncSessionLocal = None
 
 Base = declarative_base()
 
 # Auto-create tables will be done in main.py after all models are imported
 
-def get_db():
-    """Dependency for getting database session"""
-    if not DB_AVAILABLE or SessionLocal is None:
+async def get_db():
+    """Dependency for getting an async database session"""
+    if not DB_AVAILABLE or AsyncSessionLocal is None:
         raise HTTPException(status_code=503, detail="Database not available. Please check database connection.")
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
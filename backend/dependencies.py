@@ -0,0 +1,94 @@
+"""
+Process-wide service instances
+Services are created once in the app lifespan and shared by every request
+through the FastAPI dependencies below, so their connection pools are reused.
+"""
+import asyncio
+from typing import Callable, Dict
+
+from fastapi import FastAPI, HTTPException, Request
+
+from backend.services.event_registry import EventRegistryService
+from backend.services.openai_service import OpenAIService
+from backend.services.search_cache import SemanticSearchCache
+from backend.services.vector_store import VectorStore, create_vector_store
+
+# app.state attribute -> (factory, label used in error messages)
+SERVICES: Dict[str, tuple] = {
+    "openai_service": (OpenAIService, "OpenAI"),
+    "vector_store": (create_vector_store, "Vector store"),
+    "event_registry": (EventRegistryService, "Event Registry"),
+}
+
+_locks: Dict[str, asyncio.Lock] = {}
+
+
+async def _create_service(factory: Callable):
+    # Constructors may block (Pinecone lists indexes, the local store maps files)
+    return await asyncio.to_thread(factory)
+
+
+async def init_services(app: FastAPI):
+    """Create all services at startup; failures are retried on first use"""
+    app.state.search_cache = SemanticSearchCache()
+    for name, (factory, label) in SERVICES.items():
+        setattr(app.state, name, None)
+        try:
+            setattr(app.state, name, await _create_service(factory))
+            print(f"✅ {label} service ready")
+        except Exception as e:
+            print(f"⚠️  {label} service not available: {e}")
+
+
+async def close_services(app: FastAPI):
+    """Close pooled connections held by the services"""
+    for name, (_, label) in SERVICES.items():
+        service = getattr(app.state, name, None)
+        if service is None:
+            continue
+        try:
+            await service.aclose()
+        except Exception as e:
+            print(f"Error closing {label} service: {e}")
+        setattr(app.state, name, None)
+
+
+async def _get_service(request: Request, name: str):
+    service = getattr(request.app.state, name, None)
+    if service is not None:
+        return service
+
+    factory, label = SERVICES[name]
+    lock = _locks.setdefault(name, asyncio.Lock())
+    async with lock:
+        service = getattr(request.app.state, name, None)
+        if service is None:
+            try:
+                service = await _create_service(factory)
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"{label} service error: {str(e)}")
+            setattr(request.app.state, name, service)
+    return service
+
+
+async def get_openai_service(request: Request) -> OpenAIService:
+    """Dependency for the shared OpenAI service"""
+    return await _get_service(request, "openai_service")
+
+
+async def get_vector_store(request: Request) -> VectorStore:
+    """Dependency for the shared vector store (VECTOR_BACKEND)"""
+    return await _get_service(request, "vector_store")
+
+
+async def get_event_registry(request: Request) -> EventRegistryService:
+    """Dependency for the shared Event Registry service"""
+    return await _get_service(request, "event_registry")
+
+
+def get_search_cache(request: Request) -> SemanticSearchCache:
+    """Dependency for the process-wide semantic search cache"""
+    search_cache = getattr(request.app.state, "search_cache", None)
+    if search_cache is None:
+        search_cache = request.app.state.search_cache = SemanticSearchCache()
+    return search_cache
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import os
@@ -8,7 +9,13 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from backend.routers import articles, news
-from backend.database import engine, Base, DB_AVAILABLE
+from backend.database import engine, async_engine, Base, DB_AVAILABLE
+from backend.dependencies import init_services, close_services
+from backend.services.enrichment_queue import EnrichmentWorkerPool
+from backend.services.fulltext import ensure_fulltext_index
+from backend.services.response_cache import response_cache
+from backend.services.story_clusters import story_index
+from backend.services.token_budget import token_budget
 
 # Import models to register them with Base
 from backend import models
@@ -18,15 +25,39 @@ if DB_AVAILABLE and engine:
     try:
         Base.metadata.create_all(bind=engine)
         print("✅ Database tables created/verified automatically")
+        if ensure_fulltext_index(engine):
+            print("✅ Full-text search index ready")
     except Exception as e:
         print(f"⚠️  Warning: Could not create database tables: {e}")
 else:
     print("⚠️  Database not available - tables will not be created")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared service instances (connection pools are reused across requests)
+    await init_services(app)
+    
+    # Background AI enrichment workers (ENRICHMENT_WORKERS=0 disables them)
+    app.state.enrichment_pool = None
+    if DB_AVAILABLE:
+        app.state.enrichment_pool = EnrichmentWorkerPool(
+            openai_service=app.state.openai_service,
+            vector_store=app.state.vector_store
+        )
+        await app.state.enrichment_pool.start()
+    yield
+    if app.state.enrichment_pool:
+        await app.state.enrichment_pool.stop()
+    await close_services(app)
+    await response_cache.aclose()
+    if async_engine:
+        await async_engine.dispose()
+
 app = FastAPI(
     title="AI News Agency API",
     description="AI-powered news agency with semantic search capabilities",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS configuration - MUST be before routes
@@ -52,3 +83,38 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/ai-cache")
+async def ai_cache_stats():
+    """Hit/miss counters for the OpenAI response cache"""
+    openai_service = getattr(app.state, "openai_service", None)
+    if openai_service is None or openai_service.cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **openai_service.cache.stats()}
+
+@app.get("/health/openai-usage")
+async def openai_usage_stats():
+    """Token usage, cost and rate limiter waits for OpenAI calls in this process"""
+    return token_budget.stats()
+
+@app.get("/health/search-cache")
+async def search_cache_stats():
+    """Hit/miss and coalescing counters for semantic search"""
+    search_cache = getattr(app.state, "search_cache", None)
+    return search_cache.stats() if search_cache else {}
+
+@app.get("/health/event-registry")
+async def event_registry_stats():
+    """Request, retry, hedging and circuit breaker state for the Event Registry client"""
+    event_registry = getattr(app.state, "event_registry", None)
+    return event_registry.stats() if event_registry else {}
+
+@app.get("/health/story-clusters")
+async def story_cluster_stats():
+    """Active story clusters and assignment counters for this process"""
+    return story_index.stats()
+
+@app.get("/health/response-cache")
+async def response_cache_stats():
+    """Hit/miss, 304 and invalidation counters for cached article responses"""
+    return response_cache.stats()
+
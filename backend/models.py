@@ -1,5 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy import BigInteger, Column, Integer, LargeBinary, SmallInteger, String, Text, DateTime, ForeignKey, JSON, Index
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 from backend.database import Base
 
@@ -7,7 +7,7 @@ class Source(Base):
     __tablename__ = "sources"
     
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(255), nullable=False, index=True)
+    name = Column(String(255), nullable=False, unique=True, index=True)
     uri = Column(String(500), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -25,6 +25,18 @@ class Article(Base):
     published_date = Column(DateTime(timezone=True), nullable=True, index=True)
     source_id = Column(Integer, ForeignKey("sources.id"), nullable=True)
     
+    # Dedup keys
+    uri = Column(String(255), nullable=True, unique=True, index=True)  # Event Registry article URI
+    url = Column(String(1000), nullable=True)
+    content_hash = Column(String(64), nullable=True, unique=True, index=True)  # SHA-256 of normalized body (or title)
+    
+    # Near-duplicate clustering: the cluster's first article, NULL for canonical articles
+    duplicate_of_id = Column(Integer, ForeignKey("articles.id"), nullable=True, index=True)
+    minhash = deferred(Column(LargeBinary, nullable=True))  # MinHash signature of title + body
+    
+    # Story cluster (same event, different coverage), assigned from the embedding
+    story_cluster_id = Column(Integer, ForeignKey("story_clusters.id"), nullable=True, index=True)
+    
     # AI-generated fields
     ai_summary = Column(Text, nullable=True)
     ai_tags = Column(JSON, nullable=True)  # Store as JSON array
@@ -36,8 +48,16 @@ class Article(Base):
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
-    source = relationship("Source", back_populates="articles")
+    source = relationship("Source", back_populates="articles", lazy="selectin")  # Eager: async sessions can't lazy-load
     ai_metadata = relationship("AIMetadata", back_populates="article", uselist=False, cascade="all, delete-orphan")
+    enrichment_jobs = relationship("EnrichmentJob", back_populates="article", cascade="all, delete-orphan")
+    minhash_bands = relationship("MinHashBand", cascade="all, delete-orphan")
+    tag_links = relationship("ArticleTag", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Backs the newest-first list ordering and keyset cursors
+        Index("ix_articles_published_date_id", "published_date", "id"),
+    )
 
 class AIMetadata(Base):
     __tablename__ = "ai_metadata"
@@ -45,10 +65,95 @@ class AIMetadata(Base):
     id = Column(Integer, primary_key=True, index=True)
     article_id = Column(Integer, ForeignKey("articles.id"), unique=True, nullable=False)
     embedding_id = Column(String(255), nullable=True, index=True)  # Pinecone vector ID
-    similarity_scores = Column(JSON, nullable=True)  # Store similarity scores for related articles
+    similarity_scores = Column(JSON, nullable=True)  # Precomputed related articles: {"neighbors": [{"article_id", "score"}], "top_k"}
+    similarity_updated_at = Column(DateTime(timezone=True), nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationship
     article = relationship("Article", back_populates="ai_metadata")
 
+
+class EnrichmentJob(Base):
+    __tablename__ = "enrichment_jobs"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    article_id = Column(Integer, ForeignKey("articles.id"), nullable=False, index=True)
+    status = Column(String(20), nullable=False, default="pending", index=True)  # pending, processing, completed, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # Relationship
+    article = relationship("Article", back_populates="enrichment_jobs")
+
+class AICacheEntry(Base):
+    __tablename__ = "ai_cache_entries"
+    
+    key = Column(String(64), primary_key=True)  # SHA-256 of model, prompt version and input
+    kind = Column(String(32), nullable=False)  # summary, tags, caption, image_prompt, enrichment, embedding
+    value = Column(JSON, nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+class KeywordHighWaterMark(Base):
+    __tablename__ = "keyword_high_water_marks"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    keyword = Column(String(255), unique=True, nullable=False, index=True)
+    latest_published_date = Column(DateTime(timezone=True), nullable=True)  # Newest article seen for the keyword
+    # Catch-up after a run hit the page limit before reaching the mark: the
+    # next page to fetch, and the newest date that run saw (the next mark)
+    resume_page = Column(Integer, nullable=True)
+    pending_published_date = Column(DateTime(timezone=True), nullable=True)
+    last_harvested_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+class MinHashBand(Base):
+    __tablename__ = "minhash_bands"
+    
+    # LSH index: one row per band of a canonical article's MinHash signature
+    id = Column(Integer, primary_key=True)
+    band = Column(SmallInteger, nullable=False)
+    bucket = Column(BigInteger, nullable=False)  # 64-bit hash of the band's rows
+    article_id = Column(Integer, ForeignKey("articles.id"), nullable=False, index=True)
+    
+    __table_args__ = (
+        Index("ix_minhash_bands_band_bucket", "band", "bucket"),
+    )
+
+class StoryCluster(Base):
+    __tablename__ = "story_clusters"
+    
+    # Running mean of the member embeddings; active clusters are held in memory
+    id = Column(Integer, primary_key=True, index=True)
+    centroid = deferred(Column(LargeBinary, nullable=False))  # float32 vector
+    size = Column(Integer, nullable=False, default=1)  # Embedded (canonical) members
+    first_seen_at = Column(DateTime(timezone=True), nullable=True)
+    last_seen_at = Column(DateTime(timezone=True), nullable=True, index=True)  # Newest member's publish time
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+class Tag(Base):
+    __tablename__ = "tags"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(100), unique=True, nullable=False, index=True)  # Normalized: lowercased, deduplicated
+    article_count = Column(Integer, nullable=False, default=0, index=True)  # Maintained with article_tags (facet counts)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+class ArticleTag(Base):
+    __tablename__ = "article_tags"
+    
+    article_id = Column(Integer, ForeignKey("articles.id"), primary_key=True)
+    tag_id = Column(Integer, ForeignKey("tags.id"), primary_key=True)
+    
+    __table_args__ = (
+        # Backs ?tag= filtering; the primary key serves per-article lookups
+        Index("ix_article_tags_tag_id_article_id", "tag_id", "article_id"),
+    )
@@ -1,120 +1,353 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, or_
-from typing import Optional, List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import desc, false, func, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only, noload, selectinload
+from typing import Dict, Optional, List
 from datetime import datetime
 from backend.database import DB_AVAILABLE
 
 from backend.database import get_db
-from backend.models import Article, Source, AIMetadata
+from backend.dependencies import get_openai_service, get_vector_store, get_search_cache
+from backend.models import Article, ArticleTag, Source, AIMetadata, EnrichmentJob, Tag
 from backend.schemas import (
     Article as ArticleSchema,
     ArticleCreate,
     ArticleUpdate,
+    ArticleListItem,
     ArticleListResponse,
     SemanticSearchRequest,
     SemanticSearchResponse,
     SemanticSearchResult,
-    SocialPostResponse
+    SearchMetadata,
+    SocialPostResponse,
+    TagFacet,
+    TrendingResponse,
+    TrendingStory,
+    RelatedArticles as RelatedArticlesSchema,
+    EnrichmentJob as EnrichmentJobSchema
 )
 from backend.services.openai_service import OpenAIService
-from backend.services.pinecone_service import PineconeService
+from backend.services.vector_store import VectorStore
+from backend.services.search_cache import SemanticSearchCache
+from backend.services.bulk_insert import bulk_insert
+from backend.services.enrichment_queue import enqueue_articles, process_article
+from backend.services.ingestion import compute_content_hash
+from backend.services.near_duplicates import detach_cluster
+from backend.services.fulltext import match_article_ids
+from backend.services.hybrid_search import StageTimer, ranked_search
+from backend.services.pagination import InvalidCursor, after_cursor, count_cache, encode_cursor
+from backend.services.response_cache import last_modified_of, response_cache
+from backend.services.related_graph import RELATED_TOP_K, set_neighbors, stored_neighbors, to_neighbors
+from backend.services.story_clusters import story_index
+from backend.services.tags import index_article_tags, normalize_tags, remove_article_tags, tag_facets
 
 router = APIRouter()
 
-@router.get("/articles", response_model=ArticleListResponse)
-async def get_articles(
-    page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1, le=100),
-    search: Optional[str] = None,
-    source_id: Optional[int] = None,
-    db: Session = Depends(get_db)
+# Feed fields returned when no fields= is given (bodies are left out)
+LIST_DEFAULT_FIELDS = (
+    "id", "title", "snippet", "image_url", "url", "published_date", "source_id", "source",
+    "ai_summary", "ai_tags", "ai_caption", "created_at", "updated_at"
+)
+LIST_FIELDS = set(ArticleListItem.model_fields)
+
+def _parse_fields(fields: Optional[str]) -> List[str]:
+    """Validate a comma-separated sparse fieldset (id is always included)"""
+    if not fields:
+        return list(LIST_DEFAULT_FIELDS)
+    requested = ["id"] + [field.strip() for field in fields.split(",") if field.strip() and field.strip() != "id"]
+    unknown = [field for field in requested if field not in LIST_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(sorted(LIST_FIELDS))}"
+        )
+    return list(dict.fromkeys(requested))
+
+def _truncate(text: Optional[str], length: int) -> Optional[str]:
+    """Cut text to length characters at a word boundary"""
+    if not text or len(text) <= length:
+        return text
+    cut = text[:length]
+    if " " in cut:
+        cut = cut[:cut.rindex(" ")]
+    return cut.rstrip() + "…"
+
+async def _related_lists(
+    db: AsyncSession,
+    vector_store: VectorStore,
+    metadata_rows: List[AIMetadata],
+    top_k: int
+) -> Dict[int, List[Article]]:
+    """Related articles per article: stored neighbour lists, misses queried concurrently by vector ID"""
+    neighbor_lists = {row.article_id: stored_neighbors(row) for row in metadata_rows}
+    misses = [row for row in metadata_rows if neighbor_lists[row.article_id] is None and row.embedding_id]
+    if misses:
+        results = await vector_store.search_many_by_id([
+            {"vector_id": row.embedding_id, "top_k": RELATED_TOP_K, "exclude_ids": [row.article_id]}
+            for row in misses
+        ])
+        for row, matches in zip(misses, results):
+            neighbor_lists[row.article_id] = to_neighbors(matches, row.article_id)
+            if matches:
+                set_neighbors(row, neighbor_lists[row.article_id])
+        await db.commit()
+    
+    # One query for every neighbour of every requested article
+    neighbor_ids = {neighbor["article_id"] for neighbors in neighbor_lists.values() for neighbor in neighbors or []}
+    articles = {}
+    if neighbor_ids:
+        result = await db.execute(select(Article).where(Article.id.in_(neighbor_ids)))
+        articles = {article.id: article for article in result.scalars().all()}
+    
+    # Deleted neighbours are skipped
+    return {
+        article_id: [articles[n["article_id"]] for n in neighbors or [] if n["article_id"] in articles][:top_k]
+        for article_id, neighbors in neighbor_lists.items()
+    }
+
+async def _list_articles(
+    db: AsyncSession,
+    page: int,
+    page_size: int,
+    search: Optional[str],
+    source_id: Optional[int],
+    cursor: Optional[str],
+    include_total: bool,
+    fields: Optional[str],
+    snippet_length: int,
+    tag: Optional[str] = None,
+    facets: bool = False,
+    facet_limit: int = 20
 ):
-    """Get all articles with pagination and filtering"""
-    if not db:
-        raise HTTPException(status_code=503, detail="Database not available")
-    query = db.query(Article)
+    """Build one page of the article list (payload, last modified)"""
+    selected = _parse_fields(fields)
+    query = select(Article)
+    ordering = [desc(Article.published_date), desc(Article.id)]
     
     # Apply filters
     if search:
-        query = query.filter(
-            or_(
-                Article.title.contains(search),
-                Article.content.contains(search),
-                Article.ai_summary.contains(search)
+        fulltext = match_article_ids(db.bind.dialect.name, search)
+        if fulltext:
+            # Full-text index probe, ranked by relevance (cursor pages stay date-ordered)
+            matches, relevance = fulltext
+            query = query.join(matches, matches.c.article_id == Article.id)
+            if not cursor:
+                ordering.insert(0, relevance)
+        else:
+            query = query.where(
+                or_(
+                    Article.title.contains(search),
+                    Article.content.contains(search),
+                    Article.ai_summary.contains(search)
+                )
             )
-        )
     
     if source_id:
-        query = query.filter(Article.source_id == source_id)
-    
-    # Get total count
-    total = query.count()
-    
-    # Apply pagination and ordering
-    articles = query.order_by(desc(Article.published_date)).offset((page - 1) * page_size).limit(page_size).all()
+        query = query.where(Article.source_id == source_id)
+    
+    # Tag filter: index join on article_tags (tag_id, article_id)
+    tag_row = None
+    if tag:
+        names = normalize_tags([tag])
+        if not names:
+            raise HTTPException(status_code=400, detail="tag must not be empty")
+        tag_row = (await db.execute(select(Tag.id, Tag.article_count).where(Tag.name == names[0]))).first()
+        query = query.join(ArticleTag, ArticleTag.article_id == Article.id).where(
+            ArticleTag.tag_id == tag_row.id if tag_row else false()
+        )
     
-    total_pages = (total + page_size - 1) // page_size
+    # Total for the filter, not the page; served from a short-TTL cache
+    total = None
+    total_pages = None
+    if include_total:
+        if tag and not search and not source_id:
+            # Maintained with the tag links, no count query
+            total = tag_row.article_count if tag_row else 0
+        else:
+            count_query = select(func.count()).select_from(query.subquery())
+            total = await count_cache.get((search, source_id, tag), lambda: db.scalar(count_query))
+        total_pages = (total + page_size - 1) // page_size
     
-    return ArticleListResponse(
-        articles=articles,
+    # Keyset pagination on (published_date, id); OFFSET only for page numbers
+    if cursor:
+        try:
+            query = query.where(after_cursor(cursor))
+        except InvalidCursor as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        query = query.offset((page - 1) * page_size)
+    
+    # Load only the selected columns (id/published_date are needed for cursors);
+    # the snippet is cut in SQL so bodies never leave the database
+    columns = {"id", "published_date", "created_at", "updated_at", *selected} & set(Article.__table__.columns.keys())
+    query = query.options(
+        load_only(*(getattr(Article, name) for name in columns)),
+        selectinload(Article.source) if "source" in selected else noload(Article.source)
+    )
+    if "snippet" in selected:
+        query = query.add_columns(func.substr(Article.content, 1, snippet_length + 1).label("snippet"))
+    
+    # Fetch one extra row to know whether there is a next page
+    result = await db.execute(query.order_by(*ordering).limit(page_size + 1))
+    rows = result.all()
+    
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        # Cursors follow date order, so relevance-ranked pages don't get one
+        if len(ordering) == 2:
+            last = rows[-1][0]
+            next_cursor = encode_cursor(last.published_date, last.id)
+    
+    items = []
+    for row in rows:
+        article = row[0]
+        item = {name: getattr(article, name) for name in selected if name != "snippet"}
+        if "snippet" in selected:
+            item["snippet"] = _truncate(row.snippet, snippet_length)
+        items.append(ArticleListItem.model_validate(item, from_attributes=True))
+    
+    response = ArticleListResponse(
+        articles=items,
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
+    )
+    if facets:
+        response.facets = [TagFacet(**facet) for facet in await tag_facets(db, facet_limit)]
+    return response.model_dump(exclude_unset=True), last_modified_of(row[0] for row in rows)
+
+
+@router.get("/articles", response_model=ArticleListResponse)
+async def get_articles(
+    request: Request,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    search: Optional[str] = None,
+    source_id: Optional[int] = None,
+    tag: Optional[str] = Query(None, description="Only articles with this tag (case-insensitive)"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page (newest-first keyset pagination)"),
+    include_total: bool = Query(True, description="Return total/total_pages (cached briefly per filter)"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,snippet (content must be requested explicitly)"),
+    snippet_length: int = Query(200, ge=1, le=2000),
+    facets: bool = Query(False, description="Include the most used tags with their article counts"),
+    facet_limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get all articles with pagination and filtering"""
+    if not db:
+        raise HTTPException(status_code=503, detail="Database not available")
+    return await response_cache.respond(
+        request,
+        lambda: _list_articles(
+            db, page, page_size, search, source_id, cursor, include_total, fields, snippet_length,
+            tag, facets, facet_limit
+        )
     )
 
+@router.get("/articles/related", response_model=List[RelatedArticlesSchema])
+async def get_related_articles_batch(
+    request: Request,
+    ids: str = Query(..., description="Comma-separated article IDs (max 50)"),
+    top_k: int = Query(5, ge=1, le=20),
+    db: AsyncSession = Depends(get_db),
+    vector_store: VectorStore = Depends(get_vector_store)
+):
+    """Get related articles for several articles in one call"""
+    if not db:
+        raise HTTPException(status_code=503, detail="Database not available")
+    try:
+        article_ids = list(dict.fromkeys(int(value) for value in ids.split(",") if value.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be comma-separated integers")
+    if not article_ids or len(article_ids) > 50:
+        raise HTTPException(status_code=400, detail="Provide between 1 and 50 article IDs")
+    
+    async def build():
+        result = await db.execute(select(AIMetadata).where(AIMetadata.article_id.in_(article_ids)))
+        related = await _related_lists(db, vector_store, result.scalars().all(), top_k)
+        # Articles without embeddings get an empty list
+        payload = [
+            RelatedArticlesSchema(
+                article_id=article_id,
+                related=[ArticleSchema.model_validate(article) for article in related.get(article_id, [])]
+            )
+            for article_id in article_ids
+        ]
+        return payload, last_modified_of(article for articles in related.values() for article in articles)
+    
+    return await response_cache.respond(request, build)
+
 @router.get("/articles/{article_id}", response_model=ArticleSchema)
-async def get_article(article_id: int, db: Session = Depends(get_db)):
+async def get_article(article_id: int, request: Request, db: AsyncSession = Depends(get_db)):
     """Get a single article by ID"""
     if not db:
         raise HTTPException(status_code=503, detail="Database not available")
-    article = db.query(Article).filter(Article.id == article_id).first()
-    if not article:
-        raise HTTPException(status_code=404, detail="Article not found")
-    return article
+    
+    async def build():
+        article = await db.get(Article, article_id)
+        if not article:
+            raise HTTPException(status_code=404, detail="Article not found")
+        return ArticleSchema.model_validate(article), last_modified_of([article])
+    
+    return await response_cache.respond(request, build)
 
 @router.post("/articles", response_model=ArticleSchema, status_code=201)
-async def create_article(article_data: ArticleCreate, db: Session = Depends(get_db)):
+async def create_article(article_data: ArticleCreate, db: AsyncSession = Depends(get_db)):
     """Create a new article"""
     if not db:
         raise HTTPException(status_code=503, detail="Database not available")
     # Handle source
     source = None
     if article_data.source_id:
-        source = db.query(Source).filter(Source.id == article_data.source_id).first()
+        source = await db.get(Source, article_data.source_id)
     elif article_data.source_name:
         # Find or create source by name
-        source = db.query(Source).filter(Source.name == article_data.source_name).first()
+        result = await db.execute(select(Source).where(Source.name == article_data.source_name))
+        source = result.scalars().first()
         if not source:
-            source = Source(name=article_data.source_name)
-            db.add(source)
-            db.flush()
+            # Skips the insert if a concurrent request created the source first
+            await bulk_insert(db, Source.__table__, [{"name": article_data.source_name}], Source.__table__.c.name)
+            result = await db.execute(select(Source).where(Source.name == article_data.source_name))
+            source = result.scalars().first()
     
     # Create article
     article = Article(
         title=article_data.title,
         content=article_data.content,
         image_url=article_data.image_url,
+        url=article_data.url,
+        uri=article_data.uri,
+        content_hash=compute_content_hash(article_data.title, article_data.content),
         published_date=article_data.published_date,
         source_id=source.id if source else None
     )
     
     db.add(article)
-    db.commit()
-    db.refresh(article)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Article already exists")
+    await response_cache.invalidate()
+    await db.refresh(article)
     return article
 
 @router.put("/articles/{article_id}", response_model=ArticleSchema)
 async def update_article(
     article_id: int,
     article_data: ArticleUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Update an article"""
     if not db:
         raise HTTPException(status_code=503, detail="Database not available")
-    article = db.query(Article).filter(Article.id == article_id).first()
+    article = await db.get(Article, article_id)
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
     
@@ -122,32 +355,67 @@ async def update_article(
     update_data = article_data.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(article, field, value)
+    if "title" in update_data or "content" in update_data:
+        article.content_hash = compute_content_hash(article.title, article.content)
+    if "ai_tags" in update_data:
+        article.ai_tags = normalize_tags(article.ai_tags)
+        # Only this article: its near-duplicates keep their own ai_tags
+        await index_article_tags(db, {article_id: article.ai_tags}, include_duplicates=False)
     
-    db.commit()
-    db.refresh(article)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=409, detail="Another article has the same content")
+    await response_cache.invalidate()
+    await db.refresh(article)
     return article
 
 @router.delete("/articles/{article_id}", status_code=204)
-async def delete_article(article_id: int, db: Session = Depends(get_db)):
+async def delete_article(
+    article_id: int,
+    db: AsyncSession = Depends(get_db),
+    vector_store: VectorStore = Depends(get_vector_store)
+):
     """Delete an article"""
     if not db:
         raise HTTPException(status_code=503, detail="Database not available")
-    article = db.query(Article).filter(Article.id == article_id).first()
+    article = await db.get(Article, article_id)
     if not article:
         raise HTTPException(status_code=404, detail="Article not found")
     
-    db.delete(article)
-    db.commit()
+    # A deleted canonical hands its near-duplicate cluster to the oldest member
+    promoted_id = await detach_cluster(db, article_id)
+    if promoted_id:
+        await enqueue_articles(db, [promoted_id])
+    await remove_article_tags(db, [article_id])
+    await db.delete(article)
+    await db.commit()
+    await response_cache.invalidate()
+    # Otherwise similarity search keeps returning the deleted article's vectors
+    try:
+        await vector_store.delete_by_article_id(article_id)
+    except Exception as e:
+        print(f"Warning: Could not delete embeddings for article {article_id}: {e}")
     return None
 
-@router.post("/articles/{article_id}/process-ai", response_model=ArticleSchema)
-async def process_article_ai(article_id: int, db: Session = Depends(get_db)):
+@router.post(
+    "/articles/{article_id}/process-ai",
+    response_model=ArticleSchema,
+    responses={202: {"model": EnrichmentJobSchema, "description": "Enrichment job queued"}}
+)
+async def process_article_ai(
+    article_id: int,
+    request: Request,
+    background: bool = Query(False, description="Queue the article for background enrichment and return 202"),
+    db: AsyncSession = Depends(get_db)
+):
     """Process article through AI pipeline"""
     if not db:
         raise HTTPException(status_code=503, detail="Database not available. SQLite database should be created automatically.")
     
     # Get article from database
-    article = db.query(Article).filter(Article.id == article_id).first()
+    article = await db.get(Article, article_id)
     
     # If article not in database
     if not article:
@@ -156,166 +424,172 @@ async def process_article_ai(article_id: int, db: Session = Depends(get_db)):
             detail=f"Article with ID {article_id} not found. Please fetch news first to save articles to database."
         )
     
-    try:
-        openai_service = OpenAIService()
-    except ValueError as e:
-        raise HTTPException(status_code=500, detail=f"OpenAI service error: {str(e)}")
-    
-    try:
-        pinecone_service = PineconeService()
-    except (ValueError, Exception) as e:
-        raise HTTPException(status_code=500, detail=f"Pinecone service error: {str(e)}")
-    
-    # Generate AI content
-    ai_summary = await openai_service.generate_summary(article.title, article.content or "")
-    ai_tags = await openai_service.generate_tags(article.title, article.content or "")
-    ai_caption = await openai_service.generate_caption(article.title, article.content or "")
-    ai_image_prompt = await openai_service.generate_image_prompt(article.title, article.content or "")
-    
-    # Update article
-    article.ai_summary = ai_summary
-    article.ai_tags = ai_tags
-    article.ai_caption = ai_caption
-    article.ai_image_prompt = ai_image_prompt
-    
-    # Generate embedding
-    embedding = await openai_service.generate_embedding(article.title + " " + (article.content or ""))
-    
-    # Store in Pinecone
-    try:
-        embedding_id = await pinecone_service.upsert_embedding(
-            article_id=article_id,
-            embedding=embedding,
-            metadata={
-                "title": article.title,
-                "article_id": article_id,
-                "source_id": article.source_id
-            }
+    if background:
+        job = (await enqueue_articles(db, [article_id]))[0]
+        await db.commit()
+        await db.refresh(job)
+        pool = getattr(request.app.state, "enrichment_pool", None)
+        if pool:
+            pool.notify()
+        return JSONResponse(
+            status_code=202,
+            content=jsonable_encoder(EnrichmentJobSchema.model_validate(job))
         )
-        
-        # Update or create AI metadata
-        ai_metadata = db.query(AIMetadata).filter(AIMetadata.article_id == article_id).first()
-        if not ai_metadata:
-            ai_metadata = AIMetadata(article_id=article_id, embedding_id=embedding_id)
-            db.add(ai_metadata)
-        else:
-            ai_metadata.embedding_id = embedding_id
-    except Exception as e:
-        print(f"Warning: Could not store embedding: {e}")
     
-    db.commit()
-    db.refresh(article)
+    openai_service = await get_openai_service(request)
+    vector_store = await get_vector_store(request)
+    
+    await process_article(db, article, openai_service, vector_store)
+    
+    await db.commit()
+    await response_cache.invalidate()
+    await db.refresh(article)
     
     return article
 
+@router.get("/enrichment-jobs/{job_id}", response_model=EnrichmentJobSchema)
+async def get_enrichment_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    """Get the status of a background enrichment job"""
+    if not db:
+        raise HTTPException(status_code=503, detail="Database not available")
+    job = await db.get(EnrichmentJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Enrichment job not found")
+    return job
+
 @router.get("/articles/{article_id}/related", response_model=List[ArticleSchema])
 async def get_related_articles(
     article_id: int,
+    request: Request,
     top_k: int = Query(5, ge=1, le=20),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    vector_store: VectorStore = Depends(get_vector_store)
 ):
-    """Get related articles using semantic search"""
+    """Get related articles (precomputed neighbours, live semantic search on a miss)"""
     if not db:
         raise HTTPException(status_code=503, detail="Database not available")
-    article = db.query(Article).filter(Article.id == article_id).first()
-    if not article:
-        raise HTTPException(status_code=404, detail="Article not found")
-    
-    ai_metadata = db.query(AIMetadata).filter(AIMetadata.article_id == article_id).first()
-    if not ai_metadata or not ai_metadata.embedding_id:
-        raise HTTPException(status_code=404, detail="Article embedding not found. Please process article with AI first.")
-    
-    try:
-        pinecone_service = PineconeService()
-    except (ValueError, Exception) as e:
-        raise HTTPException(status_code=500, detail=f"Pinecone service error: {str(e)}")
     
-    try:
-        openai_service = OpenAIService()
-    except ValueError as e:
-        raise HTTPException(status_code=500, detail=f"OpenAI service error: {str(e)}")
-    
-    # Get article embedding from Pinecone
-    embedding = await pinecone_service.get_embedding(ai_metadata.embedding_id)
-    if not embedding:
-        raise HTTPException(status_code=404, detail="Embedding not found in vector database")
-    
-    # Search for similar articles
-    similar_results = await pinecone_service.search_similar(
-        embedding=embedding,
-        top_k=top_k + 1,  # +1 to exclude the article itself
-        exclude_ids=[article_id]
-    )
-    
-    # Get article IDs from results
-    article_ids = [result["article_id"] for result in similar_results]
-    
-    # Fetch articles from database
-    articles = db.query(Article).filter(Article.id.in_(article_ids)).all()
-    
-    # Sort by similarity score
-    article_dict = {a.id: a for a in articles}
-    sorted_articles = [article_dict[result["article_id"]] for result in similar_results if result["article_id"] in article_dict]
+    async def build():
+        result = await db.execute(select(AIMetadata).where(AIMetadata.article_id == article_id))
+        ai_metadata = result.scalars().first()
+        if not ai_metadata or not ai_metadata.embedding_id:
+            if not await db.get(Article, article_id):
+                raise HTTPException(status_code=404, detail="Article not found")
+            raise HTTPException(status_code=404, detail="Article embedding not found. Please process article with AI first.")
+        
+        # Precomputed neighbour list; live query by vector ID only on a miss
+        related = (await _related_lists(db, vector_store, [ai_metadata], top_k))[article_id]
+        return [ArticleSchema.model_validate(article) for article in related], last_modified_of(related)
     
-    return sorted_articles
+    return await response_cache.respond(request, build)
 
 @router.post("/articles/semantic-search", response_model=SemanticSearchResponse)
 async def semantic_search(
     request: SemanticSearchRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    openai_service: OpenAIService = Depends(get_openai_service),
+    vector_store: VectorStore = Depends(get_vector_store),
+    search_cache: SemanticSearchCache = Depends(get_search_cache)
 ):
-    """Semantic search for articles using vector similarity"""
+    """Semantic search for articles (vector similarity, or hybrid full-text + vector)"""
     if not db:
         raise HTTPException(status_code=503, detail="Database not available")
-    try:
-        openai_service = OpenAIService()
-    except ValueError as e:
-        raise HTTPException(status_code=500, detail=f"OpenAI service error: {str(e)}")
-    
-    try:
-        pinecone_service = PineconeService()
-    except (ValueError, Exception) as e:
-        raise HTTPException(status_code=500, detail=f"Pinecone service error: {str(e)}")
-    
-    # Generate embedding for query
-    query_embedding = await openai_service.generate_embedding(request.query)
-    
-    # Search in Pinecone
-    search_results = await pinecone_service.search_similar(
-        embedding=query_embedding,
-        top_k=request.top_k
+    # Vector results and query embeddings are served from cache and concurrent
+    # identical queries share one call; hybrid mode adds full-text retrieval
+    timer = StageTimer()
+    search_results, metadata = await ranked_search(
+        db,
+        request.query,
+        request.top_k,
+        vector_store=vector_store,
+        search_cache=search_cache,
+        embed=openai_service.generate_embedding,
+        mode=request.mode,
+        diversify=request.diversify,
+        mmr_lambda=request.mmr_lambda,
+        timer=timer
     )
     
-    # Get article IDs
-    article_ids = [result["article_id"] for result in search_results]
-    
     # Fetch articles from database
-    articles = db.query(Article).filter(Article.id.in_(article_ids)).all()
-    article_dict = {a.id: a for a in articles}
+    article_ids = [result["article_id"] for result in search_results]
+    result = await timer.measure("load", db.execute(select(Article).where(Article.id.in_(article_ids))))
+    article_dict = {a.id: a for a in result.scalars().all()}
     
-    # Build response with similarity scores
+    # Build response in ranked order with per-retriever scores
+    hybrid = request.mode == "hybrid"
     results = []
     for result in search_results:
         article_id = result["article_id"]
         if article_id in article_dict:
             results.append(SemanticSearchResult(
                 article=article_dict[article_id],
-                similarity_score=result["score"]
+                similarity_score=result["similarity_score"],
+                fused_score=result["score"] if hybrid else None,
+                lexical_rank=result["lexical_rank"],
+                vector_rank=result["vector_rank"]
             ))
     
     return SemanticSearchResponse(
         results=results,
         query=request.query,
-        total_results=len(results)
+        total_results=len(results),
+        metadata=SearchMetadata(**metadata, timings_ms=timer.total())
+    )
+
+@router.get("/trending", response_model=TrendingResponse)
+async def get_trending(
+    limit: int = Query(10, ge=1, le=100),
+    snippet_length: int = Query(200, ge=1, le=2000),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get the hottest story clusters (served from in-memory time-bucket counters)"""
+    if not db:
+        raise HTTPException(status_code=503, detail="Database not available")
+    await story_index.ensure_loaded(db)
+    stories = story_index.trending(limit)
+    
+    # One query for the headline article of every story
+    headline_ids = [story["headline_id"] for story in stories if story["headline_id"]]
+    headlines = {}
+    if headline_ids:
+        result = await db.execute(select(Article).where(Article.id.in_(headline_ids)))
+        headlines = {article.id: article for article in result.scalars().all()}
+    
+    def headline(article_id: Optional[int]) -> Optional[ArticleListItem]:
+        article = headlines.get(article_id)
+        if article is None:
+            return None
+        item = {name: getattr(article, name) for name in LIST_DEFAULT_FIELDS if name != "snippet"}
+        item["snippet"] = _truncate(article.content, snippet_length)
+        item["story_cluster_id"] = article.story_cluster_id
+        return ArticleListItem.model_validate(item, from_attributes=True)
+    
+    return TrendingResponse(
+        stories=[
+            TrendingStory(
+                cluster_id=story["cluster_id"],
+                score=story["score"],
+                article_count=story["article_count"],
+                counts=story["counts"],
+                headline=headline(story["headline_id"])
+            )
+            for story in stories
+        ],
+        bucket_minutes=story_index.counter.bucket_minutes,
+        window_start=story_index.counter.window_start()
     )
 
 @router.get("/articles/{article_id}/social-post", response_model=SocialPostResponse)
-async def get_social_post(article_id: int, db: Session = Depends(get_db)):
+async def get_social_post(
+    article_id: int,
+    db: AsyncSession = Depends(get_db),
+    openai_service: OpenAIService = Depends(get_openai_service)
+):
     """Get social media post (caption and image) for an article"""
     if not db:
         raise HTTPException(status_code=503, detail="Database not available")
     
-    article = db.query(Article).filter(Article.id == article_id).first()
+    article = await db.get(Article, article_id)
     
     if not article:
         raise HTTPException(
@@ -323,22 +597,19 @@ async def get_social_post(article_id: int, db: Session = Depends(get_db)):
             detail="Article not found. Please ensure article is saved in database."
         )
     
-    try:
-        openai_service = OpenAIService()
-    except ValueError as e:
-        raise HTTPException(status_code=500, detail=f"OpenAI service error: {str(e)}")
-    
     # Generate caption if not exists
     if not article.ai_caption:
         article.ai_caption = await openai_service.generate_caption(article.title, article.content or "")
         if db:
-            db.commit()
+            await db.commit()
+            await response_cache.invalidate()
     
     # Generate image prompt if not exists
     if not article.ai_image_prompt:
         article.ai_image_prompt = await openai_service.generate_image_prompt(article.title, article.content or "")
         if db:
-            db.commit()
+            await db.commit()
+            await response_cache.invalidate()
     
     # Always generate image (DALL·E)
     image_url = None
@@ -1,22 +1,23 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 
 from backend.database import get_db, DB_AVAILABLE
-from backend.models import Article, Source
+from backend.dependencies import get_event_registry
 from backend.schemas import NewsFetchRequest, NewsFetchResponse, Article as ArticleSchema
-from backend.services.event_registry import EventRegistryService
+from backend.services.event_registry import CircuitOpenError, EventRegistryError, EventRegistryService
+from backend.services.ingestion import ingest_articles
 
 router = APIRouter()
 
 @router.post("/news/fetch", response_model=NewsFetchResponse)
 async def fetch_news(
     request: NewsFetchRequest,
-    db: Optional[Session] = Depends(get_db)
+    http_request: Request,
+    db: Optional[AsyncSession] = Depends(get_db),
+    event_registry: EventRegistryService = Depends(get_event_registry)
 ):
     """Fetch news articles from Event Registry API and store in database"""
-    event_registry = EventRegistryService()
-    
     try:
         # Fetch articles from Event Registry
         fetched_articles = await event_registry.fetch_articles(
@@ -30,53 +31,15 @@ async def fetch_news(
         # Try to save to database if available
         if db:
             try:
-                for article_data in fetched_articles:
-                    # Check if article already exists (by title)
-                    existing_article = db.query(Article).filter(
-                        Article.title == article_data["title"]
-                    ).first()
-                    
-                    if existing_article:
-                        stored_articles.append(existing_article)
-                        continue
-                    
-                    # Handle source
-                    source = None
-                    if article_data.get("source_name"):
-                        source = db.query(Source).filter(
-                            Source.name == article_data["source_name"]
-                        ).first()
-                        
-                        if not source:
-                            # Create new source
-                            source = Source(
-                                name=article_data["source_name"],
-                                uri=article_data.get("source_uri")
-                            )
-                            db.add(source)
-                            db.flush()
-                    
-                    # Create article
-                    article = Article(
-                        title=article_data["title"],
-                        content=article_data.get("content"),
-                        image_url=article_data.get("image_url"),
-                        published_date=article_data.get("published_date"),
-                        source_id=source.id if source else None
-                    )
-                    
-                    db.add(article)
-                    stored_articles.append(article)
-                
-                db.commit()
-                
-                # Refresh articles to get IDs
-                for article in stored_articles:
-                    db.refresh(article)
+                # Bulk upsert; new articles are queued for background AI enrichment
+                stored_articles, new_ids = await ingest_articles(db, fetched_articles)
+                pool = getattr(http_request.app.state, "enrichment_pool", None)
+                if pool and new_ids:
+                    pool.notify()
             except Exception as db_error:
                 # If database fails, return articles without saving
                 try:
-                    db.rollback()
+                    await db.rollback()
                 except:
                     pass
                 print(f"Database error (returning articles without saving): {db_error}")
@@ -144,10 +107,14 @@ async def fetch_news(
             keyword=request.keyword
         )
         
+    except EventRegistryError as e:
+        # Upstream outage or throttling (after retries) vs. a rejected request
+        status_code = 503 if e.retryable or isinstance(e, CircuitOpenError) else 502
+        raise HTTPException(status_code=status_code, detail=f"Error fetching news: {str(e)}")
     except Exception as e:
         if db:
             try:
-                db.rollback()
+                await db.rollback()
             except:
                 pass
         raise HTTPException(status_code=500, detail=f"Error fetching news: {str(e)}")
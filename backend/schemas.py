@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Dict, Optional, List
 from datetime import datetime
 
 # Source Schemas
@@ -23,16 +23,19 @@ class ArticleBase(BaseModel):
     title: str
     content: Optional[str] = None
     image_url: Optional[str] = None
+    url: Optional[str] = None
     published_date: Optional[datetime] = None
     source_id: Optional[int] = None
 
 class ArticleCreate(ArticleBase):
+    uri: Optional[str] = None
     source_name: Optional[str] = None
 
 class ArticleUpdate(BaseModel):
     title: Optional[str] = None
     content: Optional[str] = None
     image_url: Optional[str] = None
+    url: Optional[str] = None
     published_date: Optional[datetime] = None
     ai_summary: Optional[str] = None
     ai_tags: Optional[List[str]] = None
@@ -41,6 +44,9 @@ class ArticleUpdate(BaseModel):
 
 class Article(ArticleBase):
     id: int
+    uri: Optional[str] = None
+    duplicate_of_id: Optional[int] = None  # Canonical article of its near-duplicate cluster
+    story_cluster_id: Optional[int] = None
     ai_summary: Optional[str] = None
     ai_tags: Optional[List[str]] = None
     ai_caption: Optional[str] = None
@@ -52,12 +58,41 @@ class Article(ArticleBase):
     class Config:
         from_attributes = True
 
+class ArticleListItem(BaseModel):
+    """Feed projection of an article: no body unless requested via fields="""
+    id: int
+    title: Optional[str] = None
+    snippet: Optional[str] = None  # Start of the body, truncated at a word boundary
+    content: Optional[str] = None
+    image_url: Optional[str] = None
+    url: Optional[str] = None
+    published_date: Optional[datetime] = None
+    source_id: Optional[int] = None
+    source: Optional[Source] = None
+    duplicate_of_id: Optional[int] = None
+    story_cluster_id: Optional[int] = None
+    ai_summary: Optional[str] = None
+    ai_tags: Optional[List[str]] = None
+    ai_caption: Optional[str] = None
+    ai_image_prompt: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+class TagFacet(BaseModel):
+    name: str
+    count: int  # Articles with the tag
+
 class ArticleListResponse(BaseModel):
-    articles: List[Article]
-    total: int
+    articles: List[ArticleListItem]
+    total: Optional[int] = None  # None when include_total=false
     page: int
     page_size: int
-    total_pages: int
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None  # Pass as ?cursor= to fetch the next page
+    facets: Optional[List[TagFacet]] = None  # Most used tags when facets=true
 
 # AI Metadata Schemas
 class AIMetadataBase(BaseModel):
@@ -73,6 +108,21 @@ class AIMetadata(AIMetadataBase):
     class Config:
         from_attributes = True
 
+# Enrichment Job Schemas
+class EnrichmentJob(BaseModel):
+    id: int
+    article_id: int
+    status: str
+    attempts: int
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
 # News Fetching Schemas
 class NewsFetchRequest(BaseModel):
     keyword: str = Field(..., description="Search keyword for news articles")
@@ -88,15 +138,47 @@ class NewsFetchResponse(BaseModel):
 class SemanticSearchRequest(BaseModel):
     query: str = Field(..., description="Search query text")
     top_k: int = Field(default=10, ge=1, le=50, description="Number of results to return")
+    mode: str = Field(default="vector", pattern="^(vector|hybrid)$", description="vector, or hybrid (full-text + vector, rank-fused)")
+    diversify: bool = Field(default=False, description="Re-rank with MMR so near-duplicate stories don't crowd the top")
+    mmr_lambda: float = Field(default=0.7, ge=0, le=1, description="MMR relevance vs. diversity trade-off (1 = relevance only)")
 
 class SemanticSearchResult(BaseModel):
     article: Article
     similarity_score: float
+    fused_score: Optional[float] = None
+    lexical_rank: Optional[int] = None
+    vector_rank: Optional[int] = None
+
+class SearchMetadata(BaseModel):
+    mode: str
+    diversified: bool
+    lexical_candidates: int
+    vector_candidates: int
+    timings_ms: Dict[str, float]
 
 class SemanticSearchResponse(BaseModel):
     results: List[SemanticSearchResult]
     query: str
     total_results: int
+    metadata: Optional[SearchMetadata] = None
+
+# Trending Schemas
+class TrendingStory(BaseModel):
+    cluster_id: int
+    score: float  # Article count with exponential time decay
+    article_count: int  # Articles in the trending window
+    counts: List[int]  # Per time bucket, oldest first
+    headline: Optional[ArticleListItem] = None  # Newest article in the cluster
+
+class TrendingResponse(BaseModel):
+    stories: List[TrendingStory]
+    bucket_minutes: int
+    window_start: datetime
+
+# Related Articles Schemas
+class RelatedArticles(BaseModel):
+    article_id: int
+    related: List[Article]
 
 # Social Post Schemas
 class SocialPostResponse(BaseModel):
@@ -0,0 +1,150 @@
+"""
+Content-addressed cache for LLM completions and embeddings
+Entries are keyed by a SHA-256 of (kind, model, prompt template version, input)
+and stored in two tiers: an in-process LRU and the ai_cache_entries table.
+"""
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.exc import IntegrityError
+
+from backend.database import AsyncSessionLocal
+from backend.models import AICacheEntry
+
+
+def _copy(value: Any) -> Any:
+    """Shallow-copy containers so callers can't mutate cached values"""
+    if isinstance(value, dict):
+        return {key: list(item) if isinstance(item, list) else item for key, item in value.items()}
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
+class AICache:
+    """Two-tier (memory LRU + database) cache with TTL and size-based eviction"""
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[int] = None,
+        memory_entries: Optional[int] = None,
+        max_rows: Optional[int] = None,
+        persistent: bool = True
+    ):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else int(os.getenv("AI_CACHE_TTL", str(30 * 24 * 3600)))
+        self.memory_entries = memory_entries if memory_entries is not None else int(os.getenv("AI_CACHE_MEMORY_ENTRIES", "10000"))
+        self.max_rows = max_rows if max_rows is not None else int(os.getenv("AI_CACHE_MAX_ROWS", "100000"))
+        self.persistent = persistent and AsyncSessionLocal is not None
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires_at monotonic, value)
+        self._writes_since_eviction = 0
+        self.counters: Dict[str, int] = {
+            "memory_hits": 0,
+            "persistent_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+        }
+
+    @staticmethod
+    def make_key(kind: str, model: str, template_version: str, *parts: str) -> str:
+        """Hash the inputs that determine an AI response"""
+        digest = hashlib.sha256()
+        for part in (kind, model, template_version, *parts):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\x00")
+        return digest.hexdigest()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters plus current memory tier size"""
+        hits = self.counters["memory_hits"] + self.counters["persistent_hits"]
+        lookups = hits + self.counters["misses"]
+        return {
+            **self.counters,
+            "hits": hits,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_size": len(self._memory),
+        }
+
+    def _remember(self, key: str, value: Any, ttl_seconds: float):
+        self._memory[key] = (time.monotonic() + ttl_seconds, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self.counters["evictions"] += 1
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Look up a value in memory, then in the database (promoting hits)"""
+        entry = self._memory.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._memory.move_to_end(key)
+                self.counters["memory_hits"] += 1
+                return _copy(value)
+            del self._memory[key]
+
+        if self.persistent:
+            try:
+                async with AsyncSessionLocal() as db:
+                    row = await db.get(AICacheEntry, key)
+                    if row is not None:
+                        remaining = (row.expires_at - datetime.utcnow()).total_seconds()
+                        if remaining > 0:
+                            self._remember(key, row.value, remaining)
+                            self.counters["persistent_hits"] += 1
+                            return _copy(row.value)
+            except Exception as e:
+                print(f"Warning: AI cache lookup failed: {e}")
+
+        self.counters["misses"] += 1
+        return None
+
+    async def set(self, key: str, kind: str, value: Any):
+        """Store a value in both tiers"""
+        self._remember(key, _copy(value), self.ttl_seconds)
+        self.counters["writes"] += 1
+        if not self.persistent:
+            return
+
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.merge(AICacheEntry(
+                    key=key,
+                    kind=kind,
+                    value=value,
+                    expires_at=datetime.utcnow() + timedelta(seconds=self.ttl_seconds)
+                ))
+                await db.commit()
+        except IntegrityError:
+            pass  # Another worker stored the same key concurrently
+        except Exception as e:
+            print(f"Warning: AI cache write failed: {e}")
+
+        self._writes_since_eviction += 1
+        if self._writes_since_eviction >= 500:
+            self._writes_since_eviction = 0
+            await self.evict()
+
+    async def evict(self):
+        """Drop expired rows and trim the table to max_rows (oldest first)"""
+        if not self.persistent:
+            return
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(delete(AICacheEntry).where(AICacheEntry.expires_at < datetime.utcnow()))
+                cutoff = await db.scalar(
+                    select(AICacheEntry.created_at)
+                    .order_by(AICacheEntry.created_at.desc())
+                    .offset(self.max_rows)
+                    .limit(1)
+                )
+                if cutoff is not None:
+                    await db.execute(delete(AICacheEntry).where(AICacheEntry.created_at <= cutoff))
+                await db.commit()
+        except Exception as e:
+            print(f"Warning: AI cache eviction failed: {e}")
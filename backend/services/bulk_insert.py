@@ -0,0 +1,58 @@
+"""
+Dialect-native bulk INSERT that skips rows violating a unique key
+Used for rows that concurrent writers may create at the same time (sources,
+articles, tags): the unique index decides, and the IDs of the rows that were
+actually inserted are returned.
+"""
+from typing import Dict, List
+
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+INSERT_CHUNK_SIZE = 500
+
+
+def insert_ignore(db: AsyncSession, table, rows: List[Dict]):
+    """Dialect-native bulk insert that skips rows violating a unique key"""
+    dialect = db.bind.dialect.name
+    if dialect == "mysql":
+        # INSERT IGNORE rather than a no-op ON DUPLICATE KEY UPDATE: SQLAlchemy
+        # connects with CLIENT_FOUND_ROWS, which counts no-op updates as
+        # affected, while skipped rows leave IGNORE's rowcount untouched. (IGNORE
+        # also turns other errors, e.g. over-long values, into warnings)
+        return mysql.insert(table).values(rows).prefix_with("IGNORE"), False
+    if dialect == "sqlite":
+        return sqlite.insert(table).values(rows).on_conflict_do_nothing(), True
+    if dialect == "postgresql":
+        return postgresql.insert(table).values(rows).on_conflict_do_nothing(), True
+    return insert(table).values(rows), False
+
+
+async def bulk_insert(db: AsyncSession, table, rows: List[Dict], key_column) -> Dict[str, int]:
+    """Insert rows in chunks and return {key: id} for the rows that were inserted"""
+    inserted: Dict[str, int] = {}
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        chunk = rows[start:start + INSERT_CHUNK_SIZE]
+        statement, supports_returning = insert_ignore(db, table, chunk)
+        if supports_returning:
+            result = await db.execute(statement.returning(table.c.id, key_column))
+            inserted.update({key: row_id for row_id, key in result.all()})
+        else:
+            # MySQL has no RETURNING: read the IDs back by key, leaving out
+            # keys stored before the insert. Under REPEATABLE READ (the
+            # default) the read-back uses the transaction's snapshot, so rows a
+            # concurrent writer committed meanwhile stay invisible; under READ
+            # COMMITTED they can't be told apart from ours, which the rowcount
+            # reveals
+            keys = [row[key_column.name] for row in chunk]
+            existing = set((await db.execute(select(key_column).where(key_column.in_(keys)))).scalars().all())
+            result = await db.execute(statement)
+            if result.rowcount == 0:
+                continue
+            rows_by_key = await db.execute(select(table.c.id, key_column).where(key_column.in_(keys)))
+            new_rows = {key: row_id for row_id, key in rows_by_key.all() if key not in existing}
+            if len(new_rows) > result.rowcount:
+                print(f"⚠️  {len(new_rows) - result.rowcount} {table.name} rows reported as inserted were added concurrently")
+            inserted.update(new_rows)
+    return inserted
@@ -0,0 +1,320 @@
+"""
+Background AI enrichment queue
+Pending article IDs are stored in the enrichment_jobs table and drained by a
+pool of asyncio workers. Run this module directly to drain the queue once:
+
+    python backend/services/enrichment_queue.py
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.database import AsyncSessionLocal
+from backend.models import Article, AIMetadata, EnrichmentJob
+from backend.services.near_duplicates import propagate_enrichment, share_enrichment
+from backend.services.openai_service import OpenAIService
+from backend.services.passages import embed_passages
+from backend.services.related_graph import find_neighbors, propagate_neighbors, set_neighbors
+from backend.services.response_cache import response_cache
+from backend.services.story_clusters import story_index
+from backend.services.tags import index_article_tags
+from backend.services.vector_store import VectorStore, create_vector_store
+
+ACTIVE_STATUSES = ("pending", "processing")
+
+
+async def process_article(
+    db: AsyncSession,
+    article: Article,
+    openai_service: OpenAIService,
+    vector_store: VectorStore
+) -> Article:
+    """
+    Run the AI pipeline for one article and store the results
+
+    Args:
+        db: Database session the article is attached to
+        article: Article to enrich
+        openai_service: Service used for the completion and embedding calls
+        vector_store: Vector store used to store the embedding
+
+    Returns:
+        The updated article (changes are flushed, not committed)
+    """
+    # Near-duplicates reuse their cluster's enrichment: no completion, no vector
+    if article.duplicate_of_id:
+        canonical = await db.get(Article, article.duplicate_of_id)
+        if canonical is not None:
+            if not canonical.ai_summary:
+                await process_article(db, canonical, openai_service, vector_store)
+            share_enrichment(canonical, article)
+            await index_article_tags(db, {article.id: article.ai_tags})
+            await db.flush()
+            return article
+
+    # Generate AI content (one structured completion, embedding runs concurrently)
+    enrichment = await openai_service.enrich_article(article.title, article.content or "")
+
+    # Update article
+    article.ai_summary = enrichment["summary"]
+    article.ai_tags = enrichment["tags"]
+    article.ai_caption = enrichment["caption"]
+    article.ai_image_prompt = enrichment["image_prompt"]
+    embedding = enrichment["embedding"]
+
+    # Store in the vector database
+    ai_metadata = None
+    try:
+        embedding_id = await vector_store.upsert_embedding(
+            article_id=article.id,
+            embedding=embedding,
+            metadata={
+                "title": article.title,
+                "article_id": article.id,
+                "source_id": article.source_id
+            }
+        )
+
+        # Update or create AI metadata
+        result = await db.execute(select(AIMetadata).where(AIMetadata.article_id == article.id))
+        ai_metadata = result.scalars().first()
+        if not ai_metadata:
+            ai_metadata = AIMetadata(article_id=article.id, embedding_id=embedding_id)
+            db.add(ai_metadata)
+        else:
+            ai_metadata.embedding_id = embedding_id
+    except Exception as e:
+        print(f"Warning: Could not store embedding: {e}")
+        ai_metadata = None
+
+    # Passage vectors for long articles (chunked mode only)
+    if ai_metadata is not None:
+        try:
+            await embed_passages([article], openai_service, vector_store)
+        except Exception as e:
+            print(f"Warning: Could not store passage embeddings: {e}")
+
+    # Precompute related articles and add this one to its neighbours' lists
+    if ai_metadata is not None:
+        try:
+            neighbors = await find_neighbors(vector_store, article.id, embedding)
+            set_neighbors(ai_metadata, neighbors)
+            await propagate_neighbors(db, article.id, neighbors)
+        except Exception as e:
+            print(f"Warning: Could not precompute related articles: {e}")
+
+    # Join (or start) a story cluster; near-duplicates join with the article
+    try:
+        await story_index.assign(db, [(article, embedding)])
+    except Exception as e:
+        print(f"Warning: Could not assign story cluster: {e}")
+
+    # Near-duplicates stored before this enrichment finished share it
+    await propagate_enrichment(db, article)
+    await index_article_tags(db, {article.id: article.ai_tags})
+    await db.flush()
+    return article
+
+
+async def enqueue_articles(db: AsyncSession, article_ids: Iterable[int]) -> List[EnrichmentJob]:
+    """
+    Add enrichment jobs for articles that don't already have one pending
+
+    Args:
+        db: Database session (the caller commits)
+        article_ids: IDs of articles to enrich
+
+    Returns:
+        The pending or processing job for each article, in input order
+    """
+    article_ids = list(dict.fromkeys(article_ids))
+    if not article_ids:
+        return []
+
+    result = await db.execute(select(EnrichmentJob).where(
+        EnrichmentJob.article_id.in_(article_ids),
+        EnrichmentJob.status.in_(ACTIVE_STATUSES)
+    ))
+    existing = result.scalars().all()
+    jobs = {job.article_id: job for job in existing}
+
+    for article_id in article_ids:
+        if article_id not in jobs:
+            job = EnrichmentJob(article_id=article_id, status="pending", attempts=0)
+            db.add(job)
+            jobs[article_id] = job
+
+    await db.flush()
+    return [jobs[article_id] for article_id in article_ids]
+
+
+class EnrichmentWorkerPool:
+    """Pool of asyncio workers that drain the enrichment_jobs table"""
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        job_timeout: Optional[float] = None,
+        openai_service: Optional[OpenAIService] = None,
+        vector_store: Optional[VectorStore] = None
+    ):
+        self.concurrency = concurrency if concurrency is not None else int(os.getenv("ENRICHMENT_WORKERS", "4"))
+        self.poll_interval = poll_interval if poll_interval is not None else float(os.getenv("ENRICHMENT_POLL_INTERVAL", "5"))
+        self.max_attempts = max_attempts if max_attempts is not None else int(os.getenv("ENRICHMENT_MAX_ATTEMPTS", "3"))
+        # Seconds after which a 'processing' job is presumed abandoned by its worker
+        self.job_timeout = job_timeout if job_timeout is not None else float(os.getenv("ENRICHMENT_JOB_TIMEOUT", "600"))
+        # Shared services from the app; created on first job when not provided
+        self.openai_service = openai_service
+        self.vector_store = vector_store
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self):
+        """Start the worker tasks"""
+        if AsyncSessionLocal is None or self.concurrency <= 0:
+            print("⚠️  Enrichment workers disabled")
+            return
+
+        await self._reset_stale_jobs()
+        self._stopping = False
+        self._tasks = [
+            asyncio.create_task(self._worker(worker_id))
+            for worker_id in range(self.concurrency)
+        ]
+        print(f"✅ Started {self.concurrency} enrichment workers")
+
+    async def stop(self):
+        """Stop the workers; in-flight jobs are returned to the queue once they time out"""
+        self._stopping = True
+        self._wakeup.set()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self):
+        """Wake idle workers after new jobs were committed"""
+        self._wakeup.set()
+
+    async def drain(self):
+        """Process jobs until the queue is empty (used by the standalone runner)"""
+        await self._reset_stale_jobs()
+
+        async def _drain_worker():
+            while await self._run_next_job():
+                pass
+
+        await asyncio.gather(*(_drain_worker() for _ in range(max(self.concurrency, 1))))
+
+    def _get_services(self):
+        if self.openai_service is None:
+            self.openai_service = OpenAIService()
+        if self.vector_store is None:
+            self.vector_store = create_vector_store()
+        return self.openai_service, self.vector_store
+
+    async def _reset_stale_jobs(self):
+        """Return jobs stuck in 'processing' for longer than job_timeout to the queue"""
+        # Other processes (API workers, the standalone runner) may be working
+        # on recently claimed jobs, so only timed-out ones are reset
+        cutoff = datetime.utcnow() - timedelta(seconds=self.job_timeout)
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(EnrichmentJob)
+                .where(
+                    EnrichmentJob.status == "processing",
+                    or_(EnrichmentJob.started_at.is_(None), EnrichmentJob.started_at < cutoff)
+                )
+                .values(status="pending")
+            )
+            await db.commit()
+
+    async def _claim_job(self, db: AsyncSession) -> Optional[EnrichmentJob]:
+        """Atomically move the oldest pending job to 'processing'"""
+        while True:
+            result = await db.execute(
+                select(EnrichmentJob)
+                .where(EnrichmentJob.status == "pending")
+                .order_by(EnrichmentJob.id)
+                .limit(1)
+            )
+            job = result.scalars().first()
+            if not job:
+                return None
+
+            result = await db.execute(
+                update(EnrichmentJob)
+                .where(EnrichmentJob.id == job.id, EnrichmentJob.status == "pending")
+                .values(
+                    status="processing",
+                    attempts=EnrichmentJob.attempts + 1,
+                    started_at=datetime.utcnow()
+                )
+            )
+            await db.commit()
+            if result.rowcount == 1:
+                await db.refresh(job)
+                return job
+            # Another worker claimed it first; try the next one
+
+    async def _run_next_job(self) -> bool:
+        """Claim and process one job. Returns False when the queue is empty."""
+        async with AsyncSessionLocal() as db:
+            job = await self._claim_job(db)
+            if not job:
+                return False
+            job_id = job.id
+
+            try:
+                openai_service, vector_store = self._get_services()
+                article = await db.get(Article, job.article_id)
+                if not article:
+                    raise ValueError(f"Article with ID {job.article_id} not found")
+
+                await process_article(db, article, openai_service, vector_store)
+                job.status = "completed"
+                job.error = None
+                job.completed_at = datetime.utcnow()
+                await db.commit()
+                await response_cache.invalidate()
+            except Exception as e:
+                await db.rollback()
+                job = await db.get(EnrichmentJob, job_id)
+                job.error = str(e)
+                job.status = "pending" if job.attempts < self.max_attempts else "failed"
+                await db.commit()
+                print(f"Error processing enrichment job {job.id} (article {job.article_id}): {e}")
+            return True
+
+    async def _worker(self, worker_id: int):
+        while not self._stopping:
+            try:
+                has_more = await self._run_next_job()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Enrichment worker {worker_id} error: {e}")
+                has_more = False
+
+            if not has_more:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+
+if __name__ == "__main__":
+    asyncio.run(EnrichmentWorkerPool().drain())
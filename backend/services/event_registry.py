@@ -1,28 +1,278 @@
+import asyncio
+import codecs
 import httpx
+import json
 import os
-from typing import List, Dict, Optional
-from datetime import datetime
+import random
+import re
+import time
+import importlib.util
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import AsyncIterator, List, Dict, Optional
+from datetime import date, datetime, timezone
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# HTTP/2 multiplexing needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Event Registry dates: YYYY-MM-DD, optionally with a time (T...Z or space separated)
+_DATE_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})(?:[T ](\d{2}):(\d{2}):(\d{2})Z?)?")
+_RESULTS_RE = re.compile(r'"results"\s*:\s*\[')
+
+
+@lru_cache(maxsize=4096)
+def parse_date(value: str) -> Optional[datetime]:
+    """Parse an Event Registry date string (articles in a page share few distinct dates)"""
+    match = _DATE_RE.fullmatch(value)
+    if not match:
+        return None
+    try:
+        return datetime(*(int(part) for part in match.groups() if part is not None))
+    except ValueError:
+        return None
+
+
+class ParsedArticle:
+    """
+    Compact parsed article record
+
+    Supports read-only mapping access (article["title"], article.get(...),
+    {**article}) so it can be passed wherever article dicts are expected.
+    raw_data is only kept when explicitly requested.
+    """
+    __slots__ = (
+        "title", "content", "image_url", "published_date", "source_name",
+        "source_uri", "url", "uri", "raw_data"
+    )
+
+    def __init__(
+        self,
+        title: str,
+        content: Optional[str] = None,
+        image_url: Optional[str] = None,
+        published_date: Optional[datetime] = None,
+        source_name: Optional[str] = None,
+        source_uri: Optional[str] = None,
+        url: Optional[str] = None,
+        uri: Optional[str] = None,
+        raw_data: Optional[Dict] = None
+    ):
+        self.title = title
+        self.content = content
+        self.image_url = image_url
+        self.published_date = published_date
+        self.source_name = source_name
+        self.source_uri = source_uri
+        self.url = url
+        self.uri = uri
+        self.raw_data = raw_data
+
+    def keys(self) -> List[str]:
+        return [name for name in self.__slots__ if name != "raw_data" or self.raw_data is not None]
+
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default) if key in self.__slots__ else default
+
+    def as_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.keys()}
+
+    def __repr__(self) -> str:
+        return f"ParsedArticle(title={self.title!r}, uri={self.uri!r})"
+
+
+class ResultsStreamParser:
+    """
+    Incrementally extract the objects of the "results" array from a JSON byte stream
+
+    Each article object is decoded as soon as its closing brace arrives and the
+    consumed text is dropped, so only one raw article is held at a time.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._in_results = False
+        self.done = False
+
+    def feed(self, chunk: bytes) -> List[Dict]:
+        """Add bytes from the stream; returns the article objects completed by them"""
+        if self.done:
+            return []
+        self._buffer += self._text.decode(chunk)
+        if not self._in_results:
+            match = _RESULTS_RE.search(self._buffer)
+            if not match:
+                # Keep a tail in case the key is split across chunks
+                self._buffer = self._buffer[-64:]
+                return []
+            self._buffer = self._buffer[match.end():]
+            self._in_results = True
+
+        items = []
+        position = 0
+        length = len(self._buffer)
+        while position < length:
+            char = self._buffer[position]
+            if char in " \t\r\n,":
+                position += 1
+                continue
+            if char == "]":
+                self.done = True
+                break
+            try:
+                item, position = self._decoder.raw_decode(self._buffer, position)
+            except json.JSONDecodeError:
+                break  # Incomplete object; wait for more data
+            items.append(item)
+        self._buffer = "" if self.done else self._buffer[position:]
+        return items
+
+
+class EventRegistryError(Exception):
+    """An Event Registry request failed; retryable marks transient failures (429, 5xx, network)"""
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        retryable: bool = False,
+        retry_after: Optional[float] = None
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(EventRegistryError):
+    """Raised without calling the API while the circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive transient failures
+
+    While open, calls fail fast; after reset_timeout seconds one trial call is
+    let through (half-open) and its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self.opened_at >= self.reset_timeout else "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed" or self.failure_threshold <= 0:
+            return True
+        if state == "half-open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.failure_threshold > 0 and (self.failures >= self.failure_threshold or self.opened_at is not None):
+            self.opened_at = time.monotonic()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _close_response(task: asyncio.Future):
+    # A cancelled hedge may still have produced a response; release its connection
+    if not task.cancelled() and task.exception() is None:
+        asyncio.ensure_future(task.result().aclose())
+
+
 class EventRegistryService:
     """Service for fetching news articles from Event Registry API"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        max_retries: Optional[int] = None,
+        hedge_after: Optional[float] = None,
+        breaker: Optional[CircuitBreaker] = None
+    ):
         self.api_key = os.getenv("EVENT_REGISTRY_API_KEY")
         if not self.api_key:
             raise ValueError("EVENT_REGISTRY_API_KEY environment variable is required")
-        self.base_url = "https://eventregistry.org/api/v1/article/getArticles"
-        self.timeout = 30.0
+        base = os.getenv("EVENT_REGISTRY_BASE_URL", "https://eventregistry.org").rstrip("/")
+        self.base_url = f"{base}/api/v1/article/getArticles"
+        self.timeout = float(os.getenv("EVENT_REGISTRY_TIMEOUT", "30"))
+        # Transient failures (429, 5xx, network) are retried with jittered
+        # exponential backoff, waiting at least as long as Retry-After asks
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("EVENT_REGISTRY_MAX_RETRIES", "3"))
+        self.backoff_base = float(os.getenv("EVENT_REGISTRY_BACKOFF_BASE", "0.5"))
+        self.backoff_max = float(os.getenv("EVENT_REGISTRY_BACKOFF_MAX", "30"))
+        # Send a duplicate request if the first hasn't responded after this many
+        # seconds and use whichever answers first (0 disables hedging)
+        self.hedge_after = hedge_after if hedge_after is not None else float(os.getenv("EVENT_REGISTRY_HEDGE_AFTER", "0"))
+        self.breaker = breaker or CircuitBreaker(
+            int(os.getenv("EVENT_REGISTRY_BREAKER_THRESHOLD", "5")),
+            float(os.getenv("EVENT_REGISTRY_BREAKER_RESET", "60"))
+        )
+        self.counters = {"requests": 0, "retries": 0, "hedged": 0, "hedge_wins": 0, "failures": 0, "rejected": 0}
+        self._client: Optional[httpx.AsyncClient] = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Shared keep-alive client, created on first use"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=self.timeout,
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+            )
+        return self._client
+    
+    async def aclose(self):
+        """Close the pooled HTTP connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
     async def fetch_articles(
         self,
         keyword: str,
         articles_count: int = 100,
         articles_page: int = 1,
-        source_locations: Optional[List[str]] = None
-    ) -> List[Dict]:
+        source_locations: Optional[List[str]] = None,
+        date_start: Optional[date] = None
+    ) -> List[ParsedArticle]:
         """
         Fetch articles from Event Registry API
         
@@ -31,9 +281,37 @@ class EventRegistryService:
             articles_count: Number of articles to fetch (max 100)
             articles_page: Page number
             source_locations: List of source location URIs (optional)
+            date_start: Only articles published on or after this day (optional)
         
         Returns:
-            List of article dictionaries
+            List of parsed article records (usable as read-only dicts)
+        """
+        return [article async for article in self.stream_articles(
+            keyword, articles_count, articles_page, source_locations, date_start
+        )]
+    
+    async def stream_articles(
+        self,
+        keyword: str,
+        articles_count: int = 100,
+        articles_page: int = 1,
+        source_locations: Optional[List[str]] = None,
+        date_start: Optional[date] = None,
+        include_raw: bool = False
+    ) -> AsyncIterator[ParsedArticle]:
+        """
+        Fetch articles, parsing the response incrementally as it arrives
+        
+        Args:
+            keyword: Search keyword
+            articles_count: Number of articles to fetch (max 100)
+            articles_page: Page number
+            source_locations: List of source location URIs (optional)
+            date_start: Only articles published on or after this day (optional)
+            include_raw: Keep the original article JSON on each record
+        
+        Yields:
+            Parsed article records in response order
         """
         if source_locations is None:
             source_locations = [
@@ -56,29 +334,136 @@ class EventRegistryService:
             "resultType": "articles",
             "apiKey": self.api_key
         }
+        if date_start:
+            request_body["dateStart"] = date_start.isoformat()
+        
+        # A half-open circuit lets one trial through; it must end with an
+        # outcome or the breaker would refuse every later call
+        trial = self.breaker.state == "half-open"
+        if not self.breaker.allow():
+            self.counters["rejected"] += 1
+            raise CircuitOpenError("Event Registry circuit breaker is open; skipping request")
         
+        settled = False
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(self.base_url, json=request_body)
-                response.raise_for_status()
-                data = response.json()
-                
-                # Parse articles from response
-                articles = []
-                if "articles" in data and "results" in data["articles"]:
-                    for article_data in data["articles"]["results"]:
-                        parsed_article = self._parse_article(article_data)
-                        if parsed_article:
-                            articles.append(parsed_article)
-                
-                return articles
+            attempt = 0
+            while True:
+                yielded = 0
+                try:
+                    response = await self._open(request_body)
+                    try:
+                        parser = ResultsStreamParser()
+                        async for chunk in response.aiter_bytes():
+                            for article_data in parser.feed(chunk):
+                                parsed_article = self._parse_article(article_data, include_raw)
+                                if parsed_article:
+                                    yielded += 1
+                                    yield parsed_article
+                            if parser.done:
+                                break
+                    finally:
+                        await response.aclose()
+                    self.breaker.record_success()
+                    settled = True
+                    return
+                except EventRegistryError as e:
+                    error = e
+                except httpx.HTTPError as e:
+                    error = EventRegistryError(f"Error fetching articles from Event Registry: {str(e)}", retryable=True)
                 
-        except httpx.HTTPError as e:
-            raise Exception(f"Error fetching articles from Event Registry: {str(e)}")
-        except Exception as e:
-            raise Exception(f"Unexpected error: {str(e)}")
+                if error.retryable:
+                    self.counters["failures"] += 1
+                    self.breaker.record_failure()
+                else:
+                    # The API answered (e.g. 401); it isn't an outage
+                    self.breaker.record_success()
+                settled = True
+                # Articles already yielded can't be taken back, so a broken stream isn't retried
+                if yielded or not error.retryable or attempt >= self.max_retries:
+                    raise error
+                delay = self._backoff(attempt, error.retry_after)
+                if delay is None:
+                    raise error
+                trial = self.breaker.state == "half-open"
+                if not self.breaker.allow():
+                    self.counters["rejected"] += 1
+                    raise CircuitOpenError(f"Event Registry circuit breaker opened after: {error}")
+                settled = False
+                attempt += 1
+                self.counters["retries"] += 1
+                print(f"⚠️  {error}; retrying in {delay:.1f}s (attempt {attempt}/{self.max_retries})")
+                await asyncio.sleep(delay)
+        finally:
+            # Cancelled, dropped by the consumer mid-stream, or failed to parse:
+            # count an unfinished trial as a failure (the circuit re-opens)
+            if trial and not settled:
+                self.breaker.record_failure()
+    
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> Optional[float]:
+        """Full-jitter exponential delay, at least Retry-After (None if that exceeds backoff_max)"""
+        if retry_after is not None and retry_after > self.backoff_max:
+            return None
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        return max(delay, retry_after or 0.0)
+    
+    async def _send(self, request_body: Dict) -> httpx.Response:
+        """One streamed POST; transient HTTP statuses raise a retryable EventRegistryError"""
+        client = self._get_client()
+        self.counters["requests"] += 1
+        response = await client.send(client.build_request("POST", self.base_url, json=request_body), stream=True)
+        if response.status_code == 429 or response.status_code >= 500:
+            await response.aclose()
+            raise EventRegistryError(
+                f"Error fetching articles from Event Registry: HTTP {response.status_code}",
+                status_code=response.status_code,
+                retryable=True,
+                retry_after=parse_retry_after(response.headers.get("retry-after"))
+            )
+        if response.status_code >= 400:
+            await response.aclose()
+            raise EventRegistryError(
+                f"Error fetching articles from Event Registry: HTTP {response.status_code}",
+                status_code=response.status_code
+            )
+        return response
     
-    def _parse_article(self, article_data: Dict) -> Optional[Dict]:
+    async def _open(self, request_body: Dict) -> httpx.Response:
+        """Send the request, hedging with a duplicate if it is slow to respond"""
+        if self.hedge_after <= 0:
+            return await self._send(request_body)
+        
+        primary = asyncio.ensure_future(self._send(request_body))
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_after)
+        if done:
+            return primary.result()
+        
+        self.counters["hedged"] += 1
+        hedge = asyncio.ensure_future(self._send(request_body))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.counters["hedge_wins"] += 1
+                        # Close the other response if it also arrived
+                        for other in done - {task}:
+                            if other.exception() is None:
+                                await other.result().aclose()
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+                task.add_done_callback(_close_response)
+    
+    def stats(self) -> Dict:
+        return {**self.counters, "circuit": self.breaker.state}
+    
+    def _parse_article(self, article_data: Dict, include_raw: bool = False) -> Optional[ParsedArticle]:
         """Parse article data from Event Registry response"""
         try:
             # Extract title
@@ -98,20 +483,9 @@ class EventRegistryService:
             
             # Extract published date
             published_date = None
-            if "date" in article_data:
-                try:
-                    # Event Registry returns date in various formats
-                    date_str = article_data["date"]
-                    if isinstance(date_str, str):
-                        # Try parsing common formats
-                        for fmt in ["%Y-%m-%dT%H:%M:%SZ", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d"]:
-                            try:
-                                published_date = datetime.strptime(date_str, fmt)
-                                break
-                            except ValueError:
-                                continue
-                except Exception:
-                    pass
+            date_str = article_data.get("date")
+            if isinstance(date_str, str):
+                published_date = parse_date(date_str)
             
             # Extract source
             source_name = None
@@ -124,19 +498,21 @@ class EventRegistryService:
                 elif isinstance(source_info, str):
                     source_name = source_info
             
-            # Extract URL
-            url = article_data.get("url", "")
+            # Extract URL and Event Registry URI (stable article ID, used for dedup)
+            url = article_data.get("url") or None
+            uri = article_data.get("uri") or None
             
-            return {
-                "title": title,
-                "content": body,
-                "image_url": image_url,
-                "published_date": published_date,
-                "source_name": source_name,
-                "source_uri": source_uri,
-                "url": url,
-                "raw_data": article_data  # Keep raw data for reference
-            }
+            return ParsedArticle(
+                title=title,
+                content=body,
+                image_url=image_url,
+                published_date=published_date,
+                source_name=source_name,
+                source_uri=source_uri,
+                url=url,
+                uri=str(uri) if uri is not None else None,
+                raw_data=article_data if include_raw else None
+            )
             
         except Exception as e:
             print(f"Error parsing article: {e}")
@@ -0,0 +1,167 @@
+"""
+Full-text search over article title, content and AI summary
+MySQL uses a FULLTEXT index (maintained by InnoDB); SQLite uses an external
+content FTS5 table kept in sync with triggers. Other databases, or a database
+where the index could not be created, fall back to LIKE filtering.
+"""
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import column, func, literal_column, select, table, text
+from sqlalchemy.dialects import mysql
+from sqlalchemy.engine import Connection, Engine
+
+from backend.models import Article
+
+MYSQL_INDEX_NAME = "ft_articles_search"
+SQLITE_TABLE_NAME = "articles_fts"
+MYSQL_MIN_TOKEN_SIZE = 3
+
+# bm25() column weights for SQLite (title, content, ai_summary)
+SQLITE_WEIGHTS = (10.0, 1.0, 4.0)
+
+SQLITE_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_TABLE_NAME} USING fts5(
+        title, content, ai_summary,
+        content='articles', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO {SQLITE_TABLE_NAME}(rowid, title, content, ai_summary)
+        VALUES (new.id, new.title, new.content, new.ai_summary);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+        INSERT INTO {SQLITE_TABLE_NAME}({SQLITE_TABLE_NAME}, rowid, title, content, ai_summary)
+        VALUES ('delete', old.id, old.title, old.content, old.ai_summary);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF title, content, ai_summary ON articles BEGIN
+        INSERT INTO {SQLITE_TABLE_NAME}({SQLITE_TABLE_NAME}, rowid, title, content, ai_summary)
+        VALUES ('delete', old.id, old.title, old.content, old.ai_summary);
+        INSERT INTO {SQLITE_TABLE_NAME}(rowid, title, content, ai_summary)
+        VALUES (new.id, new.title, new.content, new.ai_summary);
+    END
+    """,
+]
+
+# Dialects whose full-text index has been verified in this process
+_available = set()
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize_query(query: str) -> List[str]:
+    """Split user input into plain word tokens (drops FTS operators and punctuation)"""
+    return _TOKEN_RE.findall(query)
+
+
+def _ensure_sqlite(connection: Connection):
+    exists = connection.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+        {"name": SQLITE_TABLE_NAME}
+    ).first()
+    for statement in SQLITE_DDL:
+        connection.execute(text(statement))
+    if not exists:
+        # Index rows that were stored before the FTS table existed
+        connection.execute(text(f"INSERT INTO {SQLITE_TABLE_NAME}({SQLITE_TABLE_NAME}) VALUES ('rebuild')"))
+
+
+def _ensure_mysql(connection: Connection):
+    exists = connection.execute(
+        text(
+            "SELECT 1 FROM information_schema.statistics "
+            "WHERE table_schema = DATABASE() AND table_name = 'articles' AND index_name = :name"
+        ),
+        {"name": MYSQL_INDEX_NAME}
+    ).first()
+    if not exists:
+        connection.execute(text(
+            f"ALTER TABLE articles ADD FULLTEXT INDEX {MYSQL_INDEX_NAME} (title, content, ai_summary)"
+        ))
+
+
+def ensure_fulltext_index(engine: Engine) -> bool:
+    """
+    Create the full-text index for the engine's dialect if it is missing
+
+    Args:
+        engine: Sync engine (called at startup, after create_all)
+
+    Returns:
+        True if full-text search is available for this database
+    """
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as connection:
+            if dialect == "sqlite":
+                _ensure_sqlite(connection)
+            elif dialect == "mysql":
+                _ensure_mysql(connection)
+            else:
+                return False
+    except Exception as e:
+        print(f"⚠️  Full-text index not available, search falls back to LIKE: {e}")
+        return False
+    _available.add(dialect)
+    return True
+
+
+def fulltext_available(dialect: str) -> bool:
+    return dialect in _available
+
+
+def match_article_ids(dialect: str, query: str) -> Optional[Tuple]:
+    """
+    Build a full-text match for a search string
+
+    Args:
+        dialect: Database dialect name of the session
+        query: Raw user search input
+
+    Returns:
+        (subquery of (article_id, rank), ordering that puts the best matches
+        first) or None if full-text search is unavailable or the query has no
+        indexable tokens
+    """
+    tokens = tokenize_query(query)
+    if dialect not in _available:
+        return None
+
+    if dialect == "sqlite":
+        if not tokens:
+            return None
+        # Quote every token so user input can't inject FTS5 syntax; the last
+        # token is a prefix match so partially typed words still match
+        match = " ".join([*(f'"{token}"' for token in tokens[:-1]), f'"{tokens[-1]}"*'])
+        fts = table(SQLITE_TABLE_NAME, column("rowid"), column(SQLITE_TABLE_NAME))
+        rank = func.bm25(literal_column(SQLITE_TABLE_NAME), *SQLITE_WEIGHTS)
+        matches = (
+            select(fts.c.rowid.label("article_id"), rank.label("rank"))
+            .where(fts.c[SQLITE_TABLE_NAME].op("MATCH")(match))
+            .subquery("fulltext_matches")
+        )
+        return matches, matches.c.rank.asc()
+
+    # InnoDB ignores tokens shorter than innodb_ft_min_token_size (3 by
+    # default); a required short token would match nothing
+    tokens = [token for token in tokens if len(token) >= MYSQL_MIN_TOKEN_SIZE]
+    if not tokens:
+        return None
+    # Boolean mode: every token required, the last one as a prefix
+    score = mysql.match(
+        Article.title, Article.content, Article.ai_summary,
+        against=" ".join([*(f"+{token}" for token in tokens[:-1]), f"+{tokens[-1]}*"])
+    ).in_boolean_mode()
+    matches = (
+        select(Article.id.label("article_id"), score.label("rank"))
+        .where(score > 0)
+        .subquery("fulltext_matches")
+    )
+    return matches, matches.c.rank.desc()
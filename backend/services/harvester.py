@@ -0,0 +1,214 @@
+"""
+Concurrent multi-keyword, multi-page news harvesting
+Keywords are fetched concurrently and each keyword's pages in small
+concurrent windows, bounded by a semaphore and a request-rate limit. Pages
+stream through a bounded queue into bulk ingestion as they arrive.
+
+Each keyword keeps a high-water mark (newest published_date seen). Later runs
+ask Event Registry only for articles from that day on and stop paging once a
+page reaches articles older than the mark, instead of re-downloading the
+whole 31-day window. A mark only advances after all of that run's pages for
+the keyword were ingested.
+
+If the page limit runs out before paging reaches the mark, the mark stays put
+and the next run resumes paging where this one stopped (newer articles only
+push older ones to later pages, so nothing is skipped). Once a catch-up run
+reaches the mark, it advances to the newest date of the run that fell behind,
+and the articles published since then are picked up from page 1 by the runs
+that follow.
+"""
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import KeywordHighWaterMark
+from backend.services.event_registry import EventRegistryService
+from backend.services.ingestion import ingest_articles
+
+HARVEST_CONCURRENCY = int(os.getenv("HARVEST_CONCURRENCY", "4"))
+HARVEST_REQUESTS_PER_SECOND = float(os.getenv("HARVEST_REQUESTS_PER_SECOND", "5"))
+HARVEST_MAX_PAGES = int(os.getenv("HARVEST_MAX_PAGES", "3"))
+HARVEST_PAGE_SIZE = 100  # Event Registry maximum
+HARVEST_PAGE_WINDOW = 2  # Pages of one keyword fetched concurrently
+
+
+class RateLimiter:
+    """Spaces request starts at least 1 / rate seconds apart across tasks"""
+
+    def __init__(self, requests_per_second: float):
+        self.interval = 1.0 / requests_per_second if requests_per_second > 0 else 0.0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+@dataclass
+class KeywordHarvest:
+    keyword: str
+    since: Optional[datetime] = None  # High-water mark at the start of the run
+    start_page: int = 1  # Later than 1 when catching up after hitting the page limit
+    pending: Optional[datetime] = None  # Newest date seen by the run that fell behind
+    truncated: bool = False  # The page limit ran out before the mark was reached
+    pages: int = 0
+    fetched: int = 0
+    new: int = 0
+    latest: Optional[datetime] = None
+    error: Optional[str] = None
+
+
+def _naive(value: Optional[datetime]) -> Optional[datetime]:
+    # Marks read back from the database may carry a timezone; parsed
+    # Event Registry dates are naive UTC
+    return value.replace(tzinfo=None) if value is not None and value.tzinfo is not None else value
+
+
+async def load_marks(db: AsyncSession, keywords: Iterable[str]) -> Dict[str, KeywordHighWaterMark]:
+    result = await db.execute(select(KeywordHighWaterMark).where(KeywordHighWaterMark.keyword.in_(list(keywords))))
+    return {mark.keyword: mark for mark in result.scalars().all()}
+
+
+async def _advance_mark(db: AsyncSession, harvest: KeywordHarvest):
+    mark = (await load_marks(db, [harvest.keyword])).get(harvest.keyword)
+    if mark is None:
+        mark = KeywordHighWaterMark(keyword=harvest.keyword)
+        db.add(mark)
+    newest = max((date for date in (harvest.latest, harvest.pending) if date is not None), default=None)
+    if harvest.truncated:
+        # Articles between the last fetched page and the mark are still missing
+        mark.resume_page = harvest.start_page + harvest.pages
+        mark.pending_published_date = newest
+    else:
+        current = _naive(mark.latest_published_date)
+        if newest and (current is None or newest > current):
+            mark.latest_published_date = newest
+        mark.resume_page = None
+        mark.pending_published_date = None
+    mark.last_harvested_at = datetime.utcnow()
+    await db.commit()
+
+
+async def harvest_keywords(
+    db: AsyncSession,
+    event_registry: EventRegistryService,
+    keywords: Iterable[str],
+    max_pages: int = HARVEST_MAX_PAGES,
+    page_size: int = HARVEST_PAGE_SIZE,
+    concurrency: int = HARVEST_CONCURRENCY,
+    requests_per_second: float = HARVEST_REQUESTS_PER_SECOND,
+    page_window: int = HARVEST_PAGE_WINDOW
+) -> Dict[str, KeywordHarvest]:
+    """
+    Fetch new articles for several keywords concurrently and ingest them
+
+    Args:
+        db: Database session used for ingestion and marks (committed here)
+        event_registry: Event Registry client
+        keywords: Keywords to harvest
+        max_pages: Page limit per keyword and run
+        page_size: Articles per page (max 100)
+        concurrency: Event Registry requests in flight at once
+        requests_per_second: Request start rate limit (0 disables)
+        page_window: Pages of one keyword fetched concurrently
+
+    Returns:
+        Per-keyword harvest results
+    """
+    keywords = list(dict.fromkeys(keywords))
+    marks = await load_marks(db, keywords)
+    results = {keyword: KeywordHarvest(keyword) for keyword in keywords}
+    for keyword, mark in marks.items():
+        harvest = results[keyword]
+        harvest.since = _naive(mark.latest_published_date)
+        harvest.start_page = mark.resume_page or 1
+        harvest.pending = _naive(mark.pending_published_date)
+    semaphore = asyncio.Semaphore(concurrency)
+    limiter = RateLimiter(requests_per_second)
+    # Bounded so fetching can't run far ahead of ingestion
+    pages = asyncio.Queue(maxsize=concurrency * 2)
+
+    async def fetch_page(harvest: KeywordHarvest, page: int) -> List[Dict]:
+        async with semaphore:
+            await limiter.wait()
+            return await event_registry.fetch_articles(
+                keyword=harvest.keyword,
+                articles_count=page_size,
+                articles_page=page,
+                date_start=harvest.since.date() if harvest.since else None
+            )
+
+    async def produce(harvest: KeywordHarvest):
+        try:
+            page = harvest.start_page
+            last_page = harvest.start_page + max_pages - 1
+            exhausted = False
+            while page <= last_page:
+                # With a mark the first page usually reaches it, so fetch it alone
+                size = 1 if harvest.since is not None and page == 1 else page_window
+                window = range(page, min(page + size, last_page + 1))
+                batches = await asyncio.gather(*(fetch_page(harvest, number) for number in window))
+                for articles in batches:
+                    harvest.pages += 1
+                    # Results are newest first; keep articles at or after the mark
+                    # (ones already stored are skipped by ingestion)
+                    fresh = [
+                        article for article in articles
+                        if harvest.since is None or article["published_date"] is None
+                        or article["published_date"] >= harvest.since
+                    ]
+                    if fresh:
+                        await pages.put((harvest, fresh))
+                    if len(articles) < page_size or len(fresh) < len(articles):
+                        exhausted = True
+                        break
+                if exhausted:
+                    break
+                page += len(window)
+            # Only an incremental run can leave a gap; a first run just takes the newest pages
+            harvest.truncated = not exhausted and harvest.since is not None
+        except Exception as e:
+            harvest.error = str(e)
+            print(f"Error fetching news for '{harvest.keyword}': {e}")
+        finally:
+            await pages.put((harvest, None))
+
+    async def consume():
+        remaining = len(results)
+        while remaining:
+            harvest, articles = await pages.get()
+            if articles is None:
+                remaining -= 1
+                if harvest.error is None:
+                    try:
+                        await _advance_mark(db, harvest)
+                    except Exception as e:
+                        await db.rollback()
+                        print(f"Error saving high-water mark for '{harvest.keyword}': {e}")
+                continue
+            try:
+                _, new_ids = await ingest_articles(db, articles)
+            except Exception as e:
+                await db.rollback()
+                harvest.error = str(e)
+                print(f"Error storing news for '{harvest.keyword}': {e}")
+                continue
+            harvest.fetched += len(articles)
+            harvest.new += len(new_ids)
+            dates = [article["published_date"] for article in articles if article["published_date"]]
+            if dates:
+                harvest.latest = max([*dates, harvest.latest] if harvest.latest else dates)
+
+    await asyncio.gather(consume(), *(produce(harvest) for harvest in results.values()))
+    return results
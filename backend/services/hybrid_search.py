@@ -0,0 +1,255 @@
+"""
+Hybrid lexical + vector search
+Full-text (BM25) and vector retrieval run concurrently and their rankings are
+fused with reciprocal rank fusion (RRF), so exact-name queries and conceptual
+queries both rank well. An optional maximal marginal relevance (MMR) pass
+re-ranks the fused candidates using their embeddings, so one syndicated story
+doesn't fill every top slot.
+"""
+import asyncio
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import desc, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import Article
+from backend.services.fulltext import match_article_ids, tokenize_query
+from backend.services.search_cache import SemanticSearchCache
+from backend.services.vector_store import VectorStore
+
+# Candidates taken from each retriever before fusion / re-ranking
+HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "50"))
+# RRF damping constant (60 is the value from the original RRF paper)
+HYBRID_RRF_K = int(os.getenv("HYBRID_RRF_K", "60"))
+# Default MMR trade-off: 1.0 is pure relevance, 0.0 pure diversity
+MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "0.7"))
+
+
+class StageTimer:
+    """Wall-clock milliseconds per named search stage"""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self._start = time.perf_counter()
+
+    async def measure(self, stage: str, awaitable: Awaitable[Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self.record(stage, start)
+
+    def record(self, stage: str, start: float):
+        self.timings[stage] = round((time.perf_counter() - start) * 1000, 3)
+
+    def total(self) -> Dict[str, float]:
+        self.record("total", self._start)
+        return self.timings
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[int]],
+    k: int = HYBRID_RRF_K
+) -> List[Tuple[int, float]]:
+    """
+    Fuse ranked ID lists: score(id) = sum over lists of 1 / (k + rank)
+
+    Args:
+        rankings: Ranked article IDs from each retriever, best first
+        k: Damping constant; larger values flatten the advantage of top ranks
+
+    Returns:
+        (article_id, fused score) pairs, best first
+    """
+    scores: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, article_id in enumerate(ranking, start=1):
+            scores[article_id] = scores.get(article_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def mmr_rerank(
+    relevance: np.ndarray,
+    embeddings: np.ndarray,
+    top_k: int,
+    mmr_lambda: float = MMR_LAMBDA
+) -> List[int]:
+    """
+    Greedy maximal marginal relevance selection
+
+    Each step picks the candidate maximizing
+    lambda * relevance - (1 - lambda) * max cosine similarity to those already
+    picked. The pairwise similarity matrix is computed once and the running
+    max is updated with one vector operation per step.
+
+    Args:
+        relevance: Candidate relevance scores (any positive scale)
+        embeddings: Candidate embeddings, one row per candidate (zero rows
+            for candidates without an embedding are never penalized)
+        top_k: Number of candidates to select
+        mmr_lambda: Relevance vs. diversity trade-off in [0, 1]
+
+    Returns:
+        Candidate indexes in selection order
+    """
+    count = len(relevance)
+    if count == 0 or top_k <= 0:
+        return []
+
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    unit = np.divide(embeddings, norms, out=np.zeros_like(embeddings), where=norms > 0)
+    similarity = unit @ unit.T
+    # Scale relevance to [0, 1] so lambda weighs it against cosine similarity
+    relevance = relevance / relevance.max() if relevance.max() > 0 else relevance
+
+    max_similarity = np.zeros(count, dtype=similarity.dtype)
+    available = np.ones(count, dtype=bool)
+    selected = []
+    for _ in range(min(top_k, count)):
+        scores = np.where(available, mmr_lambda * relevance - (1 - mmr_lambda) * max_similarity, -np.inf)
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(max_similarity, similarity[best], out=max_similarity)
+    return selected
+
+
+async def lexical_article_ids(db: AsyncSession, query: str, limit: int) -> List[int]:
+    """Article IDs matching the query text, best full-text match first"""
+    if not tokenize_query(query):
+        return []
+    fulltext = match_article_ids(db.bind.dialect.name, query)
+    if fulltext:
+        matches, relevance = fulltext
+        result = await db.execute(select(matches.c.article_id).order_by(relevance).limit(limit))
+    else:
+        # No full-text index: substring match, newest first
+        result = await db.execute(
+            select(Article.id)
+            .where(or_(
+                Article.title.contains(query),
+                Article.content.contains(query),
+                Article.ai_summary.contains(query)
+            ))
+            .order_by(desc(Article.published_date), desc(Article.id))
+            .limit(limit)
+        )
+    return [row[0] for row in result.all()]
+
+
+async def _diversify(
+    vector_store: VectorStore,
+    ranked: List[Dict],
+    top_k: int,
+    mmr_lambda: float
+) -> List[Dict]:
+    """MMR over ranked results (relevance = their score) using stored embeddings"""
+    vector_ids = [vector_store.vector_id(result["article_id"]) for result in ranked]
+    embeddings = await vector_store.get_embeddings(vector_ids)
+    if not embeddings:
+        return ranked[:top_k]
+
+    dimension = len(next(iter(embeddings.values())))
+    matrix = np.zeros((len(ranked), dimension), dtype=np.float32)
+    for row, vector_id in enumerate(vector_ids):
+        if vector_id in embeddings:
+            matrix[row] = embeddings[vector_id]
+    relevance = np.array([result["score"] for result in ranked], dtype=np.float32)
+    return [ranked[index] for index in mmr_rerank(relevance, matrix, top_k, mmr_lambda)]
+
+
+async def ranked_search(
+    db: AsyncSession,
+    query: str,
+    top_k: int,
+    vector_store: VectorStore,
+    search_cache: SemanticSearchCache,
+    embed: Callable[[str], Awaitable[List[float]]],
+    mode: str = "vector",
+    diversify: bool = False,
+    mmr_lambda: float = MMR_LAMBDA,
+    timer: Optional[StageTimer] = None
+) -> Tuple[List[Dict], Dict[str, Any]]:
+    """
+    Rank articles for a query by vector similarity or hybrid RRF
+
+    Args:
+        db: Database session (used by the lexical retriever)
+        query: Raw query text
+        top_k: Number of results
+        vector_store: Vector store for retrieval and MMR embeddings
+        search_cache: Query embedding / vector result cache
+        embed: Coroutine function producing a query embedding
+        mode: "vector" or "hybrid"
+        diversify: Apply MMR re-ranking to the candidates
+        mmr_lambda: MMR relevance vs. diversity trade-off
+        timer: Stage timer to record into (optional)
+
+    Returns:
+        (results with article_id, score, similarity_score, lexical_rank and
+        vector_rank, best first; metadata with candidate counts)
+    """
+    timer = timer or StageTimer()
+    # MMR needs a wider pool than the page it returns
+    candidates = max(HYBRID_CANDIDATES, top_k) if (diversify or mode == "hybrid") else top_k
+
+    vector_search = timer.measure("vector", search_cache.search(
+        query,
+        candidates,
+        embed=embed,
+        search=lambda embedding, k: vector_store.search_similar(embedding=embedding, top_k=k)
+    ))
+    if mode == "hybrid":
+        # Both retrievers run concurrently; either one failing degrades to the other
+        lexical_ids, vector_results = await asyncio.gather(
+            timer.measure("lexical", lexical_article_ids(db, query, candidates)),
+            vector_search,
+            return_exceptions=True
+        )
+        if isinstance(lexical_ids, Exception):
+            print(f"⚠️  Lexical retrieval failed, using vector results only: {lexical_ids}")
+            lexical_ids = []
+        if isinstance(vector_results, Exception):
+            if not lexical_ids:
+                raise vector_results
+            print(f"⚠️  Vector retrieval failed, using lexical results only: {vector_results}")
+            vector_results = []
+    else:
+        lexical_ids, vector_results = [], await vector_search
+
+    vector_ids = [result["article_id"] for result in vector_results]
+    similarity = {result["article_id"]: result["score"] for result in vector_results}
+    lexical_rank = {article_id: rank for rank, article_id in enumerate(lexical_ids, start=1)}
+    vector_rank = {article_id: rank for rank, article_id in enumerate(vector_ids, start=1)}
+
+    if mode == "hybrid":
+        start = time.perf_counter()
+        fused = reciprocal_rank_fusion([lexical_ids, vector_ids])
+        timer.record("fusion", start)
+    else:
+        fused = [(article_id, similarity[article_id]) for article_id in vector_ids]
+
+    ranked = [
+        {
+            "article_id": article_id,
+            "score": score,
+            "similarity_score": similarity.get(article_id, 0.0),
+            "lexical_rank": lexical_rank.get(article_id),
+            "vector_rank": vector_rank.get(article_id),
+        }
+        for article_id, score in fused
+    ]
+    if diversify and len(ranked) > 1:
+        ranked = await timer.measure("mmr", _diversify(vector_store, ranked, top_k, mmr_lambda))
+    else:
+        ranked = ranked[:top_k]
+
+    return ranked, {
+        "mode": mode,
+        "diversified": diversify,
+        "lexical_candidates": len(lexical_ids),
+        "vector_candidates": len(vector_ids),
+    }
@@ -0,0 +1,217 @@
+"""
+Set-based article ingestion shared by the news router and the cron job
+A batch of parsed Event Registry articles is stored with a fixed number of
+round trips: one query to resolve sources, one to find existing articles,
+and bulk INSERT ... ON CONFLICT / ON DUPLICATE KEY statements.
+
+Articles are deduplicated by Event Registry URI and by a content hash, both
+backed by unique indexes, so concurrent ingest workers can't store an
+article twice. Near-duplicates (the same story with small edits) are stored
+but clustered, and only each cluster's first article is queued for AI
+enrichment; a near-duplicate of an enriched article joins its story cluster
+right away.
+"""
+import asyncio
+import hashlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import Article, Source
+from backend.services.bulk_insert import bulk_insert
+from backend.services.enrichment_queue import enqueue_articles
+from backend.services.near_duplicates import assign_clusters, compute_signature
+from backend.services.response_cache import response_cache
+from backend.services.story_clusters import story_index
+from backend.services.tags import index_stored_tags
+
+
+class SourceCache:
+    """Process-wide source name -> ID cache (only committed IDs are stored)"""
+
+    def __init__(self, max_entries: int = 50000):
+        self.max_entries = max_entries
+        self._ids: Dict[str, int] = {}
+
+    def get(self, name: str) -> Optional[int]:
+        return self._ids.get(name)
+
+    def update(self, ids: Dict[str, int]):
+        if len(self._ids) + len(ids) > self.max_entries:
+            self._ids.clear()
+        self._ids.update(ids)
+
+    def clear(self):
+        self._ids.clear()
+
+
+source_cache = SourceCache()
+
+
+def compute_content_hash(title: str, content: Optional[str]) -> str:
+    """SHA-256 of the case-folded, whitespace-collapsed body (title if there is no body)"""
+    text = " ".join((content or "").casefold().split()) or " ".join(title.casefold().split())
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _dedup_keys(article_data: Dict) -> List[str]:
+    keys = [f"hash:{article_data['content_hash']}"]
+    if article_data.get("uri"):
+        keys.append(f"uri:{article_data['uri']}")
+    return keys
+
+
+async def resolve_sources(db: AsyncSession, sources: Dict[str, Optional[str]]) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """
+    Map source names to IDs, creating missing sources in bulk
+
+    Args:
+        db: Database session
+        sources: Source name -> URI for every source in the batch
+
+    Returns:
+        (all name -> ID, newly resolved name -> ID to cache after commit)
+    """
+    ids = {name: source_cache.get(name) for name in sources}
+    missing = [name for name, source_id in ids.items() if source_id is None]
+    resolved: Dict[str, int] = {}
+
+    if missing:
+        result = await db.execute(select(Source.id, Source.name).where(Source.name.in_(missing)))
+        for source_id, name in result.all():
+            resolved.setdefault(name, source_id)
+
+        to_create = [
+            {"name": name, "uri": sources[name]}
+            for name in missing if name not in resolved
+        ]
+        if to_create:
+            resolved.update(await bulk_insert(db, Source.__table__, to_create, Source.__table__.c.name))
+            # Created by a concurrent worker between the two queries
+            unresolved = [row["name"] for row in to_create if row["name"] not in resolved]
+            if unresolved:
+                result = await db.execute(select(Source.id, Source.name).where(Source.name.in_(unresolved)))
+                resolved.update({name: source_id for source_id, name in result.all()})
+        ids.update(resolved)
+
+    return ids, resolved
+
+
+async def _find_existing(db: AsyncSession, batch: List[Dict]) -> Dict[str, int]:
+    """Map batch content hashes to IDs of stored articles matching by hash or URI"""
+    hashes = [article_data["content_hash"] for article_data in batch]
+    uris = [article_data["uri"] for article_data in batch if article_data.get("uri")]
+    condition = Article.content_hash.in_(hashes)
+    if uris:
+        condition = or_(condition, Article.uri.in_(uris))
+    result = await db.execute(select(Article.id, Article.uri, Article.content_hash).where(condition))
+
+    ids_by_key: Dict[str, int] = {}
+    for article_id, uri, content_hash in result.all():
+        if content_hash:
+            ids_by_key[f"hash:{content_hash}"] = article_id
+        if uri:
+            ids_by_key[f"uri:{uri}"] = article_id
+
+    existing: Dict[str, int] = {}
+    for article_data in batch:
+        for key in _dedup_keys(article_data):
+            if key in ids_by_key:
+                existing[article_data["content_hash"]] = ids_by_key[key]
+                break
+    return existing
+
+
+async def ingest_articles(
+    db: AsyncSession,
+    parsed_articles: Iterable[Dict],
+    enqueue: bool = True
+) -> Tuple[List[Article], List[int]]:
+    """
+    Store a batch of parsed articles, skipping ones that already exist
+
+    Args:
+        db: Database session (committed by this function)
+        parsed_articles: Articles as returned by EventRegistryService
+        enqueue: Queue newly stored articles for background AI enrichment
+
+    Returns:
+        (stored articles in input order including existing ones, IDs of new articles)
+    """
+    # Deduplicate within the batch by URI and content hash
+    batch: List[Dict] = []
+    seen = set()
+    for article_data in parsed_articles:
+        article_data = {
+            **article_data,
+            "content_hash": compute_content_hash(article_data["title"], article_data.get("content"))
+        }
+        keys = _dedup_keys(article_data)
+        if seen.isdisjoint(keys):
+            seen.update(keys)
+            batch.append(article_data)
+    if not batch:
+        return [], []
+
+    # One query (plus a bulk insert) for sources
+    sources = {
+        article_data["source_name"]: article_data.get("source_uri")
+        for article_data in batch if article_data.get("source_name")
+    }
+    source_ids, new_sources = await resolve_sources(db, sources)
+
+    # One unique-index probe for articles that already exist
+    article_ids = await _find_existing(db, batch)
+
+    rows = [
+        {
+            "title": article_data["title"],
+            "content": article_data.get("content"),
+            "image_url": article_data.get("image_url"),
+            "url": article_data.get("url"),
+            "uri": article_data.get("uri"),
+            "content_hash": article_data["content_hash"],
+            "published_date": article_data.get("published_date"),
+            "source_id": source_ids.get(article_data.get("source_name"))
+        }
+        for article_data in batch if article_data["content_hash"] not in article_ids
+    ]
+    # MinHash signatures are CPU-bound; compute them off the event loop
+    signatures = await asyncio.to_thread(lambda: [compute_signature(row["title"], row["content"]) for row in rows])
+    for row, signature in zip(rows, signatures):
+        row["minhash"] = signature
+    inserted = await bulk_insert(db, Article.__table__, rows, Article.__table__.c.content_hash) if rows else {}
+    new_ids = [inserted[row["content_hash"]] for row in rows if row["content_hash"] in inserted]
+    article_ids.update(inserted)
+
+    # Cluster near-duplicates; only canonical articles are enriched
+    duplicates = await assign_clusters(db, [
+        (inserted[row["content_hash"]], row["minhash"]) for row in rows if row["content_hash"] in inserted
+    ])
+    if duplicates:
+        # Counted toward trending when the batch commits; copied tags are indexed
+        await story_index.record_members(db, list(duplicates))
+        await index_stored_tags(db, list(duplicates))
+
+    # Rows skipped by a conflict (URI match, or a concurrent worker won the race)
+    unresolved = [article_data for article_data in batch if article_data["content_hash"] not in article_ids]
+    if unresolved:
+        article_ids.update(await _find_existing(db, unresolved))
+
+    if enqueue and new_ids:
+        await enqueue_articles(db, [article_id for article_id in new_ids if article_id not in duplicates])
+
+    await db.commit()
+    source_cache.update(new_sources)
+    if new_ids:
+        await response_cache.invalidate()
+
+    # Load ORM objects for the response in one query
+    ordered_ids = list(dict.fromkeys(
+        article_ids[article_data["content_hash"]]
+        for article_data in batch if article_data["content_hash"] in article_ids
+    ))
+    result = await db.execute(select(Article).where(Article.id.in_(ordered_ids)))
+    articles = {article.id: article for article in result.scalars().all()}
+    return [articles[article_id] for article_id in ordered_ids if article_id in articles], new_ids
@@ -0,0 +1,550 @@
+import os
+import json
+import asyncio
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+import numpy as np
+from dotenv import load_dotenv
+
+from backend.services.vector_store import VectorStore
+
+load_dotenv()
+
+DEFAULT_PATH = Path(__file__).parent.parent.parent / "vector_store"
+
+
+class LocalVectorStore(VectorStore):
+    """
+    In-process vector store backed by a memory-mapped float32 matrix
+
+    Layout of the store directory:
+        vectors.f32  - row-major float32 matrix of unit-length vectors
+        log.jsonl    - append-only log of puts ({"op": "put", "id", "row", "metadata"})
+                       and deletes ({"op": "del", "id"}), replayed on load
+
+    Deleted rows are tombstoned and reclaimed by compact(), which runs
+    automatically once tombstones exceed compaction_ratio of the rows.
+
+    Several processes may open the same directory (the API, the standalone
+    enrichment runner, backfill scripts). Writes and compactions hold an
+    exclusive flock on the directory's .lock file and first replay what other
+    processes appended to the log, so row numbers never collide; reads pick
+    up other processes' writes (or their compaction) when the log changed.
+    Without fcntl (Windows) the store is single-process: run one process
+    against a directory at a time.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        dimension: int = 1024,
+        compaction_ratio: Optional[float] = None,
+        compaction_min_rows: int = 1000
+    ):
+        self.path = Path(path or os.getenv("LOCAL_VECTOR_STORE_PATH") or DEFAULT_PATH)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.dimension = dimension
+        self.compaction_ratio = compaction_ratio if compaction_ratio is not None else float(os.getenv("LOCAL_VECTOR_COMPACTION_RATIO", "0.2"))
+        self.compaction_min_rows = compaction_min_rows
+        self._vectors_path = self.path / "vectors.f32"
+        self._log_path = self.path / "log.jsonl"
+        self._lock = threading.RLock()
+        self._lock_file = open(self.path / ".lock", "a")
+        self._log = None
+        self._vectors = None
+
+        with self._lock, self._file_lock(exclusive=True):
+            self._finish_interrupted_compaction()
+            self._load(grow=True)
+        print(f"✅ Local vector store ready: {self.path} ({self.live_count} vectors)")
+
+    # ------------------------------------------------------------------
+    # Loading and storage
+    # ------------------------------------------------------------------
+
+    def _finish_interrupted_compaction(self):
+        """The compacted log is written last, so its presence means both files are complete"""
+        compact_log = self._log_path.with_suffix(".jsonl.compact")
+        compact_vectors = self._vectors_path.with_suffix(".f32.compact")
+        if compact_log.exists():
+            if compact_vectors.exists():
+                os.replace(compact_vectors, self._vectors_path)
+            os.replace(compact_log, self._log_path)
+        elif compact_vectors.exists():
+            compact_vectors.unlink()
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool):
+        """Cross-process lock on the store directory (callers hold self._lock; never nested)"""
+        if fcntl is None:
+            yield
+            return
+        fcntl.flock(self._lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    def _load(self, grow: bool = False):
+        """(Re)build the in-memory index from the log and map the matrix"""
+        if self._log is not None and not self._log.closed:
+            self._log.close()
+        if self._vectors is not None:
+            self._vectors.flush()
+            del self._vectors
+        self._ids: List[Optional[str]] = []
+        self._metadata: List[Optional[Dict]] = []
+        self._row_of: Dict[str, int] = {}
+        self._count = 0
+        self._tombstones = 0
+        self._capacity = 0
+        self._vectors = None
+        self._article_ids = np.zeros(0, dtype=np.int64)
+        self._source_ids = np.zeros(0, dtype=np.int64)
+        self._alive = np.zeros(0, dtype=bool)
+        self._log_inode = None
+        self._log_offset = 0
+
+        self._log = open(self._log_path, "a", encoding="utf-8")
+        self._replay(grow)
+        if self._vectors is None and (grow or self._file_rows() > 0):
+            self._ensure_capacity(1, grow=grow)
+
+    def _replay(self, grow: bool = False):
+        """Apply log records appended since the last replay (by this or another process)"""
+        with open(self._log_path, "rb") as log:
+            self._log_inode = os.fstat(log.fileno()).st_ino
+            log.seek(self._log_offset)
+            data = log.read()
+        # A line still being written by another process is read next time
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if record["op"] == "put":
+                row = record["row"]
+                if row >= self._count:
+                    self._ensure_capacity(row + 1, grow=grow)
+                    self._ids.extend([None] * (row + 1 - self._count))
+                    self._metadata.extend([None] * (row + 1 - self._count))
+                    self._count = row + 1
+                self._set_row_metadata(row, record["id"], record["metadata"])
+            elif record["op"] == "del":
+                self._tombstone(record["id"])
+        self._log_offset += end
+
+    def _log_changed(self) -> bool:
+        try:
+            stat = os.stat(self._log_path)
+        except FileNotFoundError:
+            return True
+        return stat.st_ino != self._log_inode or stat.st_size != self._log_offset
+
+    def _catch_up(self):
+        """Apply other processes' writes; reload if one of them compacted the store (file lock held)"""
+        if not self._log_changed():
+            return
+        stat = os.stat(self._log_path)
+        if stat.st_ino != self._log_inode or stat.st_size < self._log_offset:
+            self._load()
+        else:
+            self._replay()
+
+    def _refresh(self):
+        """Before a read: cheap stat of the log, catching up only when it changed"""
+        if self._log_changed():
+            with self._file_lock(exclusive=False):
+                self._catch_up()
+
+    def _file_rows(self) -> int:
+        if not self._vectors_path.exists():
+            return 0
+        return self._vectors_path.stat().st_size // (self.dimension * 4)
+
+    def _ensure_capacity(self, rows: int, grow: bool = True):
+        """
+        Map at least rows vectors of the matrix (and size the row arrays to match)
+
+        Only a writer holding the exclusive file lock may grow the file;
+        readers map what writers already allocated.
+        """
+        if rows <= self._capacity:
+            return
+        file_rows = self._file_rows()
+        if file_rows < rows:
+            if not grow:
+                raise RuntimeError(f"{self._vectors_path} holds {file_rows} rows, the log needs {rows}")
+            file_rows = max(rows, self._capacity * 2, 1024)
+            with open(self._vectors_path, "ab") as f:
+                f.truncate(file_rows * self.dimension * 4)
+        capacity = file_rows
+
+        if self._vectors is not None:
+            self._vectors.flush()
+            del self._vectors
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dimension))
+
+        self._article_ids = np.concatenate([self._article_ids, np.full(capacity - self._capacity, -1, dtype=np.int64)])
+        self._source_ids = np.concatenate([self._source_ids, np.full(capacity - self._capacity, -1, dtype=np.int64)])
+        self._alive = np.concatenate([self._alive, np.zeros(capacity - self._capacity, dtype=bool)])
+        self._capacity = capacity
+
+    def _set_row_metadata(self, row: int, vector_id: str, metadata: Dict):
+        previous = self._row_of.get(vector_id)
+        if previous is not None and previous != row:
+            self._alive[previous] = False
+            self._ids[previous] = None
+            self._metadata[previous] = None
+            self._tombstones += 1
+        self._row_of[vector_id] = row
+        self._ids[row] = vector_id
+        self._metadata[row] = metadata
+        self._article_ids[row] = metadata.get("article_id", -1)
+        source_id = metadata.get("source_id")
+        self._source_ids[row] = source_id if source_id is not None else -1
+        self._alive[row] = True
+
+    def _tombstone(self, vector_id: str) -> bool:
+        row = self._row_of.pop(vector_id, None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        self._ids[row] = None
+        self._metadata[row] = None
+        self._tombstones += 1
+        return True
+
+    @property
+    def live_count(self) -> int:
+        return self._count - self._tombstones
+
+    def _normalize(self, embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        if vector.shape[-1] != self.dimension:
+            raise ValueError(f"Expected {self.dimension}-dimension vectors, got {vector.shape[-1]}")
+        norms = np.linalg.norm(vector, axis=-1, keepdims=True)
+        return vector / np.where(norms == 0, 1, norms)
+
+    # ------------------------------------------------------------------
+    # Synchronous operations (run on a worker thread by the async API)
+    # ------------------------------------------------------------------
+
+    def _upsert(self, items: List[Dict]) -> List[str]:
+        vectors = self._normalize([item["embedding"] for item in items])
+        with self._lock, self._file_lock(exclusive=True):
+            # Rows appended by other processes must be known before allocating
+            self._catch_up()
+            lines = []
+            vector_ids = []
+            for item, vector in zip(items, vectors):
+                metadata = {key: value for key, value in (item.get("metadata") or {}).items() if value is not None}
+                metadata["article_id"] = item["article_id"]
+                if item.get("passage") is not None:
+                    metadata["passage"] = item["passage"]
+                vector_id = self.item_vector_id(item)
+
+                # Overwrite in place when the ID exists, otherwise append a row
+                row = self._row_of.get(vector_id)
+                if row is None:
+                    row = self._count
+                    self._ensure_capacity(row + 1)
+                    self._count += 1
+                    self._ids.append(None)
+                    self._metadata.append(None)
+
+                self._vectors[row] = vector
+                self._set_row_metadata(row, vector_id, metadata)
+                lines.append(json.dumps({"op": "put", "id": vector_id, "row": row, "metadata": metadata}))
+                vector_ids.append(vector_id)
+
+            self._vectors.flush()
+            self._write_log(lines)
+            return vector_ids
+
+    def _write_log(self, lines: List[str]):
+        """Append records (exclusive file lock held); the log is then fully replayed"""
+        self._log.write("".join(line + "\n" for line in lines))
+        self._log.flush()
+        self._log_offset = os.fstat(self._log.fileno()).st_size
+
+    def _get(self, embedding_id: str) -> Optional[List[float]]:
+        with self._lock:
+            self._refresh()
+            row = self._row_of.get(embedding_id)
+            if row is None:
+                return None
+            return self._vectors[row].tolist()
+
+    def _get_many(self, embedding_ids: List[str]) -> Dict[str, List[float]]:
+        with self._lock:
+            self._refresh()
+            rows = {embedding_id: self._row_of[embedding_id] for embedding_id in embedding_ids if embedding_id in self._row_of}
+            if not rows:
+                return {}
+            vectors = self._vectors[list(rows.values())]
+            return {embedding_id: vector.tolist() for embedding_id, vector in zip(rows, vectors)}
+
+    def _filter_mask(self, filter_dict: Dict, rows: int) -> np.ndarray:
+        """Evaluate a Pinecone-style metadata filter ($eq/$ne/$in/$nin, $and/$or) as a row mask"""
+        mask = np.ones(rows, dtype=bool)
+        for field, condition in filter_dict.items():
+            if field == "$and":
+                for clause in condition:
+                    mask &= self._filter_mask(clause, rows)
+                continue
+            if field == "$or":
+                any_mask = np.zeros(rows, dtype=bool)
+                for clause in condition:
+                    any_mask |= self._filter_mask(clause, rows)
+                mask &= any_mask
+                continue
+            if not isinstance(condition, dict):
+                condition = {"$eq": condition}
+
+            if field in ("article_id", "source_id"):
+                # Vectorized path for the indexed ID fields
+                values = (self._article_ids if field == "article_id" else self._source_ids)[:rows]
+                for operator, operand in condition.items():
+                    if operator == "$eq":
+                        mask &= values == operand
+                    elif operator == "$ne":
+                        mask &= values != operand
+                    elif operator == "$in":
+                        mask &= np.isin(values, operand)
+                    elif operator == "$nin":
+                        mask &= ~np.isin(values, operand)
+                    else:
+                        raise ValueError(f"Unsupported filter operator: {operator}")
+            else:
+                values = [metadata.get(field) if metadata else None for metadata in self._metadata[:rows]]
+                for operator, operand in condition.items():
+                    if operator == "$eq":
+                        matches = [value == operand for value in values]
+                    elif operator == "$ne":
+                        matches = [value != operand for value in values]
+                    elif operator == "$in":
+                        matches = [value in operand for value in values]
+                    elif operator == "$nin":
+                        matches = [value not in operand for value in values]
+                    else:
+                        raise ValueError(f"Unsupported filter operator: {operator}")
+                    mask &= np.array(matches, dtype=bool)
+        return mask
+
+    def _search(
+        self,
+        embedding: List[float],
+        top_k: int,
+        exclude_ids: Optional[List[int]],
+        filter_dict: Optional[Dict]
+    ) -> List[Dict]:
+        return self._search_normalized(self._normalize(embedding), top_k, exclude_ids, filter_dict)
+
+    def _search_by_id(
+        self,
+        vector_id: str,
+        top_k: int,
+        exclude_ids: Optional[List[int]],
+        filter_dict: Optional[Dict]
+    ) -> List[Dict]:
+        with self._lock:
+            self._refresh()
+            row = self._row_of.get(vector_id)
+            if row is None:
+                return []
+            # Stored rows are already unit length
+            return self._search_normalized(np.array(self._vectors[row]), top_k, exclude_ids, filter_dict)
+
+    def _search_normalized(
+        self,
+        query: np.ndarray,
+        top_k: int,
+        exclude_ids: Optional[List[int]],
+        filter_dict: Optional[Dict]
+    ) -> List[Dict]:
+        with self._lock:
+            self._refresh()
+            rows = self._count
+            if rows == 0 or top_k <= 0:
+                return []
+
+            mask = self._alive[:rows].copy()
+            if filter_dict:
+                mask &= self._filter_mask(filter_dict, rows)
+            if exclude_ids:
+                mask &= ~np.isin(self._article_ids[:rows], exclude_ids)
+
+            candidates = np.flatnonzero(mask)
+            if len(candidates) == 0:
+                return []
+
+            # Cosine similarity: stored vectors are unit length
+            if len(candidates) * 2 < rows:
+                scores = self._vectors[candidates] @ query
+            else:
+                scores = self._vectors[:rows] @ query
+                scores = scores[candidates]
+
+            # Passage rows are folded into their article (bounded fan-out, like Pinecone)
+            k = min(self.search_k(top_k), len(candidates))
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+
+            return self.aggregate_matches([
+                {
+                    "article_id": int(self._article_ids[candidates[i]]),
+                    "score": float(scores[i]),
+                    "metadata": self._metadata[candidates[i]]
+                }
+                for i in top
+            ], top_k)
+
+    def _delete(self, embedding_ids: List[str]):
+        with self._lock, self._file_lock(exclusive=True):
+            self._catch_up()
+            deleted = [embedding_id for embedding_id in embedding_ids if self._tombstone(embedding_id)]
+            if not deleted:
+                return
+            self._write_log([json.dumps({"op": "del", "id": embedding_id}) for embedding_id in deleted])
+            if self._tombstones >= self.compaction_min_rows and self._tombstones >= self._count * self.compaction_ratio:
+                self._compact()
+
+    def compact(self):
+        """Rewrite the matrix and log without tombstoned rows"""
+        with self._lock, self._file_lock(exclusive=True):
+            self._catch_up()
+            self._compact()
+
+    def _compact(self):
+        # Exclusive file lock held: other processes reload when they see the new log
+        with self._lock:
+            live_rows = np.flatnonzero(self._alive[:self._count])
+            compact_vectors = self._vectors_path.with_suffix(".f32.compact")
+            compact_log = self._log_path.with_suffix(".jsonl.compact")
+
+            capacity = max(len(live_rows), 1024)
+            new_vectors = np.memmap(compact_vectors, dtype=np.float32, mode="w+", shape=(capacity, self.dimension))
+            for start in range(0, len(live_rows), 65536):
+                chunk = live_rows[start:start + 65536]
+                new_vectors[start:start + len(chunk)] = self._vectors[chunk]
+            new_vectors.flush()
+            del new_vectors
+
+            tmp_log = compact_log.with_suffix(".tmp")
+            with open(tmp_log, "w", encoding="utf-8") as log:
+                for new_row, old_row in enumerate(live_rows):
+                    log.write(json.dumps({
+                        "op": "put",
+                        "id": self._ids[old_row],
+                        "row": new_row,
+                        "metadata": self._metadata[old_row]
+                    }) + "\n")
+            os.replace(tmp_log, compact_log)
+
+            # Swap files in and reload
+            self._log.close()
+            self._vectors.flush()
+            del self._vectors
+            self._vectors = None
+            self._finish_interrupted_compaction()
+            self._load(grow=True)
+            print(f"✅ Compacted local vector store to {self.live_count} vectors")
+
+    # ------------------------------------------------------------------
+    # VectorStore API
+    # ------------------------------------------------------------------
+
+    async def upsert_embedding(
+        self,
+        article_id: int,
+        embedding: List[float],
+        metadata: Optional[Dict] = None
+    ) -> str:
+        """Store or update embedding in the local store"""
+        items = [{"article_id": article_id, "embedding": embedding, "metadata": metadata}]
+        return (await asyncio.to_thread(self._upsert, items))[0]
+
+    async def upsert_embeddings(self, batch: List[Dict], chunk_size: int = 100) -> List[str]:
+        """Store or update many embeddings; chunk_size bounds each locked write"""
+        vector_ids = []
+        for start in range(0, len(batch), chunk_size):
+            vector_ids.extend(await asyncio.to_thread(self._upsert, batch[start:start + chunk_size]))
+        return vector_ids
+
+    async def get_embedding(self, embedding_id: str) -> Optional[List[float]]:
+        """Retrieve the (unit-length) embedding vector by ID"""
+        return await asyncio.to_thread(self._get, embedding_id)
+
+    async def get_embeddings(self, embedding_ids: List[str]) -> Dict[str, List[float]]:
+        """Retrieve several embedding vectors in one locked read"""
+        return await asyncio.to_thread(self._get_many, embedding_ids)
+
+    async def search_similar(
+        self,
+        embedding: List[float],
+        top_k: int = 10,
+        exclude_ids: Optional[List[int]] = None,
+        filter_dict: Optional[Dict] = None
+    ) -> List[Dict]:
+        """
+        Cosine top-k search over the memory-mapped matrix
+
+        Args:
+            embedding: Query embedding vector
+            top_k: Number of results to return
+            exclude_ids: Article IDs to exclude from results
+            filter_dict: Metadata filters ($eq/$ne/$in/$nin)
+
+        Returns:
+            List of results with article_id and score
+        """
+        try:
+            return await asyncio.to_thread(self._search, embedding, top_k, exclude_ids, filter_dict)
+        except Exception as e:
+            print(f"Error searching similar articles: {e}")
+            return []
+
+    async def search_by_id(
+        self,
+        vector_id: str,
+        top_k: int = 10,
+        exclude_ids: Optional[List[int]] = None,
+        filter_dict: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Cosine top-k search using a stored vector as the query"""
+        try:
+            return await asyncio.to_thread(self._search_by_id, vector_id, top_k, exclude_ids, filter_dict)
+        except Exception as e:
+            print(f"Error searching similar articles: {e}")
+            return []
+
+    async def delete_embedding(self, embedding_id: str):
+        """Tombstone an embedding (space is reclaimed on compaction)"""
+        await self.delete_embeddings([embedding_id])
+
+    async def delete_embeddings(self, embedding_ids: List[str]):
+        """Tombstone several embeddings in one locked write"""
+        try:
+            await asyncio.to_thread(self._delete, embedding_ids)
+        except Exception as e:
+            print(f"Error deleting embedding: {e}")
+
+    async def aclose(self):
+        """Flush the matrix and close the log"""
+        with self._lock:
+            if self._vectors is not None:
+                self._vectors.flush()
+            if not self._log.closed:
+                self._log.close()
+            if not self._lock_file.closed:
+                self._lock_file.close()
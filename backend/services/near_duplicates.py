@@ -0,0 +1,286 @@
+"""
+Near-duplicate story detection with MinHash-LSH
+The same wire story arrives from many outlets with small edits. Each article
+gets a MinHash signature over word 3-gram shingles of its title and body;
+the signature is split into bands, and only the bands of canonical articles
+(the first of each cluster) are kept in the minhash_bands table. A new
+article is looked up with one indexed probe per band, so the cost grows with
+the number of candidates sharing a bucket rather than with the corpus.
+
+Candidates are verified by estimated Jaccard similarity. A match becomes a
+duplicate of the candidate's cluster (Article.duplicate_of_id) and shares
+its AI enrichment instead of paying for its own completion and vector.
+
+Usage (signatures for articles stored before clustering existed):
+    python backend/services/near_duplicates.py [--batch-size 500]
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import and_, bindparam, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import load_only, undefer
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.models import Article, MinHashBand
+
+# 16 bands x 8 rows: pairs above ~0.7 Jaccard almost always share a bucket
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))
+SHINGLE_SIZE = 3
+MAX_SHINGLE_WORDS = 2000
+
+# Fields a duplicate copies from its cluster's canonical article
+SHARED_FIELDS = ("ai_summary", "ai_tags", "ai_caption", "ai_image_prompt", "story_cluster_id")
+
+# Universal hash family (a * x + b) mod p over 32-bit shingle hashes. Stored
+# signatures depend on these parameters: never change the seed or sizes.
+_PRIME = np.uint64(4294967311)  # Smallest prime above 2**32
+_params = np.random.RandomState(20261017)
+_A = _params.randint(1, 2 ** 32, size=NUM_PERM, dtype=np.uint64)
+_B = _params.randint(0, 2 ** 32, size=NUM_PERM, dtype=np.uint64)
+_WORD_RE = re.compile(r"\w+")
+
+
+def shingles(title: str, content: Optional[str]) -> List[str]:
+    """Word 3-grams of the case-folded title and body"""
+    words = _WORD_RE.findall(f"{title} {content or ''}".casefold())[:MAX_SHINGLE_WORDS]
+    if len(words) < SHINGLE_SIZE:
+        return [" ".join(words)] if words else []
+    return [" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+
+
+def compute_signature(title: str, content: Optional[str]) -> Optional[bytes]:
+    """MinHash signature (NUM_PERM uint32 values) or None for empty text"""
+    values = set(shingles(title, content))
+    if not values:
+        return None
+    hashes = np.fromiter(
+        (int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=4).digest(), "little") for value in values),
+        dtype=np.uint64,
+        count=len(values)
+    )
+    # (n, 1) x (NUM_PERM,) -> (n, NUM_PERM); products stay below 2**64
+    permuted = (hashes[:, None] * _A + _B) % _PRIME
+    return (permuted.min(axis=0) & np.uint64(0xFFFFFFFF)).astype("<u4").tobytes()
+
+
+def band_buckets(signature: bytes) -> List[int]:
+    """One signed 64-bit bucket key per band"""
+    return [
+        int.from_bytes(
+            hashlib.blake2b(signature[band * ROWS * 4:(band + 1) * ROWS * 4], digest_size=8).digest(),
+            "little",
+            signed=True
+        )
+        for band in range(BANDS)
+    ]
+
+
+def similarity(first: bytes, second: bytes) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    return float(np.mean(np.frombuffer(first, dtype="<u4") == np.frombuffer(second, dtype="<u4")))
+
+
+async def _candidates(db: AsyncSession, buckets: Dict[int, List[int]]) -> Dict[Tuple[int, int], List[int]]:
+    """Indexed articles in any of the given buckets: (band, bucket) -> article IDs"""
+    by_band: Dict[int, set] = {}
+    for keys in buckets.values():
+        for band, bucket in enumerate(keys):
+            by_band.setdefault(band, set()).add(bucket)
+    result = await db.execute(
+        select(MinHashBand.band, MinHashBand.bucket, MinHashBand.article_id).where(or_(*(
+            and_(MinHashBand.band == band, MinHashBand.bucket.in_(list(values)))
+            for band, values in by_band.items()
+        )))
+    )
+    found: Dict[Tuple[int, int], List[int]] = {}
+    for band, bucket, article_id in result.all():
+        found.setdefault((band, bucket), []).append(article_id)
+    return found
+
+
+async def assign_clusters(db: AsyncSession, signatures: Sequence[Tuple[int, Optional[bytes]]]) -> Dict[int, int]:
+    """
+    Cluster newly stored articles against the index and each other
+
+    Canonical articles are added to the band index; duplicates get
+    duplicate_of_id and copy the canonical's AI fields if it is enriched.
+
+    Args:
+        db: Database session (the caller commits)
+        signatures: (article_id, signature) for new articles, in ingest order
+
+    Returns:
+        Duplicate article ID -> canonical article ID
+    """
+    signatures = [(article_id, signature) for article_id, signature in signatures if signature]
+    if not signatures:
+        return {}
+    buckets = {article_id: band_buckets(signature) for article_id, signature in signatures}
+    indexed = await _candidates(db, buckets)
+
+    # Signatures of stored candidates, in one query
+    candidate_ids = {article_id for ids in indexed.values() for article_id in ids} - set(buckets)
+    known: Dict[int, bytes] = dict(signatures)
+    if candidate_ids:
+        result = await db.execute(select(Article.id, Article.minhash).where(Article.id.in_(candidate_ids)))
+        known.update({article_id: minhash for article_id, minhash in result.all() if minhash})
+
+    duplicates: Dict[int, int] = {}
+    band_rows = []
+    for article_id, signature in signatures:
+        candidates = {
+            candidate
+            for band, bucket in enumerate(buckets[article_id])
+            for candidate in indexed.get((band, bucket), [])
+            if candidate != article_id and candidate in known
+        }
+        scored = [(similarity(signature, known[candidate]), candidate) for candidate in candidates]
+        best = max(scored, default=None)
+        if best and best[0] >= NEAR_DUP_THRESHOLD:
+            duplicates[article_id] = best[1]
+            continue
+        # Canonical: index it so later articles in this batch can match too
+        for band, bucket in enumerate(buckets[article_id]):
+            indexed.setdefault((band, bucket), []).append(article_id)
+            band_rows.append({"band": band, "bucket": bucket, "article_id": article_id})
+
+    if band_rows:
+        await db.execute(insert(MinHashBand), band_rows)
+    if duplicates:
+        await _link_duplicates(db, duplicates)
+    return duplicates
+
+
+async def _link_duplicates(db: AsyncSession, duplicates: Dict[int, int]):
+    """Point duplicates at their canonical article, copying its enrichment if present"""
+    result = await db.execute(
+        select(Article.id, *(getattr(Article, field) for field in SHARED_FIELDS))
+        .where(Article.id.in_(set(duplicates.values())))
+    )
+    shared = {row.id: {field: getattr(row, field) for field in SHARED_FIELDS} for row in result.all()}
+    table = Article.__table__
+    await db.execute(
+        update(table).where(table.c.id == bindparam("duplicate_id")).values(
+            duplicate_of_id=bindparam("canonical_id"),
+            **{field: bindparam(f"shared_{field}") for field in SHARED_FIELDS}
+        ),
+        [
+            {
+                "duplicate_id": duplicate_id,
+                "canonical_id": canonical_id,
+                **{f"shared_{field}": shared.get(canonical_id, {}).get(field) for field in SHARED_FIELDS}
+            }
+            for duplicate_id, canonical_id in duplicates.items()
+        ]
+    )
+
+
+def share_enrichment(canonical: Article, duplicate: Article):
+    """Copy the canonical article's AI fields onto a duplicate"""
+    for field in SHARED_FIELDS:
+        setattr(duplicate, field, getattr(canonical, field))
+
+
+async def propagate_enrichment(db: AsyncSession, canonical: Article):
+    """Copy a freshly enriched canonical article's AI fields to its whole cluster"""
+    await db.execute(
+        update(Article)
+        .where(Article.duplicate_of_id == canonical.id)
+        .values(**{field: getattr(canonical, field) for field in SHARED_FIELDS})
+    )
+
+
+async def detach_cluster(db: AsyncSession, article_id: int) -> Optional[int]:
+    """
+    Promote a new canonical before a canonical article is deleted
+
+    The oldest duplicate becomes canonical (re-indexed with its own
+    signature) and the rest of the cluster points at it.
+
+    Returns:
+        The promoted article ID (needs its own enrichment), or None
+    """
+    result = await db.execute(
+        select(Article).options(load_only(Article.id), undefer(Article.minhash))
+        .where(Article.duplicate_of_id == article_id).order_by(Article.id)
+    )
+    members = result.scalars().all()
+    if not members:
+        return None
+    promoted = members[0]
+    promoted.duplicate_of_id = None
+    await db.execute(
+        update(Article)
+        .where(Article.duplicate_of_id == article_id, Article.id != promoted.id)
+        .values(duplicate_of_id=promoted.id)
+    )
+    if promoted.minhash:
+        await db.execute(insert(MinHashBand), [
+            {"band": band, "bucket": bucket, "article_id": promoted.id}
+            for band, bucket in enumerate(band_buckets(promoted.minhash))
+        ])
+    return promoted.id
+
+
+async def backfill_signatures(batch_size: int = 500) -> Tuple[int, int]:
+    """
+    Sign and cluster stored articles that have no signature, oldest first
+
+    Returns:
+        (articles signed, duplicates found)
+    """
+    from backend.database import AsyncSessionLocal
+
+    signed = duplicates = 0
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Article.id, Article.title, Article.content)
+                .where(Article.id > last_id, Article.minhash.is_(None), Article.duplicate_of_id.is_(None))
+                .order_by(Article.id).limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            signatures = await asyncio.to_thread(
+                lambda: [(row.id, compute_signature(row.title, row.content)) for row in rows]
+            )
+            table = Article.__table__
+            await db.execute(
+                update(table).where(table.c.id == bindparam("article_id")).values(minhash=bindparam("signature")),
+                [{"article_id": article_id, "signature": signature} for article_id, signature in signatures]
+            )
+            duplicates += len(await assign_clusters(db, signatures))
+            signed += len(rows)
+            await db.commit()
+    return signed, duplicates
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compute MinHash signatures and clusters for stored articles")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    signed, duplicates = await backfill_signatures(args.batch_size)
+    print(f"✅ Signed {signed} articles ({duplicates} near-duplicates) in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,76 +1,178 @@
 import os
-from typing import List, Optional
+import json
+import asyncio
+import importlib.util
+from typing import List, Dict, Optional, Tuple
+import httpx
 from openai import AsyncOpenAI
 from dotenv import load_dotenv
+from backend.services.ai_cache import AICache
+from backend.services.tags import normalize_tags
+from backend.services.token_budget import TokenBudget, count_tokens, fit_to_budget, token_budget
 
 load_dotenv()
 
+# Bump a version whenever its prompt changes so stale cached responses are ignored
+PROMPT_VERSIONS = {
+    "summary": "v1",
+    "tags": "v1",
+    "caption": "v1",
+    "image_prompt": "v1",
+    "enrichment": "v1",
+    "embedding": "v1",
+}
+
+# HTTP/2 multiplexing needs the optional h2 package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
 class OpenAIService:
     """Service for OpenAI API interactions"""
     
-    def __init__(self):
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY environment variable is required")
-        self.client = AsyncOpenAI(api_key=api_key)
+    def __init__(self, client: Optional[AsyncOpenAI] = None, use_cache: bool = True, budget: Optional[TokenBudget] = None):
+        if client is None:
+            api_key = os.getenv("OPENAI_API_KEY")
+            if not api_key:
+                raise ValueError("OPENAI_API_KEY environment variable is required")
+            # One keep-alive pool shared by every call made through this service
+            http_client = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                timeout=httpx.Timeout(60.0, connect=5.0),
+                limits=httpx.Limits(
+                    max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", "100")),
+                    max_keepalive_connections=20
+                )
+            )
+            client = AsyncOpenAI(api_key=api_key, http_client=http_client)
+        self.client = client
         self.model = "gpt-4-turbo-preview"  # or "gpt-3.5-turbo" for faster/cheaper
         self.embedding_model = "text-embedding-3-small"  # or "text-embedding-ada-002"
+        self.prompt_max_tokens = int(os.getenv("OPENAI_PROMPT_MAX_TOKENS", "1000"))  # Article text per completion
+        self.embedding_max_tokens = int(os.getenv("OPENAI_EMBEDDING_MAX_TOKENS", "8000"))  # Model limit is 8191
+        self.embedding_batch_size = 256  # Inputs per embeddings request (API max is 2048)
+        self.embedding_batch_max_tokens = 100000  # Tokens per embeddings request
+        # Rate limits and usage are shared by every service in the process
+        self.budget = budget or token_budget
+        enabled = use_cache and os.getenv("AI_CACHE_ENABLED", "true").lower() == "true"
+        self.cache: Optional[AICache] = AICache() if enabled else None
+    
+    def _cache_key(self, kind: str, model: str, *parts: str) -> str:
+        return AICache.make_key(kind, model, PROMPT_VERSIONS[kind], *parts)
+    
+    async def _cache_get(self, key: str):
+        if self.cache is None:
+            return None
+        return await self.cache.get(key)
+    
+    async def _cache_set(self, key: str, kind: str, value):
+        if self.cache is not None:
+            await self.cache.set(key, kind, value)
+    
+    def _fit_content(self, title: str, content: str) -> str:
+        """Article text within prompt_max_tokens (lead + key paragraphs)"""
+        return fit_to_budget(content or "", self.prompt_max_tokens, self.model, title)
+    
+    async def _complete(self, kind: str, system: str, prompt: str, max_tokens: int, **kwargs) -> str:
+        """Send one chat completion within the token budget and account for its usage"""
+        messages = [
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt}
+        ]
+        # Message framing adds a few tokens per message
+        prompt_tokens = sum(count_tokens(message["content"], self.model) + 4 for message in messages)
+        reserved = prompt_tokens + max_tokens
+        await self.budget.reserve(self.model, reserved)
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=max_tokens,
+                **kwargs
+            )
+        except Exception:
+            # Failed requests (429, timeouts, 5xx) give their reservation back
+            self.budget.release(self.model, reserved)
+            raise
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self.budget.record(kind, self.model, reserved, usage.prompt_tokens + max_tokens, usage.prompt_tokens, usage.completion_tokens)
+        else:
+            content = response.choices[0].message.content or ""
+            self.budget.record(kind, self.model, reserved, reserved, prompt_tokens, count_tokens(content, self.model), estimated=True)
+        return response.choices[0].message.content
     
     async def generate_summary(self, title: str, content: str) -> str:
         """Generate a concise summary of the article"""
+        content = self._fit_content(title, content)
+        cache_key = self._cache_key("summary", self.model, title, content)
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         prompt = f"""Write a concise, informative summary of the following news article in 2-3 sentences.
 
 Title: {title}
 
-Content: {content[:2000]}
+Content: {content}
 
 Summary:"""
         
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a professional news summarizer. Create clear, concise summaries."},
-                    {"role": "user", "content": prompt}
-                ],
+            text = await self._complete(
+                "summary",
+                "You are a professional news summarizer. Create clear, concise summaries.",
+                prompt,
                 max_tokens=200,
                 temperature=0.7
             )
-            return response.choices[0].message.content.strip()
+            summary = text.strip()
+            await self._cache_set(cache_key, "summary", summary)
+            return summary
         except Exception as e:
             print(f"Error generating summary: {e}")
             return f"Summary of: {title}"
     
     async def generate_tags(self, title: str, content: str) -> List[str]:
         """Generate SEO tags/keywords for the article"""
+        content = self._fit_content(title, content)
+        cache_key = self._cache_key("tags", self.model, title, content)
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            return normalize_tags(cached)
+        
         prompt = f"""Extract 5-10 relevant keywords/tags for this news article. Return only a comma-separated list of tags, no explanations.
 
 Title: {title}
 
-Content: {content[:2000]}
+Content: {content}
 
 Tags:"""
         
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an SEO expert. Extract relevant keywords and tags."},
-                    {"role": "user", "content": prompt}
-                ],
+            text = await self._complete(
+                "tags",
+                "You are an SEO expert. Extract relevant keywords and tags.",
+                prompt,
                 max_tokens=100,
                 temperature=0.5
             )
-            tags_str = response.choices[0].message.content.strip()
-            # Parse comma-separated tags
-            tags = [tag.strip() for tag in tags_str.split(",") if tag.strip()]
-            return tags[:10]  # Limit to 10 tags
+            tags_str = text.strip()
+            # Parse comma-separated tags (lowercased and deduplicated)
+            tags = normalize_tags(tags_str.split(","))
+            tags = tags[:10]  # Limit to 10 tags
+            await self._cache_set(cache_key, "tags", tags)
+            return tags
         except Exception as e:
             print(f"Error generating tags: {e}")
             return []
     
     async def generate_caption(self, title: str, content: str) -> str:
         """Generate an engaging social media caption"""
+        content = self._fit_content(title, content)
+        cache_key = self._cache_key("caption", self.model, title, content)
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         prompt = f"""Create an engaging social media caption for this news article. Make it:
 - 1-2 sentences
 - Attention-grabbing
@@ -79,27 +181,33 @@ Tags:"""
 
 Title: {title}
 
-Content: {content[:2000]}
+Content: {content}
 
 Caption:"""
         
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a social media content creator. Write engaging captions."},
-                    {"role": "user", "content": prompt}
-                ],
+            text = await self._complete(
+                "caption",
+                "You are a social media content creator. Write engaging captions.",
+                prompt,
                 max_tokens=150,
                 temperature=0.8
             )
-            return response.choices[0].message.content.strip()
+            caption = text.strip()
+            await self._cache_set(cache_key, "caption", caption)
+            return caption
         except Exception as e:
             print(f"Error generating caption: {e}")
             return f"Check out: {title}"
     
     async def generate_image_prompt(self, title: str, content: str) -> str:
         """Generate a detailed image prompt for DALL·E"""
+        content = self._fit_content(title, content)
+        cache_key = self._cache_key("image_prompt", self.model, title, content)
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
         prompt = f"""Create a detailed, vivid image generation prompt for DALL·E based on this news article. The prompt should:
 - Be specific and descriptive
 - Include visual elements, style, and mood
@@ -108,59 +216,234 @@ Caption:"""
 
 Title: {title}
 
-Content: {content[:2000]}
+Content: {content}
 
 Image Prompt:"""
         
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are an expert at creating detailed image generation prompts."},
-                    {"role": "user", "content": prompt}
-                ],
+            text = await self._complete(
+                "image_prompt",
+                "You are an expert at creating detailed image generation prompts.",
+                prompt,
                 max_tokens=150,
                 temperature=0.7
             )
-            return response.choices[0].message.content.strip()
+            image_prompt = text.strip()
+            await self._cache_set(cache_key, "image_prompt", image_prompt)
+            return image_prompt
         except Exception as e:
             print(f"Error generating image prompt: {e}")
             return f"News article illustration about {title}"
     
+    async def generate_enrichment(self, title: str, content: str) -> Dict:
+        """
+        Generate summary, tags, caption and image prompt in a single JSON completion
+
+        Falls back to the per-field methods if the structured response can't be parsed.
+
+        Returns:
+            Dictionary with summary, tags, caption and image_prompt keys
+        """
+        fitted = self._fit_content(title, content)
+        cache_key = self._cache_key("enrichment", self.model, title, fitted)
+        cached = await self._cache_get(cache_key)
+        if cached is not None:
+            return {**cached, "tags": normalize_tags(cached.get("tags"))}
+        
+        prompt = f"""Analyze the following news article and return a JSON object with exactly these keys:
+- "summary": a concise, informative summary in 2-3 sentences
+- "tags": a list of 5-10 relevant SEO keywords/tags
+- "caption": an engaging, attention-grabbing 1-2 sentence social media caption with 3-5 relevant hashtags, suitable for Twitter, Facebook, LinkedIn
+- "image_prompt": a detailed, vivid 1-2 sentence DALL·E prompt for a news thumbnail, including visual elements, style, and mood
+
+Title: {title}
+
+Content: {fitted}
+
+JSON:"""
+        
+        try:
+            text = await self._complete(
+                "enrichment",
+                "You are a professional news editor, SEO expert and social media content creator. Respond only with valid JSON.",
+                prompt,
+                max_tokens=600,
+                temperature=0.7,
+                response_format={"type": "json_object"}
+            )
+            data = json.loads(text)
+            
+            tags = data.get("tags") or []
+            if isinstance(tags, str):
+                tags = tags.split(",")
+            tags = normalize_tags(tags)
+            
+            enrichment = {
+                "summary": str(data.get("summary") or "").strip(),
+                "tags": tags[:10],  # Limit to 10 tags
+                "caption": str(data.get("caption") or "").strip(),
+                "image_prompt": str(data.get("image_prompt") or "").strip()
+            }
+        except Exception as e:
+            print(f"Error generating structured enrichment, falling back to per-field calls: {e}")
+            summary, tags, caption, image_prompt = await asyncio.gather(
+                self.generate_summary(title, content),
+                self.generate_tags(title, content),
+                self.generate_caption(title, content),
+                self.generate_image_prompt(title, content)
+            )
+            return {
+                "summary": summary,
+                "tags": tags,
+                "caption": caption,
+                "image_prompt": image_prompt
+            }
+        
+        # Fill any field the model left empty with the dedicated call
+        missing = [key for key, value in enrichment.items() if not value]
+        if missing:
+            generators = {
+                "summary": self.generate_summary,
+                "tags": self.generate_tags,
+                "caption": self.generate_caption,
+                "image_prompt": self.generate_image_prompt
+            }
+            values = await asyncio.gather(*(generators[key](title, content) for key in missing))
+            enrichment.update(zip(missing, values))
+        else:
+            await self._cache_set(cache_key, "enrichment", enrichment)
+        
+        return enrichment
+    
+    async def enrich_article(self, title: str, content: str) -> Dict:
+        """
+        Run the structured enrichment completion and the embedding call concurrently
+        
+        Returns:
+            Dictionary with summary, tags, caption, image_prompt and embedding keys
+        """
+        enrichment, embedding = await asyncio.gather(
+            self.generate_enrichment(title, content),
+            self.generate_embedding(title + " " + content)
+        )
+        enrichment["embedding"] = embedding
+        return enrichment
+    
+    def _fit_embedding_input(self, text: str) -> str:
+        """Embedding input within embedding_max_tokens (lead + key paragraphs)"""
+        return fit_to_budget(text, self.embedding_max_tokens, self.embedding_model) or " "
+    
     async def generate_embedding(self, text: str) -> List[float]:
         """Generate embedding vector for text (1024 dimensions for Pinecone compatibility)"""
         try:
-            # Truncate text if too long (embedding models have token limits)
-            max_chars = 8000  # Safe limit for most embedding models
-            text = text[:max_chars]
+            # Fit text to the embedding model's token limit
+            text = self._fit_embedding_input(text)
+            cache_key = self._cache_key("embedding", self.embedding_model, text)
+            cached = await self._cache_get(cache_key)
+            if cached is not None:
+                return cached
             
-            # Use text-embedding-3-small with dimension reduction to 1024
-            # If dimension parameter is not supported, we'll use the full embedding and truncate
-            try:
-                response = await self.client.embeddings.create(
-                    model="text-embedding-3-small",
-                    input=text,
-                    dimensions=1024  # Match Pinecone index dimension
-                )
-                return response.data[0].embedding
-            except Exception as dim_error:
-                # Fallback: use default embedding and truncate/pad to 1024
-                print(f"Warning: Could not set dimensions to 1024, using default: {dim_error}")
-                response = await self.client.embeddings.create(
-                    model="text-embedding-3-small",
-                    input=text
-                )
-                embedding = response.data[0].embedding
+            embedding = (await self._create_embeddings([text]))[0]
+            await self._cache_set(cache_key, "embedding", embedding)
+            return embedding
+        except Exception as e:
+            print(f"Error generating embedding: {e}")
+            raise
+    
+    async def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for many texts, packing several inputs into each request
+        
+        Inputs are grouped so that each request stays under embedding_batch_size
+        inputs and embedding_batch_max_tokens tokens.
+        
+        Args:
+            texts: Texts to embed
+        
+        Returns:
+            Embedding vectors in the same order as texts
+        """
+        try:
+            # Only texts without a cached vector are sent to the API
+            texts = [self._fit_embedding_input(text) for text in texts]
+            cache_keys = [self._cache_key("embedding", self.embedding_model, text) for text in texts]
+            embeddings: List[Optional[List[float]]] = [await self._cache_get(key) for key in cache_keys]
+            missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+            
+            created: List[List[float]] = []
+            for batch, tokens in self._pack_embedding_batches([texts[i] for i in missing]):
+                created.extend(await self._create_embeddings(batch, tokens))
+            
+            for i, embedding in zip(missing, created):
+                embeddings[i] = embedding
+                await self._cache_set(cache_keys[i], "embedding", embedding)
+            return embeddings
+        except Exception as e:
+            print(f"Error generating embeddings: {e}")
+            raise
+    
+    def _pack_embedding_batches(self, texts: List[str]) -> List[Tuple[List[str], int]]:
+        """Split fitted texts into request-sized (batch, token count) pairs"""
+        batches: List[Tuple[List[str], int]] = []
+        batch: List[str] = []
+        batch_tokens = 0
+        for text in texts:
+            tokens = count_tokens(text, self.embedding_model)
+            if batch and (len(batch) >= self.embedding_batch_size or batch_tokens + tokens > self.embedding_batch_max_tokens):
+                batches.append((batch, batch_tokens))
+                batch = []
+                batch_tokens = 0
+            batch.append(text)
+            batch_tokens += tokens
+        if batch:
+            batches.append((batch, batch_tokens))
+        return batches
+    
+    async def _embeddings_request(self, inputs: List[str], tokens: int, **kwargs):
+        """Send one embeddings request within the token budget and account for its usage"""
+        await self.budget.reserve(self.embedding_model, tokens)
+        try:
+            response = await self.client.embeddings.create(model=self.embedding_model, input=inputs, **kwargs)
+        except Exception:
+            # Nothing was embedded; a retry reserves again
+            self.budget.release(self.embedding_model, tokens)
+            raise
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            self.budget.record("embedding", self.embedding_model, tokens, usage.prompt_tokens, usage.prompt_tokens)
+        else:
+            self.budget.record("embedding", self.embedding_model, tokens, tokens, tokens, estimated=True)
+        return response
+
+    async def _create_embeddings(self, inputs: List[str], tokens: Optional[int] = None) -> List[List[float]]:
+        """Embed inputs within the token budget and return 1024-dimension vectors in input order"""
+        if tokens is None:
+            tokens = sum(count_tokens(text, self.embedding_model) for text in inputs)
+        # Use text-embedding-3-small with dimension reduction to 1024
+        # If dimension parameter is not supported, we'll use the full embedding and truncate
+        try:
+            response = await self._embeddings_request(
+                inputs,
+                tokens,
+                dimensions=1024  # Match Pinecone index dimension
+            )
+            data = sorted(response.data, key=lambda item: item.index)
+            embeddings = [item.embedding for item in data]
+        except Exception as dim_error:
+            # Fallback: use default embedding and truncate/pad to 1024
+            print(f"Warning: Could not set dimensions to 1024, using default: {dim_error}")
+            response = await self._embeddings_request(inputs, tokens)
+            embeddings = []
+            for item in sorted(response.data, key=lambda item: item.index):
+                embedding = item.embedding
                 # Truncate or pad to 1024 dimensions
                 if len(embedding) > 1024:
-                    return embedding[:1024]
+                    embedding = embedding[:1024]
                 elif len(embedding) < 1024:
                     # Pad with zeros (not ideal, but works)
-                    return embedding + [0.0] * (1024 - len(embedding))
-                return embedding
-        except Exception as e:
-            print(f"Error generating embedding: {e}")
-            raise
+                    embedding = embedding + [0.0] * (1024 - len(embedding))
+                embeddings.append(embedding)
+        return embeddings
     
     async def generate_image(self, prompt: str) -> Optional[str]:
         """Generate an image using DALL·E"""
@@ -174,6 +457,7 @@ Image Prompt:"""
                 quality="standard"
             )
             
+            self.budget.record_image("dall-e-3")
             if response and response.data and len(response.data) > 0:
                 image_url = response.data[0].url
                 print(f"✅ DALL·E image generated successfully: {image_url[:50]}...")
@@ -186,4 +470,8 @@ Image Prompt:"""
             import traceback
             traceback.print_exc()
             return None
-
+    
+    async def aclose(self):
+        """Close the pooled HTTP connections"""
+        if hasattr(self.client, "close"):
+            await self.client.close()
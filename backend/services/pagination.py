@@ -0,0 +1,73 @@
+"""
+Keyset pagination and cached totals for the article list
+Cursors are opaque, URL-safe tokens encoding the (published_date, id) of the
+last row on a page; the next page is a range scan on the composite
+(published_date, id) index instead of an OFFSET.
+"""
+import base64
+import json
+import os
+from datetime import datetime
+from typing import Awaitable, Callable, Hashable, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+from backend.models import Article
+from backend.services.search_cache import LRUCache
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor token can't be decoded"""
+
+
+def encode_cursor(published_date: Optional[datetime], article_id: int) -> str:
+    payload = json.dumps([published_date.isoformat() if published_date else None, article_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        published_date, article_id = json.loads(payload)
+        return (datetime.fromisoformat(published_date) if published_date else None), int(article_id)
+    except Exception:
+        raise InvalidCursor("Invalid cursor")
+
+
+def after_cursor(cursor: str):
+    """
+    Filter for rows after a cursor in (published_date DESC, id DESC) order
+
+    NULL published dates sort last (MySQL and SQLite order NULL lowest).
+    """
+    published_date, article_id = decode_cursor(cursor)
+    if published_date is None:
+        return and_(Article.published_date.is_(None), Article.id < article_id)
+    return or_(
+        Article.published_date < published_date,
+        and_(Article.published_date == published_date, Article.id < article_id),
+        Article.published_date.is_(None)
+    )
+
+
+class CountCache:
+    """Short-TTL cache of filtered list totals so COUNT(*) doesn't run on every page"""
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: Optional[float] = None):
+        self._counts = LRUCache(
+            max_entries,
+            ttl_seconds=ttl_seconds if ttl_seconds is not None else float(os.getenv("ARTICLE_COUNT_TTL", "30"))
+        )
+
+    async def get(self, key: Hashable, count: Callable[[], Awaitable[int]]) -> int:
+        total = self._counts.get(key)
+        if total is None:
+            total = await count()
+            self._counts.set(key, total)
+        return total
+
+    def clear(self):
+        self._counts.clear()
+
+
+count_cache = CountCache()
@@ -0,0 +1,187 @@
+"""
+Chunked passage embeddings for long articles
+An article's own vector embeds at most OPENAI_EMBEDDING_MAX_TOKENS of its
+text, and one vector averages everything it covers. With
+CHUNKED_EMBEDDINGS=true, articles longer than one passage also get a vector
+per overlapping passage (article_{id}#p{n}, each prefixed with the title)
+next to that vector. Searches request a bounded number of extra vectors and
+fold passage hits into their article with its best score (max-sim, see
+VectorStore.aggregate_matches).
+
+Usage (passages for articles embedded before chunked mode was enabled):
+    python backend/services/passages.py [--batch-size 200]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List, Sequence
+
+from sqlalchemy import select
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.models import AIMetadata, Article
+from backend.services.openai_service import OpenAIService
+from backend.services.token_budget import count_tokens, truncate_tokens
+from backend.services.vector_store import CHUNKED_EMBEDDINGS, EMBEDDING_MAX_PASSAGES, VectorStore, create_vector_store
+
+EMBEDDING_CHUNK_TOKENS = int(os.getenv("EMBEDDING_CHUNK_TOKENS", "512"))
+EMBEDDING_CHUNK_OVERLAP = int(os.getenv("EMBEDDING_CHUNK_OVERLAP", "64"))
+MIN_WINDOW_TOKENS = 64  # Left for text when a long title eats the passage budget
+
+
+def _split_word(word: str, max_tokens: int, model: str) -> List[str]:
+    """Cut a "word" longer than max_tokens (unspaced CJK text, a pasted blob) into pieces"""
+    pieces = []
+    while word:
+        # An ASCII run is dropped whole by truncate_tokens; cut it by characters
+        piece = truncate_tokens(word, max_tokens, model) or word[:max_tokens * 3]
+        pieces.append(piece)
+        word = word[len(piece):].lstrip()
+    return pieces
+
+
+def split_passages(
+    title: str,
+    content: str,
+    model: str,
+    chunk_tokens: int = EMBEDDING_CHUNK_TOKENS,
+    overlap: int = EMBEDDING_CHUNK_OVERLAP,
+    max_passages: int = EMBEDDING_MAX_PASSAGES
+) -> List[str]:
+    """
+    Split an article into overlapping, word-aligned passages
+
+    Args:
+        title: Article title (prefixed to every passage)
+        content: Article body
+        model: Embedding model whose tokenizer sizes the passages
+        chunk_tokens: Tokens per passage, title included
+        overlap: Tokens each passage repeats from the previous one
+        max_passages: Passages kept per article (the rest of the text is dropped)
+
+    Returns:
+        Passage texts, or [] if the article fits in one passage (its own
+        vector already covers it)
+    """
+    if not content or count_tokens(f"{title}\n\n{content}", model) <= chunk_tokens:
+        return []
+    window = max(MIN_WINDOW_TOKENS, chunk_tokens - count_tokens(title, model) - 2)
+    overlap = min(overlap, window // 2)
+    words = []
+    for word in content.split():
+        words.extend(_split_word(word, window // 2, model) if len(word) > window else [word])
+    costs = [count_tokens(" " + word, model) for word in words]
+
+    passages = []
+    start = 0
+    while start < len(words) and len(passages) < max_passages:
+        end = start
+        used = 0
+        # At least one word per passage, even one longer than the window
+        while end < len(words) and (end == start or used + costs[end] <= window):
+            used += costs[end]
+            end += 1
+        passages.append(f"{title}\n\n{' '.join(words[start:end])}")
+        if end >= len(words):
+            break
+        # Step back over at most overlap tokens, always moving forward
+        next_start = end
+        repeated = 0
+        while next_start - 1 > start and repeated + costs[next_start - 1] <= overlap:
+            next_start -= 1
+            repeated += costs[next_start]
+        start = next_start
+    return passages
+
+
+async def embed_passages(articles: Sequence[Article], openai_service: OpenAIService, vector_store: VectorStore) -> int:
+    """
+    Embed and store the passage vectors of articles (no-op unless CHUNKED_EMBEDDINGS)
+
+    Passages left over from a longer earlier version of an article are deleted.
+
+    Returns:
+        Number of passage vectors stored
+    """
+    if not CHUNKED_EMBEDDINGS:
+        return 0
+    items = []
+    texts = []
+    counts = {}
+    for article in articles:
+        passages = split_passages(article.title, article.content or "", openai_service.embedding_model)
+        counts[article.id] = len(passages)
+        for number, text in enumerate(passages):
+            texts.append(text)
+            items.append({
+                "article_id": article.id,
+                "passage": number,
+                "metadata": {
+                    "title": article.title,
+                    "article_id": article.id,
+                    "source_id": article.source_id
+                }
+            })
+    if items:
+        # Packed into as few embeddings requests as the batch limits allow
+        embeddings = await openai_service.generate_embeddings(texts)
+        for item, embedding in zip(items, embeddings):
+            item["embedding"] = embedding
+        await vector_store.upsert_embeddings(items)
+    await asyncio.gather(*(vector_store.delete_passages(article_id, keep=count) for article_id, count in counts.items()))
+    return len(items)
+
+
+async def backfill_passages(batch_size: int = 200) -> int:
+    """
+    Store passage vectors for every article that already has an embedding
+
+    Returns:
+        Number of passage vectors stored
+    """
+    from backend.database import AsyncSessionLocal
+
+    openai_service = OpenAIService()
+    vector_store = create_vector_store()
+    stored = 0
+    last_id = 0
+    try:
+        while True:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(Article).join(AIMetadata, AIMetadata.article_id == Article.id)
+                    .where(Article.id > last_id, AIMetadata.embedding_id.isnot(None))
+                    .order_by(Article.id).limit(batch_size)
+                )
+                articles = result.scalars().all()
+            if not articles:
+                break
+            last_id = articles[-1].id
+            stored += await embed_passages(articles, openai_service, vector_store)
+            print(f"Up to article {last_id}: {stored} passage vectors")
+    finally:
+        await openai_service.aclose()
+        await vector_store.aclose()
+    return stored
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Embed passages of stored articles (needs CHUNKED_EMBEDDINGS=true)")
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    if not CHUNKED_EMBEDDINGS:
+        print("⚠️  CHUNKED_EMBEDDINGS is not enabled, nothing to do")
+        return
+    start = time.perf_counter()
+    stored = await backfill_passages(args.batch_size)
+    print(f"✅ Stored {stored} passage vectors in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
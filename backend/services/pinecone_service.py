@@ -1,11 +1,20 @@
 import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import List, Dict, Optional
 from pinecone import Pinecone, ServerlessSpec
 from dotenv import load_dotenv
+from backend.services.vector_store import VectorStore
 
 load_dotenv()
 
-class PineconeService:
+# The Pinecone client is synchronous; its calls run on this bounded pool so a
+# slow query never blocks the event loop
+PINECONE_MAX_WORKERS = int(os.getenv("PINECONE_MAX_WORKERS", "8"))
+_executor = ThreadPoolExecutor(max_workers=PINECONE_MAX_WORKERS, thread_name_prefix="pinecone")
+
+class PineconeService(VectorStore):
     """Service for Pinecone vector database operations"""
     
     def __init__(self):
@@ -13,7 +22,8 @@ class PineconeService:
         if not api_key:
             raise ValueError("PINECONE_API_KEY environment variable is required")
         
-        self.pc = Pinecone(api_key=api_key)
+        # Size the client's keep-alive pool to match the worker threads
+        self.pc = Pinecone(api_key=api_key, pool_threads=PINECONE_MAX_WORKERS)
         # Get index name from environment variable (required)
         provided_index = os.getenv("PINECONE_INDEX_NAME")
         if not provided_index:
@@ -66,6 +76,11 @@ class PineconeService:
                 print(f"⚠️  Pinecone operations will fail. Please create index manually: {self.index_name}")
                 raise ValueError(f"Pinecone index {self.index_name} not found and could not be created: {create_error}")
     
+    async def _run(self, func, *args, **kwargs):
+        """Run a blocking Pinecone client call on the shared thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, partial(func, *args, **kwargs))
+    
     async def upsert_embedding(
         self,
         article_id: int,
@@ -83,7 +98,7 @@ class PineconeService:
         Returns:
             Vector ID (embedding_id)
         """
-        vector_id = f"article_{article_id}"
+        vector_id = self.vector_id(article_id)
         
         # Prepare metadata
         if metadata is None:
@@ -91,7 +106,8 @@ class PineconeService:
         metadata["article_id"] = article_id
         
         # Upsert to Pinecone
-        self.index.upsert(
+        await self._run(
+            self.index.upsert,
             vectors=[{
                 "id": vector_id,
                 "values": embedding,
@@ -101,10 +117,39 @@ class PineconeService:
         
         return vector_id
     
+    async def upsert_embeddings(self, batch: List[Dict], chunk_size: int = 100) -> List[str]:
+        """
+        Store or update many embeddings, writing them to Pinecone in chunks
+        
+        Args:
+            batch: Items with article_id, embedding and optional metadata and passage keys
+            chunk_size: Vectors per upsert request
+        
+        Returns:
+            Vector IDs (embedding_ids) in the same order as batch
+        """
+        vectors = []
+        for item in batch:
+            # Pinecone rejects null metadata values, which would fail the whole chunk
+            metadata = {key: value for key, value in (item.get("metadata") or {}).items() if value is not None}
+            metadata["article_id"] = item["article_id"]
+            if item.get("passage") is not None:
+                metadata["passage"] = item["passage"]
+            vectors.append({
+                "id": self.item_vector_id(item),
+                "values": item["embedding"],
+                "metadata": metadata
+            })
+        
+        for start in range(0, len(vectors), chunk_size):
+            await self._run(self.index.upsert, vectors=vectors[start:start + chunk_size])
+        
+        return [vector["id"] for vector in vectors]
+    
     async def get_embedding(self, embedding_id: str) -> Optional[List[float]]:
         """Retrieve embedding vector by ID"""
         try:
-            result = self.index.fetch(ids=[embedding_id])
+            result = await self._run(self.index.fetch, ids=[embedding_id])
             if embedding_id in result["vectors"]:
                 return result["vectors"][embedding_id]["values"]
             return None
@@ -112,6 +157,33 @@ class PineconeService:
             print(f"Error fetching embedding: {e}")
             return None
     
+    async def get_embeddings(self, embedding_ids: List[str], chunk_size: int = 100) -> Dict[str, List[float]]:
+        """Retrieve several embedding vectors, one fetch per chunk of IDs"""
+        chunks = [embedding_ids[start:start + chunk_size] for start in range(0, len(embedding_ids), chunk_size)]
+        try:
+            results = await asyncio.gather(*(self._run(self.index.fetch, ids=chunk) for chunk in chunks))
+        except Exception as e:
+            print(f"Error fetching embeddings: {e}")
+            return {}
+        return {
+            embedding_id: vector["values"]
+            for result in results for embedding_id, vector in result["vectors"].items()
+        }
+    
+    def _matches(self, results) -> List[Dict]:
+        """Convert a Pinecone query response into result dicts"""
+        similar_articles = []
+        for match in results["matches"]:
+            metadata = match.get("metadata") or {}
+            article_id = metadata.get("article_id")
+            if article_id:
+                similar_articles.append({
+                    "article_id": int(article_id),
+                    "score": match["score"],
+                    "metadata": metadata
+                })
+        return similar_articles
+    
     async def search_similar(
         self,
         embedding: List[float],
@@ -122,51 +194,60 @@ class PineconeService:
         """
         Search for similar articles using vector similarity
         
+        In chunked mode up to search_k(top_k) vectors are requested and
+        passage hits count as their article's best score (max-sim).
+        
         Args:
             embedding: Query embedding vector
             top_k: Number of results to return
-            exclude_ids: Article IDs to exclude from results
+            exclude_ids: Article IDs to exclude from results (filtered server-side)
             filter_dict: Additional metadata filters
         
         Returns:
             List of results with article_id and score
         """
         try:
-            # Build filter
-            query_filter = filter_dict or {}
-            if exclude_ids:
-                # Pinecone doesn't support NOT directly, so we'll filter after
-                pass
-            
-            # Perform search
-            results = self.index.query(
+            results = await self._run(
+                self.index.query,
                 vector=embedding,
-                top_k=top_k * 2 if exclude_ids else top_k,  # Get more to filter
+                top_k=self.search_k(top_k),
                 include_metadata=True,
-                filter=query_filter if query_filter else None
+                filter=self.exclusion_filter(exclude_ids, filter_dict)
             )
+            return self.aggregate_matches(self._matches(results), top_k)
             
-            # Process results
-            similar_articles = []
-            for match in results["matches"]:
-                article_id = match["metadata"].get("article_id")
-                
-                # Skip excluded IDs
-                if exclude_ids and article_id in exclude_ids:
-                    continue
-                
-                if article_id:
-                    similar_articles.append({
-                        "article_id": article_id,
-                        "score": match["score"],
-                        "metadata": match["metadata"]
-                    })
-                
-                # Stop when we have enough results
-                if len(similar_articles) >= top_k:
-                    break
-            
-            return similar_articles
+        except Exception as e:
+            print(f"Error searching similar articles: {e}")
+            return []
+    
+    async def search_by_id(
+        self,
+        vector_id: str,
+        top_k: int = 10,
+        exclude_ids: Optional[List[int]] = None,
+        filter_dict: Optional[Dict] = None
+    ) -> List[Dict]:
+        """
+        Search using a stored vector as the query, without fetching it first
+        
+        Args:
+            vector_id: ID of the stored query vector
+            top_k: Number of results to return
+            exclude_ids: Article IDs to exclude from results (filtered server-side)
+            filter_dict: Additional metadata filters
+        
+        Returns:
+            List of results with article_id and score
+        """
+        try:
+            results = await self._run(
+                self.index.query,
+                id=vector_id,
+                top_k=self.search_k(top_k),
+                include_metadata=True,
+                filter=self.exclusion_filter(exclude_ids, filter_dict)
+            )
+            return self.aggregate_matches(self._matches(results), top_k)
             
         except Exception as e:
             print(f"Error searching similar articles: {e}")
@@ -174,13 +255,17 @@ class PineconeService:
     
     async def delete_embedding(self, embedding_id: str):
         """Delete embedding from Pinecone"""
+        await self.delete_embeddings([embedding_id])
+    
+    async def delete_embeddings(self, embedding_ids: List[str]):
+        """Delete several embeddings in one request (unknown IDs are ignored)"""
         try:
-            self.index.delete(ids=[embedding_id])
+            await self._run(self.index.delete, ids=embedding_ids)
         except Exception as e:
             print(f"Error deleting embedding: {e}")
     
-    async def delete_by_article_id(self, article_id: int):
-        """Delete embedding by article ID"""
-        embedding_id = f"article_{article_id}"
-        await self.delete_embedding(embedding_id)
-
+    async def aclose(self):
+        """Close the index connection pool"""
+        index = getattr(self, "index", None)
+        if index is not None and hasattr(index, "close"):
+            await self._run(index.close)
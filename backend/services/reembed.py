@@ -0,0 +1,129 @@
+"""
+Bulk re-embed command
+Embeds every article that has no AIMetadata.embedding_id yet, packing many
+articles into each embeddings request and upserting vectors in chunks.
+
+Usage:
+    python backend/services/reembed.py [--batch-size 500] [--limit N]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.database import AsyncSessionLocal
+from backend.models import Article, AIMetadata
+from backend.services.openai_service import OpenAIService
+from backend.services.passages import embed_passages
+from backend.services.story_clusters import story_index
+from backend.services.vector_store import VectorStore, create_vector_store
+
+
+async def _articles_missing_embeddings(db: AsyncSession, after_id: int, batch_size: int):
+    """Next page of articles without a stored embedding, ordered by ID"""
+    result = await db.execute(
+        select(Article).outerjoin(
+            AIMetadata, AIMetadata.article_id == Article.id
+        ).where(
+            Article.id > after_id,
+            or_(AIMetadata.id.is_(None), AIMetadata.embedding_id.is_(None))
+        ).order_by(Article.id).limit(batch_size)
+    )
+    return result.scalars().all()
+
+
+async def reembed_articles(
+    batch_size: int = 500,
+    limit: Optional[int] = None,
+    openai_service: Optional[OpenAIService] = None,
+    vector_store: Optional[VectorStore] = None
+) -> int:
+    """
+    Generate and store embeddings for all articles lacking an embedding_id
+
+    Args:
+        batch_size: Articles loaded and embedded per round
+        limit: Stop after this many articles (optional)
+        openai_service: Service to use instead of creating one (optional)
+        vector_store: Vector store to use instead of creating one (optional)
+
+    Returns:
+        Number of articles embedded
+    """
+    openai_service = openai_service or OpenAIService()
+    vector_store = vector_store or create_vector_store()
+    db = AsyncSessionLocal()
+
+    total = 0
+    last_id = 0
+    start = time.perf_counter()
+    try:
+        while limit is None or total < limit:
+            size = batch_size if limit is None else min(batch_size, limit - total)
+            articles = await _articles_missing_embeddings(db, last_id, size)
+            if not articles:
+                break
+            last_id = articles[-1].id
+
+            embeddings = await openai_service.generate_embeddings(
+                [article.title + " " + (article.content or "") for article in articles]
+            )
+            embedding_ids = await vector_store.upsert_embeddings([
+                {
+                    "article_id": article.id,
+                    "embedding": embedding,
+                    "metadata": {
+                        "title": article.title,
+                        "article_id": article.id,
+                        "source_id": article.source_id
+                    }
+                }
+                for article, embedding in zip(articles, embeddings)
+            ])
+            # Passage vectors for long articles (chunked mode only)
+            await embed_passages(articles, openai_service, vector_store)
+
+            # Update or create AI metadata in one query per round
+            result = await db.execute(select(AIMetadata).where(
+                AIMetadata.article_id.in_([article.id for article in articles])
+            ))
+            existing = {metadata.article_id: metadata for metadata in result.scalars().all()}
+            for article, embedding_id in zip(articles, embedding_ids):
+                ai_metadata = existing.get(article.id)
+                if not ai_metadata:
+                    db.add(AIMetadata(article_id=article.id, embedding_id=embedding_id))
+                else:
+                    ai_metadata.embedding_id = embedding_id
+
+            # Streaming story clustering, in article order
+            await story_index.assign(db, list(zip(articles, embeddings)))
+            await db.commit()
+
+            total += len(articles)
+            elapsed = time.perf_counter() - start
+            print(f"Embedded {total} articles ({total / elapsed:.1f} articles/sec)")
+    except Exception as e:
+        print(f"Error re-embedding articles: {e}")
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
+
+    print(f"\nTotal articles embedded: {total}")
+    return total
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embed all articles that have no stored embedding")
+    parser.add_argument("--batch-size", type=int, default=500, help="Articles embedded per round")
+    parser.add_argument("--limit", type=int, default=None, help="Maximum number of articles to embed")
+    args = parser.parse_args()
+    asyncio.run(reembed_articles(batch_size=args.batch_size, limit=args.limit))
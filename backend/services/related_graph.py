@@ -0,0 +1,183 @@
+"""
+Precomputed related-articles graph
+Each embedded article stores its top-K nearest neighbours in
+AIMetadata.similarity_scores, so GET /articles/{id}/related is served from
+the database without a vector-store round trip. New articles also insert
+themselves into their neighbours' lists (cosine similarity is symmetric),
+and a periodic refresh recomputes lists that are missing or old.
+
+Usage (periodic refresh):
+    python backend/services/related_graph.py [--batch-size 200] [--max-age-hours 168]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.database import AsyncSessionLocal
+from backend.models import AIMetadata
+from backend.services.vector_store import VectorStore, create_vector_store
+
+RELATED_TOP_K = int(os.getenv("RELATED_TOP_K", "20"))
+RELATED_MAX_AGE_HOURS = float(os.getenv("RELATED_MAX_AGE_HOURS", "168"))
+
+
+async def find_neighbors(
+    vector_store: VectorStore,
+    article_id: int,
+    embedding: Optional[List[float]] = None,
+    top_k: int = RELATED_TOP_K
+) -> List[Dict]:
+    """
+    Nearest articles as [{"article_id", "score"}], best first
+
+    Queries with the given embedding, or by the article's stored vector ID
+    when no embedding is passed (no fetch round trip).
+    """
+    if embedding is not None:
+        results = await vector_store.search_similar(embedding=embedding, top_k=top_k, exclude_ids=[article_id])
+    else:
+        results = await vector_store.search_by_id(vector_store.vector_id(article_id), top_k=top_k, exclude_ids=[article_id])
+    return to_neighbors(results, article_id, top_k)
+
+
+def to_neighbors(results: List[Dict], article_id: int, top_k: int = RELATED_TOP_K) -> List[Dict]:
+    """Reduce vector-store results to the stored neighbour format"""
+    return [
+        {"article_id": result["article_id"], "score": round(float(result["score"]), 6)}
+        for result in results if result.get("article_id") is not None and result["article_id"] != article_id
+    ][:top_k]
+
+
+def stored_neighbors(ai_metadata: Optional[AIMetadata]) -> Optional[List[Dict]]:
+    """The precomputed neighbour list, or None if it was never computed"""
+    if ai_metadata is None or not ai_metadata.similarity_scores:
+        return None
+    return ai_metadata.similarity_scores.get("neighbors")
+
+
+def set_neighbors(ai_metadata: AIMetadata, neighbors: List[Dict], top_k: int = RELATED_TOP_K):
+    # Assign a new dict so the JSON column is marked dirty
+    ai_metadata.similarity_scores = {"neighbors": neighbors, "top_k": top_k}
+    ai_metadata.similarity_updated_at = datetime.utcnow()
+
+
+async def propagate_neighbors(
+    db: AsyncSession,
+    article_id: int,
+    neighbors: List[Dict],
+    top_k: int = RELATED_TOP_K
+) -> int:
+    """
+    Insert an article into its neighbours' lists where it ranks in their top-K
+
+    Args:
+        db: Database session (the caller commits)
+        article_id: Newly embedded article
+        neighbors: Its neighbour list from find_neighbors
+        top_k: List length to keep
+
+    Returns:
+        Number of neighbour lists changed
+    """
+    scores = {neighbor["article_id"]: neighbor["score"] for neighbor in neighbors}
+    if not scores:
+        return 0
+    result = await db.execute(select(AIMetadata).where(AIMetadata.article_id.in_(list(scores))))
+
+    changed = 0
+    for ai_metadata in result.scalars().all():
+        current = stored_neighbors(ai_metadata)
+        if current is None:
+            continue  # Computed in full by the periodic refresh
+        entries = [entry for entry in current if entry["article_id"] != article_id]
+        score = scores[ai_metadata.article_id]
+        if len(entries) >= top_k and score <= entries[-1]["score"]:
+            continue
+        entries.append({"article_id": article_id, "score": score})
+        entries.sort(key=lambda entry: entry["score"], reverse=True)
+        set_neighbors(ai_metadata, entries[:top_k], top_k)
+        changed += 1
+    return changed
+
+
+async def refresh_related_graph(
+    batch_size: int = 200,
+    max_age_hours: float = RELATED_MAX_AGE_HOURS,
+    vector_store: Optional[VectorStore] = None
+) -> int:
+    """
+    Recompute neighbour lists that are missing or older than max_age_hours
+
+    Args:
+        batch_size: Rows recomputed per transaction
+        max_age_hours: Lists computed before this age are refreshed
+        vector_store: Vector store to use instead of creating one (optional)
+
+    Returns:
+        Number of lists recomputed
+    """
+    vector_store = vector_store or create_vector_store()
+    cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
+    refreshed = 0
+    last_id = 0
+
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(AIMetadata).where(
+                    AIMetadata.id > last_id,
+                    AIMetadata.embedding_id.isnot(None),
+                    or_(AIMetadata.similarity_updated_at.is_(None), AIMetadata.similarity_updated_at < cutoff)
+                ).order_by(AIMetadata.id).limit(batch_size)
+            )
+            rows = result.scalars().all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+
+            # One concurrent query per row, by stored vector ID
+            results = await vector_store.search_many_by_id([
+                {"vector_id": ai_metadata.embedding_id, "top_k": RELATED_TOP_K, "exclude_ids": [ai_metadata.article_id]}
+                for ai_metadata in rows
+            ])
+            for ai_metadata, matches in zip(rows, results):
+                try:
+                    neighbors = to_neighbors(matches, ai_metadata.article_id)
+                    set_neighbors(ai_metadata, neighbors)
+                    await propagate_neighbors(db, ai_metadata.article_id, neighbors)
+                    refreshed += 1
+                except Exception as e:
+                    print(f"Error refreshing related articles for article {ai_metadata.article_id}: {e}")
+            await db.commit()
+
+    return refreshed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Recompute precomputed related-article lists")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--max-age-hours", type=float, default=RELATED_MAX_AGE_HOURS)
+    args = parser.parse_args()
+
+    vector_store = create_vector_store()
+    start = time.perf_counter()
+    try:
+        refreshed = await refresh_related_graph(args.batch_size, args.max_age_hours, vector_store)
+    finally:
+        await vector_store.aclose()
+    print(f"✅ Refreshed {refreshed} related-article lists in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
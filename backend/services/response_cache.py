@@ -0,0 +1,243 @@
+"""
+Response cache and conditional GET for article read endpoints
+Serialized responses are cached per route and query string together with an
+ETag and Last-Modified. Writes (CRUD, ingestion, AI processing) invalidate by
+bumping a generation number that is part of every key, so stale entries are
+never read and simply age out.
+
+Set RESPONSE_CACHE_URL=redis://... (needs the optional redis package) to share
+the cache and its invalidations between uvicorn workers and the cron job;
+otherwise each process keeps its own in-memory cache.
+"""
+import hashlib
+import importlib.util
+import json
+import os
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from backend.services.pagination import count_cache
+from backend.services.search_cache import LRUCache
+
+REDIS_AVAILABLE = importlib.util.find_spec("redis") is not None
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "body": self.body.decode("utf-8"),
+            "etag": self.etag,
+            "last_modified": self.last_modified.isoformat() if self.last_modified else None,
+        })
+
+    @classmethod
+    def from_json(cls, data: str) -> "CachedResponse":
+        value = json.loads(data)
+        return cls(
+            body=value["body"].encode("utf-8"),
+            etag=value["etag"],
+            last_modified=datetime.fromisoformat(value["last_modified"]) if value["last_modified"] else None
+        )
+
+
+class MemoryResponseCache:
+    """Per-process LRU backend"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self._entries = LRUCache(max_entries, ttl_seconds=ttl_seconds)
+        self._generation = 0
+
+    async def generation(self) -> int:
+        return self._generation
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: CachedResponse):
+        self._entries.set(key, value)
+
+    async def invalidate(self):
+        self._generation += 1
+        self._entries.clear()
+
+    async def aclose(self):
+        pass
+
+
+class RedisResponseCache:
+    """Shared backend: entries expire via TTL, invalidation is an INCR"""
+
+    GENERATION_KEY = "response_cache:generation"
+
+    def __init__(self, url: str, ttl_seconds: float):
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(url)
+        self.ttl_seconds = int(ttl_seconds)
+
+    async def generation(self) -> int:
+        return int(await self._redis.get(self.GENERATION_KEY) or 0)
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        data = await self._redis.get(f"response_cache:{key}")
+        return CachedResponse.from_json(data) if data else None
+
+    async def set(self, key: str, value: CachedResponse):
+        await self._redis.set(f"response_cache:{key}", value.to_json(), ex=self.ttl_seconds)
+
+    async def invalidate(self):
+        await self._redis.incr(self.GENERATION_KEY)
+
+    async def aclose(self):
+        await self._redis.close()
+
+
+class ResponseCache:
+    """Generation-keyed response cache with hit/miss counters"""
+
+    def __init__(self, backend=None, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv("RESPONSE_CACHE_TTL", "300"))
+        self.enabled = self.ttl_seconds > 0
+        if backend is None:
+            backend = self._create_backend(
+                max_entries if max_entries is not None else int(os.getenv("RESPONSE_CACHE_SIZE", "1000"))
+            )
+        self.backend = backend
+        self.counters = {"hits": 0, "misses": 0, "not_modified": 0, "invalidations": 0, "errors": 0}
+
+    def _create_backend(self, max_entries: int):
+        url = os.getenv("RESPONSE_CACHE_URL")
+        if url:
+            if REDIS_AVAILABLE:
+                try:
+                    backend = RedisResponseCache(url, self.ttl_seconds)
+                    print("✅ Response cache using shared backend")
+                    return backend
+                except Exception as e:
+                    print(f"⚠️  Shared response cache not available, using in-memory cache: {e}")
+            else:
+                print("⚠️  RESPONSE_CACHE_URL is set but the redis package is not installed; using in-memory cache")
+        return MemoryResponseCache(max_entries, self.ttl_seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "enabled": self.enabled, "backend": type(self.backend).__name__}
+
+    async def _key(self, request: Request) -> str:
+        query = "&".join(f"{name}={value}" for name, value in sorted(request.query_params.multi_items()))
+        return f"{await self.backend.generation()}:{request.url.path}?{query}"
+
+    async def get_or_build(
+        self,
+        request: Request,
+        build: Callable[[], Awaitable[Tuple[Any, Optional[datetime]]]]
+    ) -> CachedResponse:
+        """
+        Cached serialized response for a request, building it on a miss
+
+        Args:
+            request: Incoming request (path and query string form the key)
+            build: Coroutine function returning (JSON-serializable payload, last modified)
+
+        Returns:
+            Serialized body with its ETag and Last-Modified
+        """
+        key = None
+        if self.enabled:
+            try:
+                key = await self._key(request)
+                entry = await self.backend.get(key)
+                if entry is not None:
+                    self.counters["hits"] += 1
+                    return entry
+            except Exception as e:
+                self.counters["errors"] += 1
+                print(f"Warning: response cache lookup failed: {e}")
+
+        self.counters["misses"] += 1
+        payload, last_modified = await build()
+        body = json.dumps(jsonable_encoder(payload), separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+        entry = CachedResponse(body=body, etag=make_etag(body), last_modified=last_modified)
+        if key is not None:
+            try:
+                await self.backend.set(key, entry)
+            except Exception as e:
+                self.counters["errors"] += 1
+                print(f"Warning: response cache write failed: {e}")
+        return entry
+
+    async def respond(
+        self,
+        request: Request,
+        build: Callable[[], Awaitable[Tuple[Any, Optional[datetime]]]]
+    ) -> Response:
+        """Serve a cached JSON response, or 304 if the client's copy is current"""
+        entry = await self.get_or_build(request, build)
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+        if entry.last_modified:
+            headers["Last-Modified"] = format_datetime(_as_utc(entry.last_modified), usegmt=True)
+        if is_not_modified(request, entry):
+            self.counters["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    async def invalidate(self):
+        """Drop every cached article response (called after any article write)"""
+        count_cache.clear()
+        self.counters["invalidations"] += 1
+        try:
+            await self.backend.invalidate()
+        except Exception as e:
+            self.counters["errors"] += 1
+            print(f"Warning: response cache invalidation failed: {e}")
+
+    async def aclose(self):
+        await self.backend.aclose()
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Naive timestamps from the database are UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def last_modified_of(articles: Iterable) -> Optional[datetime]:
+    """Newest updated_at (or created_at) among ORM articles"""
+    stamps = [
+        _as_utc(stamp) for stamp in (
+            getattr(article, "updated_at", None) or getattr(article, "created_at", None) for article in articles
+        ) if stamp
+    ]
+    return max(stamps) if stamps else None
+
+
+def is_not_modified(request: Request, entry: CachedResponse) -> bool:
+    """Evaluate If-None-Match (preferred) or If-Modified-Since against an entry"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or entry.etag in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and entry.last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have second precision
+        return _as_utc(entry.last_modified).replace(microsecond=0) <= _as_utc(since)
+    return False
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,150 @@
+"""
+Caching and request coalescing for semantic search
+Popular queries are answered from an LRU of query embeddings and a short-TTL
+cache of ranked results; concurrent identical queries share one embedding
+call and one vector query (single-flight).
+"""
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+
+def normalize_query(query: str) -> str:
+    """Case-fold and collapse whitespace so trivially different queries share entries"""
+    return " ".join(query.casefold().split())
+
+
+class LRUCache:
+    """Bounded LRU mapping with an optional per-entry TTL"""
+
+    def __init__(self, max_entries: int, ttl_seconds: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (expires_at, value)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SingleFlight:
+    """Run at most one call per key; concurrent callers await the same result"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(func())
+            self._calls[key] = future
+            future.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            self.coalesced += 1
+        # Shield so one cancelled caller doesn't cancel the shared call
+        return await asyncio.shield(future)
+
+
+class SemanticSearchCache:
+    """Query embedding LRU + ranked result cache + single-flight for semantic search"""
+
+    def __init__(
+        self,
+        embedding_entries: Optional[int] = None,
+        result_entries: Optional[int] = None,
+        result_ttl_seconds: Optional[float] = None
+    ):
+        self.embeddings = LRUCache(
+            embedding_entries if embedding_entries is not None else int(os.getenv("SEARCH_EMBEDDING_CACHE_SIZE", "10000"))
+        )
+        self.results = LRUCache(
+            result_entries if result_entries is not None else int(os.getenv("SEARCH_RESULT_CACHE_SIZE", "2000")),
+            ttl_seconds=result_ttl_seconds if result_ttl_seconds is not None else float(os.getenv("SEARCH_RESULT_TTL", "60"))
+        )
+        self.flight = SingleFlight()
+        self.counters = {"result_hits": 0, "embedding_hits": 0, "misses": 0}
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            **self.counters,
+            "coalesced": self.flight.coalesced,
+            "embedding_cache_size": len(self.embeddings),
+            "result_cache_size": len(self.results),
+        }
+
+    async def get_embedding(
+        self,
+        query: str,
+        embed: Callable[[str], Awaitable[List[float]]]
+    ) -> List[float]:
+        """Embedding for a normalized query, computed at most once concurrently"""
+        normalized = normalize_query(query)
+        embedding = self.embeddings.get(normalized)
+        if embedding is not None:
+            self.counters["embedding_hits"] += 1
+            return embedding
+
+        async def _embed():
+            value = await embed(normalized)
+            self.embeddings.set(normalized, value)
+            return value
+
+        return await self.flight.do(("embedding", normalized), _embed)
+
+    async def search(
+        self,
+        query: str,
+        top_k: int,
+        embed: Callable[[str], Awaitable[List[float]]],
+        search: Callable[[List[float], int], Awaitable[List[Dict]]]
+    ) -> List[Dict]:
+        """
+        Ranked vector search results for a query
+
+        Args:
+            query: Raw query text (normalized internally)
+            top_k: Number of results
+            embed: Coroutine function producing a query embedding
+            search: Coroutine function (embedding, top_k) -> ranked results
+
+        Returns:
+            Ranked results (article_id and score), possibly served from cache
+        """
+        key = (normalize_query(query), top_k)
+        cached = self.results.get(key)
+        if cached is not None:
+            self.counters["result_hits"] += 1
+            return cached
+
+        async def _search():
+            self.counters["misses"] += 1
+            embedding = await self.get_embedding(query, embed)
+            results = await search(embedding, top_k)
+            ranked = [{"article_id": result["article_id"], "score": result["score"]} for result in results]
+            self.results.set(key, ranked)
+            return ranked
+
+        return await self.flight.do(("search", key), _search)
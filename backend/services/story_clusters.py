@@ -0,0 +1,550 @@
+"""
+Incremental story clustering and trending stories
+Each newly embedded article joins the most similar active story cluster
+(cosine similarity between its embedding and the cluster centroid) or starts
+a new one. Centroids of active clusters are rows of one in-memory matrix, so
+an assignment is a single matrix-vector product. Per-cluster article counts
+are kept in fixed time buckets over a sliding window, and GET /trending reads
+a ranked snapshot of them instead of recomputing clusters.
+
+The database (story_clusters and Article.story_cluster_id) is the source of
+truth. The in-memory index is loaded from it on first use and reloaded every
+STORY_INDEX_REFRESH_SECONDS, which also picks up assignments made by other
+processes.
+
+Usage (clusters for articles enriched before clustering existed):
+    python backend/services/story_clusters.py [--batch-size 200]
+"""
+import argparse
+import asyncio
+import heapq
+import os
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import and_, bindparam, event, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from backend.database import AsyncSessionLocal
+from backend.models import Article, AIMetadata, StoryCluster
+from backend.services.vector_store import VectorStore, create_vector_store
+
+STORY_CLUSTER_THRESHOLD = float(os.getenv("STORY_CLUSTER_THRESHOLD", "0.8"))
+STORY_CLUSTER_ACTIVE_HOURS = float(os.getenv("STORY_CLUSTER_ACTIVE_HOURS", "72"))
+STORY_CLUSTER_MAX_ACTIVE = int(os.getenv("STORY_CLUSTER_MAX_ACTIVE", "20000"))
+STORY_INDEX_REFRESH_SECONDS = float(os.getenv("STORY_INDEX_REFRESH_SECONDS", "300"))
+TRENDING_BUCKET_MINUTES = int(os.getenv("TRENDING_BUCKET_MINUTES", "60"))
+TRENDING_WINDOW_HOURS = float(os.getenv("TRENDING_WINDOW_HOURS", "24"))
+TRENDING_HALF_LIFE_HOURS = float(os.getenv("TRENDING_HALF_LIFE_HOURS", "6"))
+TRENDING_MAX_RESULTS = 100
+
+_EPOCH = datetime(1970, 1, 1)
+_PENDING_KEY = "story_index_pending"
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Naive UTC datetime (the form stored by the rest of the app)"""
+    if value is not None and value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _normalize(vector) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    return vector / norm if norm else vector
+
+
+class CentroidIndex:
+    """Unit-length cluster centroids as rows of one matrix"""
+
+    def __init__(self, capacity: int = 1024):
+        self._capacity = capacity
+        self._matrix: Optional[np.ndarray] = None
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._rows: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, cluster_id: int) -> bool:
+        return cluster_id in self._rows
+
+    def best(self, unit: np.ndarray) -> Tuple[Optional[int], float]:
+        """Most similar cluster to a unit vector and its cosine similarity"""
+        if not self._rows:
+            return None, 0.0
+        scores = self._matrix[:len(self._rows)] @ unit
+        row = int(np.argmax(scores))
+        return int(self._ids[row]), float(scores[row])
+
+    def set(self, cluster_id: int, centroid: np.ndarray):
+        """Add or replace a cluster's centroid"""
+        unit = _normalize(centroid)
+        if self._matrix is None:
+            self._matrix = np.zeros((self._capacity, unit.shape[0]), dtype=np.float32)
+        if unit.shape[0] != self._matrix.shape[1]:
+            raise ValueError(f"Expected {self._matrix.shape[1]}-dimension vectors, got {unit.shape[0]}")
+        row = self._rows.get(cluster_id)
+        if row is None:
+            row = len(self._rows)
+            if row == self._matrix.shape[0]:
+                self._grow()
+            self._rows[cluster_id] = row
+            self._ids[row] = cluster_id
+        self._matrix[row] = unit
+
+    def remove(self, cluster_id: int):
+        """Drop a cluster; the last row moves into its place"""
+        row = self._rows.pop(cluster_id, None)
+        if row is None:
+            return
+        last = len(self._rows)
+        if row != last:
+            moved = int(self._ids[last])
+            self._matrix[row] = self._matrix[last]
+            self._ids[row] = moved
+            self._rows[moved] = row
+
+    def _grow(self):
+        used = len(self._rows)
+        matrix = np.zeros((self._matrix.shape[0] * 2, self._matrix.shape[1]), dtype=np.float32)
+        matrix[:used] = self._matrix[:used]
+        ids = np.zeros(matrix.shape[0], dtype=np.int64)
+        ids[:used] = self._ids[:used]
+        self._matrix, self._ids = matrix, ids
+
+
+class TrendingCounter:
+    """
+    Per-cluster article counts in fixed time buckets over a sliding window
+
+    Each cluster also has a score that halves every half-life. Scores are
+    stored relative to a reference bucket (a hit in bucket b adds
+    2 ** ((b - origin) / half_life)), so adding a hit or expiring a bucket is
+    O(1) and every score decays at once without being touched.
+    """
+
+    def __init__(
+        self,
+        bucket_minutes: int = TRENDING_BUCKET_MINUTES,
+        window_hours: float = TRENDING_WINDOW_HOURS,
+        half_life_hours: float = TRENDING_HALF_LIFE_HOURS,
+        now: Optional[datetime] = None
+    ):
+        self.bucket_minutes = bucket_minutes
+        self.window_hours = window_hours
+        self.half_life_hours = half_life_hours
+        self.window_buckets = max(1, int(window_hours * 60 // bucket_minutes))
+        self.half_life_buckets = max(half_life_hours * 60 / bucket_minutes, 1e-3)
+        self._current = self.bucket_of(now or datetime.utcnow())
+        self._origin = self._current
+        self._buckets: Dict[int, Dict[int, int]] = {}  # bucket -> cluster -> count
+        self._totals: Dict[int, int] = {}  # cluster -> count in the window
+        self._weights: Dict[int, float] = {}  # cluster -> score relative to origin
+        self._ranking: Optional[Tuple[int, List[Tuple[int, float, int]]]] = None
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._totals)
+
+    def __contains__(self, cluster_id: int) -> bool:
+        return cluster_id in self._totals
+
+    def bucket_of(self, when: datetime) -> int:
+        return int((when - _EPOCH).total_seconds() // (self.bucket_minutes * 60))
+
+    def bucket_start(self, bucket: int) -> datetime:
+        return _EPOCH + timedelta(minutes=bucket * self.bucket_minutes)
+
+    def _weight(self, bucket: int) -> float:
+        return 2.0 ** ((bucket - self._origin) / self.half_life_buckets)
+
+    def advance(self, now: Optional[datetime] = None) -> int:
+        """Expire buckets that left the window; returns the current bucket"""
+        current = self.bucket_of(now or datetime.utcnow())
+        if current <= self._current:
+            return self._current
+        self._current = current
+        cutoff = current - self.window_buckets
+        for bucket in [bucket for bucket in self._buckets if bucket <= cutoff]:
+            weight = self._weight(bucket)
+            for cluster_id, count in self._buckets.pop(bucket).items():
+                total = self._totals[cluster_id] - count
+                if total <= 0:
+                    del self._totals[cluster_id]
+                    del self._weights[cluster_id]
+                else:
+                    self._totals[cluster_id] = total
+                    self._weights[cluster_id] -= count * weight
+        # Keep stored weights in floating-point range
+        if (current - self._origin) / self.half_life_buckets > 64:
+            scale = 2.0 ** (-(current - self._origin) / self.half_life_buckets)
+            self._weights = {cluster_id: weight * scale for cluster_id, weight in self._weights.items()}
+            self._origin = current
+        self.version += 1
+        return current
+
+    def add(self, cluster_id: int, when: datetime, count: int = 1, now: Optional[datetime] = None) -> bool:
+        """Count articles for a cluster; False if when is older than the window"""
+        current = self.advance(now)
+        bucket = min(self.bucket_of(when), current)
+        if bucket <= current - self.window_buckets:
+            return False
+        counts = self._buckets.setdefault(bucket, {})
+        counts[cluster_id] = counts.get(cluster_id, 0) + count
+        self._totals[cluster_id] = self._totals.get(cluster_id, 0) + count
+        self._weights[cluster_id] = self._weights.get(cluster_id, 0.0) + count * self._weight(bucket)
+        self.version += 1
+        return True
+
+    def top(self, limit: int, now: Optional[datetime] = None) -> List[Tuple[int, float, int]]:
+        """(cluster_id, decayed score, count in window) of the hottest clusters"""
+        current = self.advance(now)
+        if self._ranking is None or self._ranking[0] != self.version:
+            decay = 2.0 ** (-(current - self._origin) / self.half_life_buckets)
+            ranked = heapq.nlargest(TRENDING_MAX_RESULTS, self._weights.items(), key=lambda item: item[1])
+            self._ranking = (self.version, [
+                (cluster_id, weight * decay, self._totals[cluster_id]) for cluster_id, weight in ranked
+            ])
+        return self._ranking[1][:limit]
+
+    def counts(self, cluster_id: int) -> List[int]:
+        """Per-bucket counts of a cluster over the window, oldest first"""
+        first = self._current - self.window_buckets + 1
+        return [self._buckets.get(bucket, {}).get(cluster_id, 0) for bucket in range(first, self._current + 1)]
+
+    def window_start(self) -> datetime:
+        return self.bucket_start(self._current - self.window_buckets + 1)
+
+
+@dataclass
+class _Cluster:
+    mean: np.ndarray  # Running mean of member unit vectors
+    size: int
+    last_seen: datetime
+
+
+@dataclass
+class _Pending:
+    """Changes made in a session's transaction, applied or undone when it ends"""
+    created: List[int]
+    hits: List[Tuple[int, datetime, int, bool]]  # (cluster_id, when, article_id, canonical)
+    touched: Dict[int, Tuple[_Cluster, _Cluster, int]]  # cluster_id -> (live, before, size after)
+
+
+class StoryIndex:
+    """In-memory centroids and trending counters for active story clusters"""
+
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        active_hours: Optional[float] = None,
+        max_active: Optional[int] = None,
+        refresh_seconds: Optional[float] = None
+    ):
+        self.threshold = threshold if threshold is not None else STORY_CLUSTER_THRESHOLD
+        self.active_hours = active_hours if active_hours is not None else STORY_CLUSTER_ACTIVE_HOURS
+        self.max_active = max_active if max_active is not None else STORY_CLUSTER_MAX_ACTIVE
+        self.refresh_seconds = refresh_seconds if refresh_seconds is not None else STORY_INDEX_REFRESH_SECONDS
+        self.centroids = CentroidIndex()
+        self.counter = TrendingCounter()
+        self._clusters: Dict[int, _Cluster] = {}
+        self._headlines: Dict[int, Tuple[datetime, int]] = {}  # Newest canonical article per cluster
+        self._loaded_at: Optional[float] = None
+        self._load_lock = asyncio.Lock()
+        self._stats = {"assigned": 0, "created": 0, "loads": 0}
+
+    def invalidate(self):
+        """Reload from the database on next use"""
+        self._loaded_at = None
+
+    def _is_fresh(self) -> bool:
+        if self._loaded_at is None:
+            return False
+        return self.refresh_seconds <= 0 or time.monotonic() - self._loaded_at < self.refresh_seconds
+
+    async def ensure_loaded(self, db: AsyncSession):
+        """Load (or periodically reload) active clusters and window counts"""
+        if self._is_fresh():
+            return
+        async with self._load_lock:
+            if not self._is_fresh():
+                await self.load(db)
+
+    async def load(self, db: AsyncSession):
+        """Rebuild the index from story_clusters and the articles in the trending window"""
+        now = datetime.utcnow()
+        result = await db.execute(
+            select(StoryCluster.id, StoryCluster.centroid, StoryCluster.size, StoryCluster.last_seen_at)
+            .where(StoryCluster.last_seen_at >= now - timedelta(hours=self.active_hours))
+            .order_by(StoryCluster.last_seen_at.desc())
+            .limit(self.max_active)
+        )
+        clusters: Dict[int, _Cluster] = {}
+        centroids = CentroidIndex()
+        for cluster_id, centroid, size, last_seen in result.all():
+            mean = np.frombuffer(centroid, dtype=np.float32).copy()
+            clusters[cluster_id] = _Cluster(mean, size, _utc(last_seen))
+            centroids.set(cluster_id, mean)
+
+        counter = TrendingCounter(self.counter.bucket_minutes, self.counter.window_hours, self.counter.half_life_hours, now)
+        window_start = counter.window_start()
+        result = await db.execute(
+            select(Article.id, Article.story_cluster_id, Article.duplicate_of_id, Article.published_date, Article.created_at)
+            .where(
+                Article.story_cluster_id.isnot(None),
+                or_(
+                    Article.published_date >= window_start,
+                    and_(Article.published_date.is_(None), Article.created_at >= window_start)
+                )
+            )
+        )
+        headlines: Dict[int, Tuple[datetime, int]] = {}
+        for article_id, cluster_id, duplicate_of_id, published_date, created_at in result.all():
+            when = _utc(published_date or created_at)
+            if counter.add(cluster_id, when, now=now) and duplicate_of_id is None:
+                _newer_headline(headlines, cluster_id, when, article_id)
+
+        self.centroids, self.counter, self._clusters, self._headlines = centroids, counter, clusters, headlines
+        self._loaded_at = time.monotonic()
+        self._stats["loads"] += 1
+
+    async def assign(self, db: AsyncSession, articles: Sequence[Tuple[Article, Optional[Sequence[float]]]]) -> Dict[int, int]:
+        """
+        Assign newly embedded articles to story clusters, in order
+
+        Articles that already have a cluster are left alone. Near-duplicates
+        of an assigned article join its cluster too.
+
+        Args:
+            db: Database session (the caller commits; counts update on commit)
+            articles: (article, embedding) pairs
+
+        Returns:
+            Article ID -> story cluster ID for the assigned articles
+        """
+        articles = [(article, embedding) for article, embedding in articles if article.story_cluster_id is None and embedding is not None]
+        if not articles:
+            return {}
+        await self.ensure_loaded(db)
+        pending = self._pending(db)
+
+        assigned: Dict[int, int] = {}
+        for article, embedding in articles:
+            unit = _normalize(embedding)
+            when = _utc(article.published_date) or datetime.utcnow()
+            cluster_id, score = self.centroids.best(unit)
+            if cluster_id is not None and score >= self.threshold:
+                # Running mean; the matrix row is replaced before the next await
+                cluster = self._clusters[cluster_id]
+                previous = pending.touched.get(cluster_id)
+                if previous is None or previous[0] is not cluster:
+                    previous = (cluster, _Cluster(cluster.mean, cluster.size, cluster.last_seen), 0)
+                cluster.size += 1
+                cluster.mean = cluster.mean + (unit - cluster.mean) / cluster.size
+                cluster.last_seen = max(cluster.last_seen, when)
+                self.centroids.set(cluster_id, cluster.mean)
+                pending.touched[cluster_id] = (cluster, previous[1], cluster.size)
+                await db.execute(
+                    update(StoryCluster).where(StoryCluster.id == cluster_id).values(
+                        centroid=cluster.mean.astype(np.float32).tobytes(),
+                        size=cluster.size,
+                        last_seen_at=cluster.last_seen
+                    )
+                )
+            else:
+                story_cluster = StoryCluster(centroid=unit.tobytes(), size=1, first_seen_at=when, last_seen_at=when)
+                db.add(story_cluster)
+                await db.flush()
+                cluster_id = story_cluster.id
+                self._clusters[cluster_id] = _Cluster(unit.copy(), 1, when)
+                self.centroids.set(cluster_id, unit)
+                pending.created.append(cluster_id)
+                self._stats["created"] += 1
+            article.story_cluster_id = cluster_id
+            assigned[article.id] = cluster_id
+            pending.hits.append((cluster_id, when, article.id, True))
+            self._stats["assigned"] += 1
+
+        # Near-duplicates share their canonical article's cluster and count toward it
+        result = await db.execute(
+            select(Article.id, Article.duplicate_of_id, Article.published_date)
+            .where(Article.duplicate_of_id.in_(list(assigned)), Article.story_cluster_id.is_(None))
+        )
+        duplicates = result.all()
+        if duplicates:
+            table = Article.__table__
+            await db.execute(
+                update(table).where(table.c.id == bindparam("article_id")).values(story_cluster_id=bindparam("cluster_id")),
+                [{"article_id": article_id, "cluster_id": assigned[canonical_id]} for article_id, canonical_id, _ in duplicates]
+            )
+            for article_id, canonical_id, published_date in duplicates:
+                pending.hits.append((assigned[canonical_id], _utc(published_date) or datetime.utcnow(), article_id, False))
+
+        self._evict()
+        return assigned
+
+    async def record_members(self, db: AsyncSession, article_ids: Sequence[int]) -> int:
+        """
+        Count articles that joined a cluster without being embedded
+        (near-duplicates linked at ingest copy their canonical's cluster)
+
+        Returns:
+            Number of articles counted (on commit)
+        """
+        if not article_ids:
+            return 0
+        result = await db.execute(
+            select(Article.id, Article.story_cluster_id, Article.published_date)
+            .where(Article.id.in_(list(article_ids)), Article.story_cluster_id.isnot(None))
+        )
+        rows = result.all()
+        if rows:
+            pending = self._pending(db)
+            for article_id, cluster_id, published_date in rows:
+                pending.hits.append((cluster_id, _utc(published_date) or datetime.utcnow(), article_id, False))
+        return len(rows)
+
+    def trending(self, limit: int = 10) -> List[Dict]:
+        """Hottest clusters: cluster_id, score, article_count, counts (per bucket) and headline_id"""
+        return [
+            {
+                "cluster_id": cluster_id,
+                "score": round(score, 4),
+                "article_count": count,
+                "counts": self.counter.counts(cluster_id),
+                "headline_id": self._headlines.get(cluster_id, (None, None))[1],
+            }
+            for cluster_id, score, count in self.counter.top(limit)
+        ]
+
+    def stats(self) -> Dict:
+        return {
+            "loaded": self._loaded_at is not None,
+            "active_clusters": len(self.centroids),
+            "trending_clusters": len(self.counter),
+            **self._stats,
+        }
+
+    def _pending(self, db: AsyncSession) -> _Pending:
+        """Per-transaction changes; counts apply on commit, centroid updates are undone on rollback"""
+        session = db.sync_session
+        pending = session.info.get(_PENDING_KEY)
+        if pending is None:
+            pending = session.info[_PENDING_KEY] = _Pending([], [], {})
+            event.listen(session, "after_commit", self._after_commit)
+            event.listen(session, "after_rollback", self._after_rollback)
+        return pending
+
+    def _after_commit(self, session):
+        pending = session.info[_PENDING_KEY]
+        for cluster_id, when, article_id, canonical in pending.hits:
+            if self.counter.add(cluster_id, when) and canonical:
+                _newer_headline(self._headlines, cluster_id, when, article_id)
+        pending.created.clear()
+        pending.hits.clear()
+        pending.touched.clear()
+
+    def _after_rollback(self, session):
+        pending = session.info[_PENDING_KEY]
+        for cluster_id, (cluster, before, size) in pending.touched.items():
+            if self._clusters.get(cluster_id) is cluster and cluster.size == size:
+                cluster.mean, cluster.size, cluster.last_seen = before.mean, before.size, before.last_seen
+                self.centroids.set(cluster_id, cluster.mean)
+            else:
+                # Another session or a reload changed it since; the database has the committed state
+                self.invalidate()
+        for cluster_id in pending.created:
+            self.centroids.remove(cluster_id)
+            self._clusters.pop(cluster_id, None)
+        pending.created.clear()
+        pending.hits.clear()
+        pending.touched.clear()
+
+    def _evict(self):
+        """Drop the least recently seen clusters once over max_active (they stay in the database)"""
+        if len(self._clusters) <= self.max_active:
+            return
+        excess = len(self._clusters) - int(self.max_active * 0.9)
+        for cluster_id in heapq.nsmallest(excess, self._clusters, key=lambda cluster_id: self._clusters[cluster_id].last_seen):
+            self.centroids.remove(cluster_id)
+            del self._clusters[cluster_id]
+        # Headlines are only needed for clusters that still have counts
+        if len(self._headlines) > 2 * len(self.counter) + 1000:
+            self._headlines = {cluster_id: value for cluster_id, value in self._headlines.items() if cluster_id in self.counter}
+
+
+def _newer_headline(headlines: Dict[int, Tuple[datetime, int]], cluster_id: int, when: datetime, article_id: int):
+    current = headlines.get(cluster_id)
+    if current is None or when >= current[0]:
+        headlines[cluster_id] = (when, article_id)
+
+
+# Shared by the enrichment workers, ingestion and GET /trending in this process
+story_index = StoryIndex()
+
+
+async def backfill_story_clusters(batch_size: int = 200, vector_store: Optional[VectorStore] = None) -> int:
+    """
+    Assign clusters to embedded canonical articles that have none, oldest first
+
+    Args:
+        batch_size: Articles assigned per transaction
+        vector_store: Vector store to read embeddings from (optional)
+
+    Returns:
+        Number of articles assigned
+    """
+    vector_store = vector_store or create_vector_store()
+    assigned = 0
+    last_id = 0
+    while True:
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(Article, AIMetadata.embedding_id)
+                .join(AIMetadata, AIMetadata.article_id == Article.id)
+                .where(
+                    Article.id > last_id,
+                    Article.story_cluster_id.is_(None),
+                    Article.duplicate_of_id.is_(None),
+                    AIMetadata.embedding_id.isnot(None)
+                )
+                .order_by(Article.id).limit(batch_size)
+            )
+            rows = result.all()
+            if not rows:
+                break
+            last_id = rows[-1][0].id
+            embeddings = await vector_store.get_embeddings([embedding_id for _, embedding_id in rows])
+            assigned += len(await story_index.assign(db, [
+                (article, embeddings.get(embedding_id)) for article, embedding_id in rows
+            ]))
+            await db.commit()
+    return assigned
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Assign story clusters to embedded articles that have none")
+    parser.add_argument("--batch-size", type=int, default=200)
+    args = parser.parse_args()
+
+    vector_store = create_vector_store()
+    start = time.perf_counter()
+    try:
+        assigned = await backfill_story_clusters(args.batch_size, vector_store)
+    finally:
+        await vector_store.aclose()
+    print(f"✅ Assigned {assigned} articles to {story_index.stats()['created']} new story clusters in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,153 @@
+"""
+Normalized tag index
+Article.ai_tags stays as the JSON copy returned with each article. Every tag
+is also stored once in the tags table and linked through article_tags, which
+is indexed both ways, so GET /articles?tag= is an index join instead of
+decoding JSON for every row. Tag.article_count changes in the same
+transaction as the links, so facet counts are read from the tags table
+instead of being counted per request.
+"""
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Sequence
+
+from sqlalchemy import bindparam, delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.models import Article, ArticleTag, Tag
+from backend.services.bulk_insert import bulk_insert
+
+MAX_TAG_LENGTH = 100
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_tags(tags: Iterable) -> List[str]:
+    """Lowercased, whitespace-collapsed tags without '#' or quotes, deduplicated in order"""
+    normalized = []
+    for tag in tags or []:
+        if tag is None:
+            continue
+        name = _SPACE_RE.sub(" ", str(tag)).strip().strip("#\"'.").strip().lower()[:MAX_TAG_LENGTH]
+        if name and name not in normalized:
+            normalized.append(name)
+    return normalized
+
+
+async def _resolve_tags(db: AsyncSession, names: Iterable[str]) -> Dict[str, int]:
+    """Map tag names to IDs, creating missing tags in bulk"""
+    names = list(set(names))
+    if not names:
+        return {}
+    result = await db.execute(select(Tag.id, Tag.name).where(Tag.name.in_(names)))
+    ids = {name: tag_id for tag_id, name in result.all()}
+    missing = [name for name in names if name not in ids]
+    if missing:
+        ids.update(await bulk_insert(db, Tag.__table__, [{"name": name, "article_count": 0} for name in missing], Tag.__table__.c.name))
+        # Created by a concurrent writer between the two queries. A locking
+        # read sees its committed row; a plain one under MySQL's REPEATABLE
+        # READ would read the transaction's older snapshot
+        unresolved = [name for name in missing if name not in ids]
+        if unresolved:
+            result = await db.execute(select(Tag.id, Tag.name).where(Tag.name.in_(unresolved)).with_for_update())
+            ids.update({name: tag_id for tag_id, name in result.all()})
+    return ids
+
+
+async def set_article_tags(db: AsyncSession, tags_by_article: Dict[int, Sequence[str]]):
+    """
+    Replace the indexed tags of several articles and adjust Tag.article_count
+
+    Args:
+        db: Database session (the caller commits)
+        tags_by_article: Article ID -> tags (normalized here; empty removes all)
+    """
+    wanted = {article_id: normalize_tags(tags) for article_id, tags in tags_by_article.items()}
+    if not wanted:
+        return
+    tag_ids = await _resolve_tags(db, (name for names in wanted.values() for name in names))
+    unresolved = {name for names in wanted.values() for name in names} - set(tag_ids)
+    if unresolved:
+        # Left for the next indexing of these articles rather than failing
+        # the whole batch
+        print(f"⚠️  Tags not indexed yet (created concurrently): {sorted(unresolved)}")
+    wanted_ids = {
+        article_id: {tag_ids[name] for name in names if name in tag_ids}
+        for article_id, names in wanted.items()
+    }
+
+    result = await db.execute(
+        select(ArticleTag.article_id, ArticleTag.tag_id).where(ArticleTag.article_id.in_(list(wanted)))
+    )
+    current: Dict[int, set] = {}
+    for article_id, tag_id in result.all():
+        current.setdefault(article_id, set()).add(tag_id)
+
+    added = [(article_id, tag_id) for article_id, ids in wanted_ids.items() for tag_id in ids - current.get(article_id, set())]
+    removed = [(article_id, tag_id) for article_id, ids in current.items() for tag_id in ids - wanted_ids[article_id]]
+    table = ArticleTag.__table__
+    if removed:
+        await db.execute(
+            delete(table).where(table.c.article_id == bindparam("link_article_id"), table.c.tag_id == bindparam("link_tag_id")),
+            [{"link_article_id": article_id, "link_tag_id": tag_id} for article_id, tag_id in removed]
+        )
+    if added:
+        await db.execute(insert(table), [{"article_id": article_id, "tag_id": tag_id} for article_id, tag_id in added])
+
+    deltas = Counter(tag_id for _, tag_id in added)
+    deltas.subtract(tag_id for _, tag_id in removed)
+    changes = [{"delta_tag_id": tag_id, "delta": delta} for tag_id, delta in deltas.items() if delta]
+    if changes:
+        tags = Tag.__table__
+        await db.execute(
+            update(tags).where(tags.c.id == bindparam("delta_tag_id")).values(article_count=tags.c.article_count + bindparam("delta")),
+            changes
+        )
+
+
+async def index_article_tags(db: AsyncSession, tags_by_article: Dict[int, Sequence[str]], include_duplicates: bool = True):
+    """
+    Index tags just assigned to articles, and to their near-duplicates
+    (which share the canonical article's tags)
+
+    The tags are passed in rather than read back: sessions don't autoflush,
+    so a SELECT would still see the previous ai_tags.
+
+    Args:
+        db: Database session (the caller commits)
+        tags_by_article: Article ID -> the ai_tags it was given
+        include_duplicates: Also index the articles' near-duplicates
+    """
+    if not tags_by_article:
+        return
+    wanted = {article_id: tags or [] for article_id, tags in tags_by_article.items()}
+    if include_duplicates:
+        result = await db.execute(
+            select(Article.id, Article.duplicate_of_id).where(Article.duplicate_of_id.in_(list(wanted)))
+        )
+        for duplicate_id, canonical_id in result.all():
+            wanted.setdefault(duplicate_id, wanted[canonical_id])
+    await set_article_tags(db, wanted)
+
+
+async def index_stored_tags(db: AsyncSession, article_ids: Sequence[int]):
+    """Index the ai_tags of articles as stored, for rows written with Core statements"""
+    if not article_ids:
+        return
+    result = await db.execute(select(Article.id, Article.ai_tags).where(Article.id.in_(list(article_ids))))
+    await set_article_tags(db, {article_id: tags or [] for article_id, tags in result.all()})
+
+
+async def remove_article_tags(db: AsyncSession, article_ids: Sequence[int]):
+    """Unlink articles from their tags before they are deleted"""
+    await set_article_tags(db, {article_id: [] for article_id in article_ids})
+
+
+async def tag_facets(db: AsyncSession, limit: int = 20) -> List[Dict]:
+    """Most used tags as [{"name", "count"}] from the maintained counts"""
+    result = await db.execute(
+        select(Tag.name, Tag.article_count)
+        .where(Tag.article_count > 0)
+        .order_by(Tag.article_count.desc(), Tag.name)
+        .limit(limit)
+    )
+    return [{"name": name, "count": count} for name, count in result.all()]
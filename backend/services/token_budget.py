@@ -0,0 +1,344 @@
+"""
+Token-aware prompt budgets, OpenAI rate limiting and usage accounting
+Article text is fitted to a token budget instead of a character count: the
+lead paragraph is always kept and the remaining budget goes to the paragraphs
+that best cover the title and the article's recurring terms, in their
+original order. Tokens are counted with tiktoken (a requirement; its
+encoding files are downloaded on first use) and, if that fails, estimated
+conservatively from word lengths so fitted text stays within model limits.
+
+Every OpenAI request first reserves its tokens (prompt plus max_tokens, which
+is what the API counts against the limit) from a per-model bucket shared by
+all OpenAIService instances in the process, so concurrent workers queue
+instead of bursting into 429s. The reservation is corrected with the usage
+the API reports, which is also accumulated per call kind with its cost.
+"""
+import asyncio
+import importlib.util
+import math
+import os
+import re
+import time
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+# Exact counts need the optional tiktoken package
+TIKTOKEN_AVAILABLE = importlib.util.find_spec("tiktoken") is not None
+
+OPENAI_TOKENS_PER_MINUTE = int(os.getenv("OPENAI_TOKENS_PER_MINUTE", "0"))
+OPENAI_EMBEDDING_TOKENS_PER_MINUTE = int(os.getenv("OPENAI_EMBEDDING_TOKENS_PER_MINUTE", "0"))
+OPENAI_REQUESTS_PER_MINUTE = int(os.getenv("OPENAI_REQUESTS_PER_MINUTE", "0"))
+# The API may enforce per-minute limits over shorter windows, so only this
+# many seconds' worth of tokens can be spent in one burst
+BURST_SECONDS = 10
+
+# USD per 1M input / output tokens
+MODEL_PRICES: Dict[str, Tuple[float, float]] = {
+    "gpt-4-turbo-preview": (10.0, 30.0),
+    "gpt-4-turbo": (10.0, 30.0),
+    "gpt-4o": (2.5, 10.0),
+    "gpt-4o-mini": (0.15, 0.6),
+    "gpt-3.5-turbo": (0.5, 1.5),
+    "text-embedding-3-small": (0.02, 0.0),
+    "text-embedding-3-large": (0.13, 0.0),
+    "text-embedding-ada-002": (0.1, 0.0),
+}
+# USD per standard 1024x1024 image
+IMAGE_PRICES: Dict[str, float] = {"dall-e-3": 0.04, "dall-e-2": 0.02}
+
+_PIECE_RE = re.compile(r"\w+|[^\w\s]")
+_WORD_RE = re.compile(r"\w+")
+_PARAGRAPH_RE = re.compile(r"\s*\n\s*")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|(?<=[。！？])")
+MIN_TERM_LENGTH = 4  # Shorter words are mostly stopwords
+TITLE_TERM_WEIGHT = 10.0
+LEAD_MAX_SHARE = 0.5  # A long lead is cut to leave room for key paragraphs
+ESTIMATE_MARGIN = 1.1  # Estimated counts are inflated to stay under real limits
+
+
+@lru_cache(maxsize=16)
+def _encoding(model: str):
+    """tiktoken encoding for a model, or None if unavailable"""
+    if not TIKTOKEN_AVAILABLE:
+        return None
+    import tiktoken
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # The BPE files are downloaded on first use
+        print(f"⚠️  tiktoken unavailable for {model}, estimating token counts: {e}")
+        return None
+
+
+def _estimate(piece: str) -> int:
+    if piece.isascii():
+        # BPE vocabularies hold most common words whole; longer ones split
+        # every ~4 chars, numbers every 3 digits
+        return math.ceil(len(piece) / (3 if piece.isdigit() else 4))
+    # CJK and other non-Latin scripts take about a token per character, so
+    # count every non-ASCII character as one
+    non_ascii = sum(1 for char in piece if not char.isascii())
+    return non_ascii + math.ceil((len(piece) - non_ascii) / 4)
+
+
+def count_tokens(text: str, model: str) -> int:
+    """Tokens in text for model (estimated without tiktoken)"""
+    if not text:
+        return 0
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return math.ceil(sum(_estimate(piece) for piece in _PIECE_RE.findall(text)) * ESTIMATE_MARGIN)
+
+
+def truncate_tokens(text: str, max_tokens: int, model: str) -> str:
+    """The longest prefix of text within max_tokens"""
+    if max_tokens <= 0:
+        return ""
+    encoding = _encoding(model)
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+    used = 0
+    for match in _PIECE_RE.finditer(text):
+        piece = match.group()
+        cost = _estimate(piece)
+        if (used + cost) * ESTIMATE_MARGIN > max_tokens:
+            if piece.isascii():
+                return text[:match.start()].rstrip()
+            # Scripts written without spaces form one long piece; keep the
+            # characters that fit
+            room = max_tokens / ESTIMATE_MARGIN - used
+            non_ascii = ascii_chars = keep = 0
+            for char in piece:
+                if char.isascii():
+                    ascii_chars += 1
+                else:
+                    non_ascii += 1
+                if non_ascii + math.ceil(ascii_chars / 4) > room:
+                    break
+                keep += 1
+            return text[:match.start() + keep].rstrip()
+        used += cost
+    return text
+
+
+def _passages(text: str, max_tokens: int, model: str) -> List[Tuple[str, int, int]]:
+    """(passage, paragraph number, tokens): paragraphs, with long ones split into sentences"""
+    passages = []
+    for number, paragraph in enumerate(p for p in _PARAGRAPH_RE.split(text.strip()) if p):
+        tokens = count_tokens(paragraph, model)
+        if tokens <= max_tokens * LEAD_MAX_SHARE:
+            passages.append((paragraph, number, tokens))
+            continue
+        for sentence in _SENTENCE_RE.split(paragraph):
+            if not sentence:
+                continue
+            tokens = count_tokens(sentence, model)
+            if tokens > max_tokens * LEAD_MAX_SHARE:
+                # A run-on "sentence" (or text without sentence punctuation) is cut
+                sentence = truncate_tokens(sentence, int(max_tokens * LEAD_MAX_SHARE), model)
+                tokens = count_tokens(sentence, model)
+            passages.append((sentence, number, tokens))
+    return passages
+
+
+def _terms(text: str) -> List[str]:
+    return [word for word in _WORD_RE.findall(text.casefold()) if len(word) >= MIN_TERM_LENGTH]
+
+
+def fit_to_budget(text: str, max_tokens: int, model: str, title: str = "") -> str:
+    """
+    Fit article text to a token budget with lead + key-paragraph selection
+
+    Args:
+        text: Article body
+        max_tokens: Token budget for the returned text
+        model: Model whose tokenizer counts the tokens
+        title: Title whose words mark the key paragraphs
+
+    Returns:
+        text itself if it fits, otherwise the lead and the highest scoring
+        paragraphs (or sentences of long paragraphs) that fit, in their
+        original order
+    """
+    if not text or count_tokens(text, model) <= max_tokens:
+        return text or ""
+    passages = _passages(text, max_tokens, model)
+    if len(passages) == 1:
+        return truncate_tokens(text, max_tokens, model)
+    costs = [tokens + 1 for _, _, tokens in passages]  # +1 for the separator
+
+    lead = passages[0][0]
+    if costs[0] > max_tokens * LEAD_MAX_SHARE:
+        lead = truncate_tokens(lead, int(max_tokens * LEAD_MAX_SHARE), model)
+    remaining = max_tokens - count_tokens(lead, model) - 1
+
+    # Title words weigh most; other terms by how often the article repeats them
+    # (log-damped, so words used once count for nothing). Passages are
+    # ranked by distinct-term weight per token
+    frequency: Dict[str, int] = {}
+    for term in _terms(text):
+        frequency[term] = frequency.get(term, 0) + 1
+    title_terms = set(_terms(title))
+
+    def score(index: int) -> float:
+        terms = set(_terms(passages[index][0]))
+        weight = sum(TITLE_TERM_WEIGHT if term in title_terms else math.log(frequency.get(term, 1)) for term in terms)
+        return weight / costs[index]
+
+    chosen = [0]
+    for index in sorted(range(1, len(passages)), key=score, reverse=True):
+        if costs[index] <= remaining:
+            chosen.append(index)
+            remaining -= costs[index]
+    chosen.sort()
+
+    # Sentences from the same paragraph stay on one line
+    fitted = lead
+    for previous, index in zip(chosen, chosen[1:]):
+        fitted += " " if passages[index][1] == passages[previous][1] else "\n\n"
+        fitted += passages[index][0]
+    return fitted
+
+
+class TokenRateLimiter:
+    """Token bucket refilled at per_minute / 60 per second; callers queue in arrival order"""
+
+    def __init__(self, per_minute: int, burst_seconds: float = BURST_SECONDS):
+        self.per_minute = per_minute
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds) if per_minute > 0 else 0.0
+        self._available = self.capacity
+        self._updated = time.monotonic()
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._available = min(self.capacity, self._available + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float):
+        """Take amount from the bucket, waiting until it has been refilled"""
+        if self.per_minute <= 0:
+            return
+        # Larger requests than the bucket holds wait for a full bucket
+        amount = min(amount, self.capacity)
+        # The balance may go negative: each caller waits for the refill of
+        # everything reserved ahead of it
+        self._refill()
+        self._available -= amount
+        delay = -self._available / self.rate if self._available < 0 else 0.0
+        if delay > 0:
+            self.waits += 1
+            self.wait_seconds += delay
+            await asyncio.sleep(delay)
+
+    def settle(self, reserved: float, used: float):
+        """Return over-reserved tokens to the bucket, or take the shortfall"""
+        if self.per_minute <= 0:
+            return
+        self._refill()
+        self._available = min(self.capacity, self._available + reserved - used)
+
+    def stats(self) -> Dict:
+        return {
+            "per_minute": self.per_minute,
+            "waits": self.waits,
+            "wait_seconds": round(self.wait_seconds, 3),
+        }
+
+
+class TokenBudget:
+    """Per-model rate limiters and token/cost accounting shared by OpenAI callers"""
+
+    def __init__(
+        self,
+        tokens_per_minute: int = OPENAI_TOKENS_PER_MINUTE,
+        embedding_tokens_per_minute: int = OPENAI_EMBEDDING_TOKENS_PER_MINUTE,
+        requests_per_minute: int = OPENAI_REQUESTS_PER_MINUTE
+    ):
+        self.tokens_per_minute = tokens_per_minute
+        self.embedding_tokens_per_minute = embedding_tokens_per_minute
+        self.requests_per_minute = requests_per_minute
+        self._token_limiters: Dict[str, TokenRateLimiter] = {}
+        self._request_limiters: Dict[str, TokenRateLimiter] = {}
+        self.usage: Dict[str, Dict] = {}
+
+    def _limiters(self, model: str) -> Tuple[TokenRateLimiter, TokenRateLimiter]:
+        # Limits apply per model
+        if model not in self._token_limiters:
+            per_minute = self.embedding_tokens_per_minute if model.startswith("text-embedding") else self.tokens_per_minute
+            self._token_limiters[model] = TokenRateLimiter(per_minute)
+            self._request_limiters[model] = TokenRateLimiter(self.requests_per_minute)
+        return self._token_limiters[model], self._request_limiters[model]
+
+    async def reserve(self, model: str, tokens: int):
+        """Wait until model's limits allow a request of this many tokens"""
+        token_limiter, request_limiter = self._limiters(model)
+        await request_limiter.acquire(1)
+        await token_limiter.acquire(tokens)
+
+    def release(self, model: str, tokens: int):
+        """Return the reservation of a request that failed before the API charged it"""
+        token_limiter, _ = self._limiters(model)
+        token_limiter.settle(tokens, 0)
+
+    def record(
+        self,
+        kind: str,
+        model: str,
+        reserved: int,
+        charged: int,
+        prompt_tokens: int,
+        completion_tokens: int = 0,
+        estimated: bool = False
+    ):
+        """
+        Account for a finished request and correct its reservation
+
+        Args:
+            kind: Call kind (summary, enrichment, embedding, ...)
+            model: Model the request used
+            reserved: Tokens taken from the limiter by reserve()
+            charged: Tokens the API counted against the limit
+            prompt_tokens: Input tokens (from the API's usage when available)
+            completion_tokens: Output tokens
+            estimated: True when the API reported no usage
+        """
+        token_limiter, _ = self._limiters(model)
+        token_limiter.settle(reserved, charged)
+        input_price, output_price = MODEL_PRICES.get(model, (0.0, 0.0))
+        entry = self.usage.setdefault(kind, {
+            "calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "estimated_calls": 0, "cost_usd": 0.0
+        })
+        entry["calls"] += 1
+        entry["prompt_tokens"] += prompt_tokens
+        entry["completion_tokens"] += completion_tokens
+        entry["estimated_calls"] += int(estimated)
+        entry["cost_usd"] += (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+    def record_image(self, model: str):
+        """Account for a generated image"""
+        entry = self.usage.setdefault("image", {"calls": 0, "cost_usd": 0.0})
+        entry["calls"] += 1
+        entry["cost_usd"] += IMAGE_PRICES.get(model, 0.0)
+
+    def stats(self) -> Dict:
+        return {
+            "tokenizer": "tiktoken" if TIKTOKEN_AVAILABLE else "estimate",
+            "limits": {
+                model: {"tokens": limiter.stats(), "requests": self._request_limiters[model].stats()}
+                for model, limiter in self._token_limiters.items()
+            },
+            "usage": {kind: {**entry, "cost_usd": round(entry["cost_usd"], 6)} for kind, entry in self.usage.items()},
+            "total_cost_usd": round(sum(entry["cost_usd"] for entry in self.usage.values()), 6),
+        }
+
+
+# Shared by every OpenAIService in the process
+token_budget = TokenBudget()
@@ -0,0 +1,157 @@
+import os
+import asyncio
+from abc import ABC, abstractmethod
+from typing import List, Dict, Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Chunked mode stores passage vectors next to each long article's vector;
+# searches then request more vectors and fold passage hits into their article
+CHUNKED_EMBEDDINGS = os.getenv("CHUNKED_EMBEDDINGS", "false").lower() == "true"
+EMBEDDING_MAX_PASSAGES = int(os.getenv("EMBEDDING_MAX_PASSAGES", "32"))
+PASSAGE_SEARCH_FANOUT = int(os.getenv("PASSAGE_SEARCH_FANOUT", "4"))
+PASSAGE_SEARCH_MAX_K = int(os.getenv("PASSAGE_SEARCH_MAX_K", "200"))
+
+class VectorStore(ABC):
+    """Interface shared by the vector database backends"""
+
+    dimension: int = 1024
+
+    @staticmethod
+    def vector_id(article_id: int) -> str:
+        """Vector ID used for an article's embedding"""
+        return f"article_{article_id}"
+
+    @staticmethod
+    def passage_vector_id(article_id: int, passage: int) -> str:
+        """Vector ID used for one passage of a chunked article"""
+        return f"article_{article_id}#p{passage}"
+
+    @classmethod
+    def item_vector_id(cls, item: Dict) -> str:
+        """Vector ID for an upsert item (article_id and an optional passage number)"""
+        if item.get("passage") is None:
+            return cls.vector_id(item["article_id"])
+        return cls.passage_vector_id(item["article_id"], item["passage"])
+
+    @staticmethod
+    def search_k(top_k: int) -> int:
+        """Vectors to request for top_k articles: several per article in chunked mode, bounded"""
+        if not CHUNKED_EMBEDDINGS:
+            return top_k
+        return max(top_k, min(top_k * PASSAGE_SEARCH_FANOUT, PASSAGE_SEARCH_MAX_K))
+
+    @staticmethod
+    def aggregate_matches(matches: List[Dict], top_k: int) -> List[Dict]:
+        """Fold passage hits into their article (max-sim) and keep the top_k articles"""
+        best: Dict[int, Dict] = {}
+        for match in matches:
+            current = best.get(match["article_id"])
+            if current is None or match["score"] > current["score"]:
+                best[match["article_id"]] = match
+        return sorted(best.values(), key=lambda match: match["score"], reverse=True)[:top_k]
+
+    @staticmethod
+    def exclusion_filter(exclude_ids: Optional[List[int]], filter_dict: Optional[Dict] = None) -> Optional[Dict]:
+        """Merge article exclusions into a metadata filter ($ne/$nin on article_id)"""
+        if not exclude_ids:
+            return filter_dict or None
+        exclusion = {"$ne": exclude_ids[0]} if len(exclude_ids) == 1 else {"$nin": list(exclude_ids)}
+        if not filter_dict:
+            return {"article_id": exclusion}
+        if "article_id" in filter_dict or "$and" in filter_dict or "$or" in filter_dict:
+            return {"$and": [filter_dict, {"article_id": exclusion}]}
+        return {**filter_dict, "article_id": exclusion}
+
+    @abstractmethod
+    async def upsert_embedding(
+        self,
+        article_id: int,
+        embedding: List[float],
+        metadata: Optional[Dict] = None
+    ) -> str:
+        """Store or update one embedding and return its vector ID"""
+
+    @abstractmethod
+    async def upsert_embeddings(self, batch: List[Dict], chunk_size: int = 100) -> List[str]:
+        """Store or update many embeddings (items with article_id, embedding, metadata and optional passage)"""
+
+    @abstractmethod
+    async def get_embedding(self, embedding_id: str) -> Optional[List[float]]:
+        """Retrieve embedding vector by ID"""
+
+    async def get_embeddings(self, embedding_ids: List[str]) -> Dict[str, List[float]]:
+        """Retrieve several embedding vectors by ID (missing IDs are left out)"""
+        embeddings = await asyncio.gather(*(self.get_embedding(embedding_id) for embedding_id in embedding_ids))
+        return {
+            embedding_id: embedding
+            for embedding_id, embedding in zip(embedding_ids, embeddings) if embedding is not None
+        }
+
+    @abstractmethod
+    async def search_similar(
+        self,
+        embedding: List[float],
+        top_k: int = 10,
+        exclude_ids: Optional[List[int]] = None,
+        filter_dict: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Return up to top_k results with article_id, score and metadata"""
+
+    @abstractmethod
+    async def search_by_id(
+        self,
+        vector_id: str,
+        top_k: int = 10,
+        exclude_ids: Optional[List[int]] = None,
+        filter_dict: Optional[Dict] = None
+    ) -> List[Dict]:
+        """Like search_similar, using a stored vector as the query (no fetch round trip)"""
+
+    async def search_many_by_id(self, queries: List[Dict]) -> List[List[Dict]]:
+        """
+        Run several search_by_id queries concurrently
+
+        Args:
+            queries: Items with vector_id and optional top_k, exclude_ids, filter_dict
+
+        Returns:
+            One result list per query, in order
+        """
+        return list(await asyncio.gather(*(self.search_by_id(**query) for query in queries)))
+
+    @abstractmethod
+    async def delete_embedding(self, embedding_id: str):
+        """Delete embedding by vector ID"""
+
+    async def delete_embeddings(self, embedding_ids: List[str]):
+        """Delete several embeddings by vector ID"""
+        await asyncio.gather(*(self.delete_embedding(embedding_id) for embedding_id in embedding_ids))
+
+    async def delete_passages(self, article_id: int, keep: int = 0):
+        """Delete an article's passage vectors from number keep on"""
+        if keep < EMBEDDING_MAX_PASSAGES:
+            await self.delete_embeddings([
+                self.passage_vector_id(article_id, passage) for passage in range(keep, EMBEDDING_MAX_PASSAGES)
+            ])
+
+    async def delete_by_article_id(self, article_id: int):
+        """Delete an article's embedding and its passage vectors"""
+        await self.delete_embedding(self.vector_id(article_id))
+        await self.delete_passages(article_id)
+
+    async def aclose(self):
+        """Release connections or flush files held by the backend"""
+
+
+def create_vector_store() -> VectorStore:
+    """Create the backend selected by VECTOR_BACKEND (pinecone or local)"""
+    backend = os.getenv("VECTOR_BACKEND", "pinecone").lower()
+    if backend == "pinecone":
+        from backend.services.pinecone_service import PineconeService
+        return PineconeService()
+    if backend == "local":
+        from backend.services.local_vector_store import LocalVectorStore
+        return LocalVectorStore()
+    raise ValueError(f"Unknown VECTOR_BACKEND '{backend}' (expected 'pinecone' or 'local')")